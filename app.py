@@ -13,6 +13,7 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from modelo_poisson import ModeloPoissonFutbol
+from modelo_poisson.cache_modelos import DIRECTORIO_POR_DEFECTO
 
 
 # =====================================================================
@@ -67,12 +68,17 @@ st.markdown("""
 @st.cache_resource
 def cargar_modelo_preentrenado():
     """
-    Carga modelo pre-entrenado desde parametros_modelo.csv.
+    Carga modelo pre-entrenado desde modelo.mpoi (artefacto binario,
+    mapeado en memoria) o, si no existe, desde parametros_modelo.csv.
     Usa caché para no recargar en cada interacción.
     """
     try:
+        import os
         modelo = ModeloPoissonFutbol()
-        info = modelo.cargar_parametros('parametros_modelo.csv')
+        if os.path.exists('modelo.mpoi'):
+            modelo.cargar_modelo('modelo.mpoi')
+        else:
+            modelo.cargar_parametros('parametros_modelo.csv')
         return modelo, None
     except Exception as e:
         return None, str(e)
@@ -100,8 +106,8 @@ def entrenar_modelo_nuevo(uploaded_file):
         with open(temp_path, 'wb') as f:
             f.write(uploaded_file.getvalue())
 
-        # Crear y entrenar modelo
-        modelo = ModeloPoissonFutbol()
+        # Crear y entrenar modelo (reutiliza el ajuste si el CSV ya se subió antes)
+        modelo = ModeloPoissonFutbol(directorio_cache=DIRECTORIO_POR_DEFECTO)
         modelo.cargar_datos(temp_path)
         modelo.entrenar()
 
@@ -526,10 +532,8 @@ def main():
             st.metric("Equipos", len(modelo.equipos))
         
         with col2:
-            if hasattr(modelo, 'datos_originales') and modelo.datos_originales is not None:
-                st.metric("Partidos", len(modelo.datos_originales))
-            else:
-                st.metric("Partidos", "N/A")
+            n_partidos = modelo.numero_partidos()
+            st.metric("Partidos", n_partidos if n_partidos is not None else "N/A")
         
         with col3:
             st.metric("γ (Ventaja Local)", f"{modelo.gamma:.3f}")
@@ -538,12 +542,15 @@ def main():
             ventaja_pct = (modelo.gamma - 1) * 100
             st.metric("Ventaja Local %", f"+{ventaja_pct:.1f}%")
         
-        if hasattr(modelo, 'modelo_entrenado') and modelo.modelo_entrenado is not True and modelo.modelo_entrenado is not None:
+        # Parámetros de CSV (o su artefacto) no tienen llf/AIC
+        llf = getattr(modelo.modelo_entrenado, 'llf', None)
+        aic = getattr(modelo.modelo_entrenado, 'aic', None)
+        if llf is not None:
             col5, col6 = st.columns(2)
             with col5:
-                st.metric("Log-Likelihood", f"{modelo.modelo_entrenado.llf:.2f}")
+                st.metric("Log-Likelihood", f"{llf:.2f}")
             with col6:
-                st.metric("AIC", f"{modelo.modelo_entrenado.aic:.2f}")
+                st.metric("AIC", f"{aic:.2f}" if aic is not None else "N/A")
         
         # Explicación del modelo
         st.markdown("---")
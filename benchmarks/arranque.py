@@ -0,0 +1,104 @@
+"""Benchmark de arranque: importar el paquete, cargar un artefacto y predecir.
+
+Cada repetición corre en un intérprete nuevo y mide por separado la
+importación de `modelo_poisson`, `cargar_modelo` y una `predecir`. Termina
+con código 1 si esa ruta importa pandas, scipy, statsmodels o patsy, o si
+la mediana total supera `--limite-ms`.
+
+    python benchmarks/arranque.py --repeticiones 10 --salida arranque.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROHIBIDOS = ('pandas', 'scipy', 'statsmodels', 'patsy')
+
+HIJO = '''
+import json, sys, time
+inicio = time.perf_counter()
+from modelo_poisson import ModeloPoissonFutbol
+importado = time.perf_counter()
+modelo = ModeloPoissonFutbol()
+modelo.cargar_modelo(sys.argv[1])
+cargado = time.perf_counter()
+modelo.predecir(modelo.equipos[0], modelo.equipos[1], mostrar=False)
+fin = time.perf_counter()
+print(json.dumps({
+    'importar_ms': (importado - inicio) * 1e3,
+    'cargar_ms': (cargado - importado) * 1e3,
+    'predecir_ms': (fin - cargado) * 1e3,
+    'total_ms': (fin - inicio) * 1e3,
+    'modulos': sorted({m.split('.')[0] for m in sys.modules
+                       if m.split('.')[0] in %r}),
+}))
+''' % (PROHIBIDOS,)
+
+
+def crear_artefacto(ruta, ruta_csv):
+    """Entrena (en silencio) con el CSV del repositorio y guarda el artefacto."""
+    sys.path.insert(0, RAIZ)
+    from modelo_poisson import ModeloPoissonFutbol
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        modelo = ModeloPoissonFutbol()
+        modelo.cargar_datos(ruta_csv)
+        modelo.entrenar()
+        modelo.guardar_modelo(ruta)
+
+
+def medir(ruta, repeticiones):
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    mediciones = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', HIJO, ruta], env=entorno,
+                                capture_output=True, text=True, check=True)
+        mediciones.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+    return mediciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=10)
+    parser.add_argument('--limite-ms', type=float, default=500.0)
+    parser.add_argument('--csv', default=os.path.join(RAIZ, 'liga_mx_data_limpia.csv'))
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'modelo.mpoi')
+        crear_artefacto(ruta, args.csv)
+        mediciones = medir(ruta, args.repeticiones)
+
+    resumen = {clave: statistics.median(m[clave] for m in mediciones)
+               for clave in ('importar_ms', 'cargar_ms', 'predecir_ms', 'total_ms')}
+    importados = sorted({mod for m in mediciones for mod in m['modulos']})
+    resultado = {'repeticiones': args.repeticiones, 'mediana': resumen,
+                 'modulos_pesados': importados, 'limite_ms': args.limite_ms,
+                 'python': sys.version.split()[0]}
+
+    for clave, valor in resumen.items():
+        print(f"{clave:>12}: {valor:8.2f}")
+    if args.salida:
+        with open(args.salida, 'w') as f:
+            json.dump(resultado, f, indent=2)
+
+    errores = []
+    if importados:
+        errores.append(f"la ruta de predicción importó {', '.join(importados)}")
+    if resumen['total_ms'] > args.limite_ms:
+        errores.append(f"mediana {resumen['total_ms']:.1f} ms > {args.limite_ms} ms")
+    for error in errores:
+        print(f"✗ {error}")
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Compara dos JSON de `ejecutar.py` (p. ej. de dos commits).
+
+Empareja casos por (equipos, partidos) y muestra, para cada medición de
+tiempo o memoria, el valor anterior, el nuevo y la razón nuevo/anterior.
+
+    python benchmarks/comparar.py antes.json despues.json --umbral 1.2
+"""
+
+import argparse
+import json
+import sys
+
+METRICAS = ('segundos', 'cpu_segundos', 'memoria_pico_bytes', 'predecir_us',
+            'lote_segundos', 'montecarlo_segundos')
+
+
+def aplanar(valor, prefijo=''):
+    """{'a': {'b': 1}} → {'a.b': 1}, solo con las métricas de `METRICAS`."""
+    plano = {}
+    for clave, contenido in valor.items():
+        ruta = f'{prefijo}.{clave}' if prefijo else clave
+        if isinstance(contenido, dict):
+            plano.update(aplanar(contenido, ruta))
+        elif clave in METRICAS and isinstance(contenido, (int, float)):
+            plano[ruta] = contenido
+    return plano
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('anterior')
+    parser.add_argument('nuevo')
+    parser.add_argument('--umbral', type=float, default=None,
+                        help='Termina con código 1 si alguna razón lo supera')
+    args = parser.parse_args()
+
+    with open(args.anterior) as f:
+        anterior = json.load(f)
+    with open(args.nuevo) as f:
+        nuevo = json.load(f)
+    print(f"Anterior: {anterior['meta'].get('commit')}   "
+          f"Nuevo: {nuevo['meta'].get('commit')}")
+    if anterior['meta'].get('memoria') != nuevo['meta'].get('memoria'):
+        print("⚠ Solo una corrida usó --memoria: tracemalloc infla los tiempos")
+
+    casos_anteriores = {(c['equipos'], c['partidos']): c for c in anterior['casos']}
+    regresiones = []
+    for caso in nuevo['casos']:
+        clave = (caso['equipos'], caso['partidos'])
+        if clave not in casos_anteriores:
+            continue
+        print(f"\n{clave[0]} equipos × {clave[1]} partidos")
+        previo = aplanar(casos_anteriores[clave])
+        for ruta, valor in aplanar(caso).items():
+            if not previo.get(ruta):
+                continue
+            razon = valor / previo[ruta]
+            marca = ''
+            if args.umbral and razon > args.umbral:
+                marca = '  ✗'
+                regresiones.append((clave, ruta, razon))
+            print(f"  {ruta:<55} {previo[ruta]:>12.4g} {valor:>12.4g} {razon:>7.2f}x{marca}")
+
+    sys.exit(1 if regresiones else 0)
+
+
+if __name__ == '__main__':
+    main()
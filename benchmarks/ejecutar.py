@@ -0,0 +1,209 @@
+"""Suite de benchmarks de escalamiento sobre ligas sintéticas.
+
+Para cada combinación de equipos × partidos genera una liga
+(`liga_sintetica`), la escribe a CSV y mide con el perfil del modelo:
+carga, entrenamiento por backend, predicción individual, predicción por
+lote (`simular_jornada`) y rendimiento Monte Carlo. También comprueba que
+el ajuste nativo recupere los parámetros verdaderos. Los resultados van a
+un JSON comparable entre commits con `comparar.py`.
+
+    python benchmarks/ejecutar.py --equipos 20 200 --partidos 1000 100000 \\
+        --salida resultados.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from liga_sintetica import generar_liga, error_recuperacion  # noqa: E402
+from modelo_poisson import ModeloPoissonFutbol  # noqa: E402
+
+OPCIONES_BACKEND = {
+    'nativo': {},
+    'agregado': {'agregado': True},
+    'dixon_coles': {'dixon_coles': True},
+    'statsmodels': {'metodo': 'statsmodels'},
+}
+
+
+def metadatos():
+    """Commit, versiones y máquina, para comparar corridas."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'commit': commit or None,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def medir_prediccion(modelo, rng, n_individual, n_lote, n_partidos_mc,
+                     n_simulaciones):
+    """Latencia de `predecir` y rendimiento por lote y Monte Carlo."""
+    equipos = np.array(modelo.equipos)
+
+    def pares(k):
+        local = rng.integers(0, len(equipos), k)
+        visitante = (local + rng.integers(1, len(equipos), k)) % len(equipos)
+        return np.column_stack([equipos[local], equipos[visitante]])
+
+    individuales = pares(n_individual)
+    inicio = time.perf_counter()
+    for local, visitante in individuales:
+        modelo.predecir(local, visitante, mostrar=False)
+    individual = (time.perf_counter() - inicio) / n_individual
+
+    lote = pares(n_lote)
+    inicio = time.perf_counter()
+    modelo.simular_jornada(lote, mostrar=False)
+    tiempo_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    modelo.simular_montecarlo(pares(n_partidos_mc), n_simulaciones=n_simulaciones)
+    tiempo_mc = time.perf_counter() - inicio
+
+    return {
+        'predecir_us': individual * 1e6,
+        'lote_partidos': n_lote,
+        'lote_segundos': tiempo_lote,
+        'lote_partidos_por_segundo': n_lote / tiempo_lote,
+        'montecarlo_partidos': n_partidos_mc,
+        'montecarlo_simulaciones': n_simulaciones,
+        'montecarlo_segundos': tiempo_mc,
+        'montecarlo_marcadores_por_segundo': n_partidos_mc * n_simulaciones / tiempo_mc,
+    }
+
+
+def ejecutar_caso(n_equipos, n_partidos, args, directorio):
+    """Mide un caso completo y devuelve su diccionario de resultados."""
+    caso = {'equipos': n_equipos, 'partidos': n_partidos,
+            'temporadas': args.temporadas}
+
+    inicio = time.perf_counter()
+    partidos, verdad = generar_liga(n_equipos, n_partidos, args.temporadas,
+                                    semilla=args.semilla)
+    caso['generar_segundos'] = time.perf_counter() - inicio
+    ruta = os.path.join(directorio, f'liga_{n_equipos}_{n_partidos}.csv')
+    partidos.to_csv(ruta, index=False)
+    caso['csv_bytes'] = os.path.getsize(ruta)
+    del partidos
+
+    modelo = ModeloPoissonFutbol()
+    modelo.activar_perfil(memoria=args.memoria)
+    modelo.cargar_datos(ruta)
+    caso['carga'] = modelo.desactivar_perfil()
+
+    caso['backends'] = {}
+    for backend in args.backends:
+        if backend == 'statsmodels' and (n_equipos > args.max_equipos_statsmodels or
+                                         n_partidos > args.max_partidos_statsmodels):
+            caso['backends'][backend] = {'omitido': 'demasiado grande (diseño denso)'}
+            continue
+        modelo.activar_perfil(memoria=args.memoria)
+        modelo.entrenar(**OPCIONES_BACKEND[backend])
+        resultado = {'etapas': modelo.desactivar_perfil(),
+                     'llf': float(modelo.modelo_entrenado.llf),
+                     'iteraciones': getattr(modelo.modelo_entrenado, 'iteraciones', None)}
+        alpha, beta = (np.array([d[e] for e in modelo.equipos])
+                       for d in (modelo.alpha, modelo.beta))
+        resultado['recuperacion'] = error_recuperacion(modelo.equipos, alpha, beta,
+                                                       modelo.gamma, verdad)
+        caso['backends'][backend] = resultado
+
+    # Predicción siempre con el ajuste nativo
+    modelo.entrenar()
+    caso['prediccion'] = medir_prediccion(
+        modelo, np.random.default_rng(args.semilla), args.predicciones,
+        args.lote, args.partidos_montecarlo, args.simulaciones
+    )
+    os.remove(ruta)
+
+    return caso
+
+
+def verificar_recuperacion(caso, umbral, min_partidos_por_equipo):
+    """Mensajes de error si el ajuste nativo no recupera los parámetros."""
+    nativo = caso['backends'].get('nativo', {}).get('recuperacion')
+    if nativo is None or 2 * caso['partidos'] / caso['equipos'] < min_partidos_por_equipo:
+        return []
+    errores = [f"{caso['equipos']} equipos × {caso['partidos']} partidos: "
+               f"correlación de {nombre} {nativo[f'correlacion_{nombre}']:.3f} < {umbral}"
+               for nombre in ('ataque', 'defensa')
+               if nativo[f'correlacion_{nombre}'] < umbral]
+    return errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--equipos', type=int, nargs='+', default=[20, 200])
+    parser.add_argument('--partidos', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--temporadas', type=int, default=5)
+    parser.add_argument('--backends', nargs='+', default=list(OPCIONES_BACKEND),
+                        choices=list(OPCIONES_BACKEND))
+    parser.add_argument('--max-equipos-statsmodels', type=int, default=60)
+    parser.add_argument('--max-partidos-statsmodels', type=int, default=200_000)
+    parser.add_argument('--predicciones', type=int, default=1000,
+                        help='Llamadas a predecir() para medir la latencia')
+    parser.add_argument('--lote', type=int, default=10_000,
+                        help='Partidos de la predicción por lote')
+    parser.add_argument('--partidos-montecarlo', type=int, default=10)
+    parser.add_argument('--simulaciones', type=int, default=100_000)
+    parser.add_argument('--memoria', action='store_true',
+                        help='Pico de memoria por etapa con tracemalloc (más lento)')
+    parser.add_argument('--umbral-correlacion', type=float, default=0.8)
+    parser.add_argument('--min-partidos-por-equipo', type=float, default=30)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='resultados_benchmark.json')
+    args = parser.parse_args()
+
+    # El paquete importa pandas/scipy/statsmodels en diferido: se cargan
+    # antes para no medir importaciones dentro del primer caso
+    import scipy.special  # noqa: F401
+    from modelo_poisson import optimizacion, preparacion_datos  # noqa: F401
+    if 'statsmodels' in args.backends:
+        import statsmodels.api  # noqa: F401
+
+    resultados = {'meta': dict(metadatos(), memoria=args.memoria), 'casos': []}
+    errores = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for n_equipos in args.equipos:
+            for n_partidos in args.partidos:
+                print(f"→ {n_equipos} equipos × {n_partidos} partidos", flush=True)
+                caso = ejecutar_caso(n_equipos, n_partidos, args, directorio)
+                resultados['casos'].append(caso)
+                errores += verificar_recuperacion(caso, args.umbral_correlacion,
+                                                  args.min_partidos_por_equipo)
+                for backend, resultado in caso['backends'].items():
+                    if 'etapas' in resultado:
+                        print(f"   {backend:>12}: "
+                              f"{resultado['etapas']['entrenar']['segundos']:.3f} s")
+
+    with open(args.salida, 'w') as f:
+        json.dump(resultados, f, indent=2)
+    print(f"✓ Resultados en {args.salida}")
+
+    for error in errores:
+        print(f"✗ Recuperación de parámetros: {error}")
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Generador de ligas sintéticas con parámetros conocidos.
+
+Muestrea partidos de un Poisson con λ_local = α_i·β_j·γ y
+λ_visitante = α_j·β_i, con log α y log β normales centrados. Devuelve un
+DataFrame con las columnas de `COLUMNAS_REQUERIDAS` y los parámetros
+verdaderos para comprobar su recuperación.
+
+    python benchmarks/liga_sintetica.py --equipos 200 --partidos 100000 \\
+        --salida liga_200.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+def generar_liga(n_equipos=20, n_partidos=None, n_temporadas=1, gamma=1.3,
+                 sigma=0.3, goles_medios=1.35, semilla=0, anio_inicio=2015):
+    """(partidos, verdad) de una liga sintética.
+
+    Sin `n_partidos` cada temporada es un doble round-robin (N·(N−1)
+    partidos); con `n_partidos` se reparten partidos entre pares al azar
+    en `n_temporadas`. Los equipos son categóricos para que 10⁷ partidos
+    quepan en memoria. `verdad` trae log α, log β (centrados) y γ.
+    """
+    rng = np.random.default_rng(semilla)
+    n = n_equipos
+
+    log_ataque = rng.normal(0, sigma, n)
+    log_defensa = rng.normal(0, sigma, n)
+    log_ataque -= log_ataque.mean()
+    log_defensa -= log_defensa.mean()
+    # Intercepto para que la media de goles por equipo sea `goles_medios`
+    base = np.log(goles_medios) - np.log(gamma) / 2
+
+    if n_partidos is None:
+        local, visitante = np.nonzero(~np.eye(n, dtype=bool))
+        local = np.tile(local, n_temporadas)
+        visitante = np.tile(visitante, n_temporadas)
+        temporada = np.repeat(np.arange(n_temporadas), n * (n - 1))
+    else:
+        local = rng.integers(0, n, n_partidos)
+        visitante = (local + rng.integers(1, n, n_partidos)) % n
+        temporada = np.sort(rng.integers(0, n_temporadas, n_partidos))
+
+    # Orden aleatorio dentro de la temporada y fechas a lo largo de 180 días
+    orden = np.lexsort((rng.random(len(local)), temporada))
+    local, visitante, temporada = local[orden], visitante[orden], temporada[orden]
+    posicion = np.arange(len(local)) - np.searchsorted(temporada, temporada)
+    por_temporada = np.bincount(temporada, minlength=n_temporadas)[temporada]
+    dias = 365 * temporada + (180 * posicion) // np.maximum(por_temporada, 1)
+    fecha = np.datetime64(f'{anio_inicio}-01-01') + dias.astype('timedelta64[D]')
+
+    lambda_local = np.exp(base + log_ataque[local] + log_defensa[visitante]) * gamma
+    lambda_visitante = np.exp(base + log_ataque[visitante] + log_defensa[local])
+
+    ancho = len(str(n - 1))
+    equipos = [f'Equipo_{i:0{ancho}d}' for i in range(n)]
+    partidos = pd.DataFrame({
+        'Temporada': (anio_inicio + temporada).astype(np.int16),
+        'Fecha': fecha,
+        'Equipo_Local': pd.Categorical.from_codes(local, equipos),
+        'Equipo_Visitante': pd.Categorical.from_codes(visitante, equipos),
+        'Goles_Local': rng.poisson(lambda_local).astype(np.int16),
+        'Goles_Visitante': rng.poisson(lambda_visitante).astype(np.int16),
+    })
+    verdad = {'equipos': equipos, 'log_ataque': log_ataque,
+              'log_defensa': log_defensa, 'gamma': gamma}
+
+    return partidos, verdad
+
+
+def error_recuperacion(equipos_estimados, alpha, beta, gamma, verdad):
+    """RMSE y correlación de log α/log β centrados, y error relativo de γ."""
+    posicion = pd.Index(verdad['equipos']).get_indexer(equipos_estimados)
+    resultado = {}
+    for nombre, estimado, real in (('ataque', alpha, verdad['log_ataque']),
+                                   ('defensa', beta, verdad['log_defensa'])):
+        estimado = np.log(np.asarray(estimado))
+        estimado = estimado - estimado.mean()
+        real = real[posicion] - real[posicion].mean()
+        resultado[f'rmse_{nombre}'] = float(np.sqrt(np.mean((estimado - real) ** 2)))
+        resultado[f'correlacion_{nombre}'] = float(np.corrcoef(estimado, real)[0, 1])
+    resultado['error_relativo_gamma'] = float(gamma / verdad['gamma'] - 1)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--equipos', type=int, default=20)
+    parser.add_argument('--partidos', type=int, default=None)
+    parser.add_argument('--temporadas', type=int, default=5)
+    parser.add_argument('--gamma', type=float, default=1.3)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', required=True)
+    args = parser.parse_args()
+
+    partidos, _ = generar_liga(args.equipos, args.partidos, args.temporadas,
+                               gamma=args.gamma, semilla=args.semilla)
+    partidos.to_csv(args.salida, index=False)
+    print(f"✓ {len(partidos)} partidos de {args.equipos} equipos en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,20 +2,24 @@
 Script principal - Modelo de Predicción para Liga MX
 """
 
-from modelo_poisson import ModeloPoissonFutbol
+from modelo_poisson import ModeloPoissonFutbol, configurar_consola
+from modelo_poisson.cache_modelos import DIRECTORIO_POR_DEFECTO
 
 
 def main():
     """
     Función principal que ejecuta todo el flujo del modelo.
     """
+    # La biblioteca es silenciosa por defecto: la CLI muestra sus mensajes
+    configurar_consola()
+    
     print("MODELO DE PREDICCIÓN PARA LIGA MX")
     
     # ==========================================
     # PASO 1: CREAR INSTANCIA Y CARGAR DATOS
     # ==========================================
     print("PASO 1: Inicialización\n" + "-" * 70)
-    modelo = ModeloPoissonFutbol()
+    modelo = ModeloPoissonFutbol(directorio_cache=DIRECTORIO_POR_DEFECTO)
     
     try:
         modelo.cargar_datos('liga_mx_data_limpia.csv')
@@ -122,6 +126,7 @@ def main():
     
     # Exportar parámetros
     modelo.exportar_parametros('parametros_modelo.csv')
+    modelo.guardar_modelo('modelo.mpoi')
     
     # Exportar predicciones de jornada
     jornada_df.to_csv('predicciones_jornada.csv', index=False)
@@ -138,6 +143,7 @@ def main():
     print("  • ranking_ataque.csv")
     print("  • ranking_defensa.csv")
     print("  • parametros_modelo.csv")
+    print("  • modelo.mpoi")
     print("  • predicciones_jornada.csv")
     
     print("\n Próximos pasos:")
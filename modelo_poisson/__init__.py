@@ -1,7 +1,13 @@
-"""Paquete `modelo_poisson`: exporta `ModeloPoissonFutbol`."""
+"""Paquete `modelo_poisson`: exporta `ModeloPoissonFutbol` y `configurar_consola`."""
+
+import logging
 
 from .modelo import ModeloPoissonFutbol
+from .utils import configurar_consola
+
+# Biblioteca silenciosa por defecto (sin "No handlers could be found")
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __version__ = '1.0.0'
 __author__ = 'Fernando'
-__all__ = ['ModeloPoissonFutbol']
+__all__ = ['ModeloPoissonFutbol', 'configurar_consola']
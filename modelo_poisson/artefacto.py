@@ -0,0 +1,130 @@
+"""Artefacto binario del modelo: cabecera JSON + arreglos alineados (mmap).
+
+Formato (versión 1)::
+
+    b'MPOISSON' | uint64 LE largo de la cabecera | cabecera JSON (UTF-8)
+    | arreglos float64 contiguos, cada uno alineado a 64 bytes
+
+La cabecera guarda equipos, escalares (γ, ρ, ξ), metadatos del ajuste y
+el desplazamiento/forma de cada arreglo. Al cargar con `mmap=True` los
+arreglos son vistas de solo lectura sobre el archivo: no se copian y el
+sistema operativo comparte las páginas entre procesos.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGICO = b'MPOISSON'
+VERSION = 1
+_ALINEACION = 64
+
+
+def _alinear(n):
+    return -(-n // _ALINEACION) * _ALINEACION
+
+
+def guardar_artefacto(ruta, equipos, arreglos, escalares=None, metadatos=None):
+    """Escribe el artefacto de forma atómica (archivo temporal + rename).
+
+    `arreglos` es un dict nombre → arreglo numérico (se guarda como
+    float64 C-contiguo); `escalares` y `metadatos` deben ser serializables
+    a JSON.
+    """
+    arreglos = {nombre: np.ascontiguousarray(valor, dtype=np.float64)
+                for nombre, valor in arreglos.items() if valor is not None}
+
+    # Desplazamientos relativos al inicio de la zona de datos
+    indice, desplazamiento = {}, 0
+    for nombre, valor in arreglos.items():
+        indice[nombre] = {'offset': desplazamiento, 'shape': list(valor.shape),
+                          'dtype': '<f8'}
+        desplazamiento = _alinear(desplazamiento + valor.nbytes)
+
+    cabecera = {'version': VERSION, 'equipos': list(equipos),
+                'escalares': escalares or {}, 'metadatos': metadatos or {},
+                'arreglos': indice}
+    texto = json.dumps(cabecera, ensure_ascii=False).encode('utf-8')
+    inicio_datos = _alinear(len(MAGICO) + 8 + len(texto))
+    texto = texto.ljust(inicio_datos - len(MAGICO) - 8)
+
+    temporal = f'{ruta}.tmp{os.getpid()}'
+    with open(temporal, 'wb') as f:
+        f.write(MAGICO + struct.pack('<Q', len(texto)) + texto)
+        for nombre, valor in arreglos.items():
+            f.seek(inicio_datos + indice[nombre]['offset'])
+            f.write(valor.tobytes())
+    os.replace(temporal, ruta)
+
+
+def leer_cabecera(ruta):
+    """Cabecera JSON y desplazamiento de la zona de datos (sin leer arreglos)."""
+    with open(ruta, 'rb') as f:
+        prefijo = f.read(len(MAGICO) + 8)
+        if len(prefijo) < len(MAGICO) + 8 or prefijo[:len(MAGICO)] != MAGICO:
+            raise ValueError(f"No es un artefacto de modelo: {ruta}")
+        largo = struct.unpack('<Q', prefijo[len(MAGICO):])[0]
+        cabecera = json.loads(f.read(largo))
+
+    if cabecera['version'] > VERSION:
+        raise ValueError(f"Artefacto versión {cabecera['version']} no soportada "
+                         f"(máxima {VERSION})")
+    return cabecera, len(MAGICO) + 8 + largo
+
+
+def cargar_artefacto(ruta, mmap=True):
+    """Devuelve (cabecera, arreglos) de un artefacto.
+
+    Con `mmap=True` los arreglos son vistas de solo lectura sobre el
+    archivo mapeado en memoria; con `mmap=False` se leen a memoria propia.
+    """
+    cabecera, inicio_datos = leer_cabecera(ruta)
+
+    if mmap:
+        buffer = np.memmap(ruta, dtype=np.uint8, mode='r')
+    else:
+        with open(ruta, 'rb') as f:
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+    arreglos = {}
+    for nombre, info in cabecera['arreglos'].items():
+        dtype = np.dtype(info['dtype'])
+        inicio = inicio_datos + info['offset']
+        fin = inicio + dtype.itemsize * int(np.prod(info['shape']))
+        arreglos[nombre] = buffer[inicio:fin].view(dtype).reshape(info['shape'])
+
+    return cabecera, arreglos
+
+
+class AjusteCargado:
+    """Ajuste leído de un artefacto con la interfaz mínima de statsmodels.
+
+    `params` y `cov_params()` se construyen solo cuando se piden, para que
+    cargar el artefacto no pague pandas.
+    """
+
+    def __init__(self, equipos, theta, metadatos, covarianza=None):
+        self.equipos = list(equipos)
+        self.theta = theta
+        self.llf = metadatos.get('llf')
+        self.aic = metadatos.get('aic')
+        self.nobs = metadatos.get('nobs')
+        self.converged = metadatos.get('convergido')
+        self.metadatos = metadatos
+        self._covarianza = covarianza
+
+    @property
+    def params(self):
+        import pandas as pd
+        from .preparacion_datos import nombres_parametros
+        return pd.Series(self.theta, index=nombres_parametros(self.equipos))
+
+    def cov_params(self):
+        """Covarianza guardada en el artefacto."""
+        if self._covarianza is None:
+            raise ValueError("El artefacto no incluye la matriz de covarianza")
+        import pandas as pd
+        indice = self.params.index
+        return pd.DataFrame(self._covarianza, index=indice, columns=indice)
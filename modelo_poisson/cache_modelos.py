@@ -0,0 +1,56 @@
+"""Caché en disco de modelos ajustados, direccionada por contenido.
+
+Cada entrada es un artefacto `.mpoi` (ver `artefacto`) cuyo nombre es el
+SHA-256 de la huella de los datos y de las opciones de entrenamiento. El
+mtime de cada archivo marca su último uso; al superar el tamaño máximo
+se eliminan primero las entradas usadas hace más tiempo (LRU).
+"""
+
+import hashlib
+import json
+import os
+
+from .artefacto import VERSION
+
+EXTENSION = '.mpoi'
+DIRECTORIO_POR_DEFECTO = os.path.join(os.path.expanduser('~'), '.cache',
+                                      'modelo_poisson')
+
+
+def clave_cache(hash_datos, opciones):
+    """Clave de una entrada: datos normalizados + opciones + versión de formato."""
+    texto = json.dumps({'datos': hash_datos, 'opciones': opciones,
+                        'version': VERSION}, sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def ruta_entrada(directorio, clave):
+    return os.path.join(directorio, clave + EXTENSION)
+
+
+def buscar_en_cache(directorio, clave):
+    """Ruta de la entrada si existe (y la marca como usada); si no, None."""
+    ruta = ruta_entrada(directorio, clave)
+    try:
+        os.utime(ruta)
+    except FileNotFoundError:
+        return None
+    return ruta
+
+
+def podar_cache(directorio, tam_max):
+    """Elimina las entradas menos usadas hasta quedar en `tam_max` bytes."""
+    entradas = []
+    for entrada in os.scandir(directorio):
+        if entrada.name.endswith(EXTENSION):
+            info = entrada.stat()
+            entradas.append((info.st_mtime, info.st_size, entrada.path))
+
+    total = 0
+    for _, tamano, ruta in sorted(entradas, reverse=True):
+        total += tamano
+        if total > tam_max:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass  # Ya eliminada o abierta por otro proceso (Windows)
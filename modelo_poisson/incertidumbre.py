@@ -0,0 +1,182 @@
+"""Incertidumbre de parámetros y probabilidades (bootstrap y covarianza)."""
+
+import numpy as np
+import pandas as pd
+
+from . import optimizacion as opt
+from . import preparacion_datos as prep
+from .predicciones import probabilidades_1x2
+from .simulacion import _semillas_bloques, _ejecutar_bloques
+
+
+def _conteos_remuestreo(rng, n_partidos, grupos=None):
+    """Veces que cada partido entra en una réplica (por partido o por grupo)."""
+    if grupos is None:
+        return np.bincount(rng.integers(0, n_partidos, n_partidos),
+                           minlength=n_partidos)
+    n_grupos = grupos.max() + 1
+    conteo_grupo = np.bincount(rng.integers(0, n_grupos, n_grupos),
+                               minlength=n_grupos)
+    return conteo_grupo[grupos]
+
+
+def _ajustar_replicas(tarea):
+    """Reajusta un lote de réplicas bootstrap desde el ajuste completo."""
+    (goles_local, goles_visitante, idx_local, idx_visitante, n_equipos,
+     pesos, grupos, theta_inicial, rho_inicial, dixon_coles, parametrizacion,
+     penalizacion, semillas) = tarea
+    n = n_equipos
+    k = len(goles_local)
+
+    # Celdas (atacante, defensor, local) fijas: cada réplica solo cambia sumas
+    atacante = np.concatenate([idx_local, idx_visitante])
+    defensor = np.concatenate([idx_visitante, idx_local])
+    local = np.repeat([1, 0], k)
+    goles = np.concatenate([goles_local, goles_visitante]).astype(float)
+    celdas, inversa = np.unique((atacante * n + defensor) * 2 + local,
+                                return_inverse=True)
+
+    thetas = np.empty((len(semillas), 2 * n + 1))
+    rhos = np.zeros(len(semillas))
+    for r, semilla in enumerate(semillas):
+        conteo = _conteos_remuestreo(np.random.default_rng(semilla), k, grupos)
+        w = conteo * pesos
+        if dixon_coles:
+            theta, rhos[r] = opt.ajustar_dixon_coles(
+                goles_local, goles_visitante, idx_local, idx_visitante, n,
+                pesos=w, theta_inicial=theta_inicial, rho_inicial=rho_inicial,
+                parametrizacion=parametrizacion, penalizacion=penalizacion
+            )[:2]
+        else:
+            w2 = np.tile(w, 2)
+            theta = opt.ajustar_poisson(
+                np.bincount(inversa, w2 * goles), celdas // 2 // n,
+                celdas // 2 % n, celdas % 2, n,
+                exposicion=np.bincount(inversa, w2),
+                log_factorial=np.zeros(len(celdas)), theta_inicial=theta_inicial,
+                parametrizacion=parametrizacion, penalizacion=penalizacion
+            )[0]
+        # Equipos ausentes de la réplica no tienen estimación
+        presentes = (np.bincount(idx_local, w, n) + np.bincount(idx_visitante, w, n)) > 0
+        theta[:n][~presentes] = np.nan
+        theta[n:2 * n][~presentes] = np.nan
+        thetas[r] = theta
+
+    return thetas, rhos
+
+
+def bootstrap_parametros(partidos, equipos, n_replicas=1000, por_jornada=False,
+                         pesos=None, dixon_coles=False, theta_inicial=None,
+                         rho_inicial=0.0, parametrizacion='libre', penalizacion=0.0,
+                         semilla=42, tam_lote=50, n_procesos=1):
+    """Réplicas bootstrap de θ = [log α, log β, log γ] (y ρ).
+
+    Remuestrea partidos con reemplazo (o jornadas completas con
+    `por_jornada=True`) y reajusta cada réplica partiendo de
+    `theta_inicial` con la misma `parametrizacion` y `penalizacion` del
+    ajuste completo. Cada réplica tiene su propia semilla, así que el
+    resultado no depende de `n_procesos` ni de `tam_lote`.
+    """
+    idx_local, idx_visitante = prep._indices_equipos(partidos, equipos)
+    k = len(partidos)
+    grupos = prep.asignar_jornadas(partidos) if por_jornada else None
+    pesos = np.ones(k) if pesos is None else np.asarray(pesos, dtype=float)
+
+    semillas = _semillas_bloques(semilla, n_replicas)
+    tareas = [(partidos['Goles_Local'].values, partidos['Goles_Visitante'].values,
+               idx_local.astype(np.intp), idx_visitante.astype(np.intp),
+               len(equipos), pesos, grupos, theta_inicial, rho_inicial,
+               dixon_coles, parametrizacion, penalizacion,
+               semillas[inicio:inicio + tam_lote])
+              for inicio in range(0, n_replicas, tam_lote)]
+    lotes = _ejecutar_bloques(_ajustar_replicas, tareas, n_procesos)
+
+    return {
+        'theta': np.vstack([thetas for thetas, _ in lotes]),
+        'rho': np.concatenate([rhos for _, rhos in lotes]) if dixon_coles else None,
+    }
+
+
+def intervalos_parametros(equipos, theta_muestras, theta, nivel=0.95):
+    """α/β por equipo y γ con intervalos percentiles a partir de muestras de θ."""
+    n = len(equipos)
+    cola = (1 - nivel) / 2 * 100
+    inferior, superior = np.exp(np.nanpercentile(theta_muestras, [cola, 100 - cola],
+                                                 axis=0))
+    estimado = np.exp(theta)
+
+    df = pd.DataFrame({
+        'Equipo': list(equipos),
+        'Alpha': estimado[:n],
+        'Alpha_Inf': inferior[:n],
+        'Alpha_Sup': superior[:n],
+        'Beta': estimado[n:2 * n],
+        'Beta_Inf': inferior[n:2 * n],
+        'Beta_Sup': superior[n:2 * n],
+    })
+    gamma = {'Gamma': float(estimado[2 * n]), 'Gamma_Inf': float(inferior[2 * n]),
+             'Gamma_Sup': float(superior[2 * n])}
+
+    return df, gamma
+
+
+def intervalos_partidos(theta_muestras, idx_local, idx_visitante, n_equipos,
+                        rho_muestras=None, nivel=0.95, max_goles=10,
+                        max_elementos=20_000_000):
+    """Media e intervalo percentil de P(1X2) de K partidos para B muestras de θ.
+
+    Cada bloque de partidos se resuelve como un tensor B×k×(G+1) con
+    `probabilidades_1x2`; `max_elementos` acota su tamaño. Devuelve
+    arreglos K×3 (media, inferior, superior) en el orden local, empate,
+    visitante.
+    """
+    n = n_equipos
+    ataque = np.exp(theta_muestras[:, :n])
+    defensa = np.exp(theta_muestras[:, n:2 * n])
+    gamma = np.exp(theta_muestras[:, [2 * n]])
+    rho = None if rho_muestras is None else np.asarray(rho_muestras)[:, None]
+    idx_local = np.asarray(idx_local)
+    idx_visitante = np.asarray(idx_visitante)
+    cola = (1 - nivel) / 2 * 100
+
+    k = len(idx_local)
+    bloque = max(1, max_elementos // (len(theta_muestras) * (max_goles + 1)))
+    media, inferior, superior = (np.empty((k, 3)) for _ in range(3))
+    for inicio in range(0, k, bloque):
+        fin = min(inicio + bloque, k)
+        loc, vis = idx_local[inicio:fin], idx_visitante[inicio:fin]
+        probabilidades = probabilidades_1x2(ataque[:, loc] * defensa[:, vis] * gamma,
+                                            ataque[:, vis] * defensa[:, loc],
+                                            max_goles, rho)
+        # nanpercentile es mucho más lento; solo hay NaN con equipos ausentes
+        hay_nan = np.isnan(probabilidades).any()
+        percentil = np.nanpercentile if hay_nan else np.percentile
+        media[inicio:fin] = (np.nanmean if hay_nan else np.mean)(probabilidades, axis=0)
+        inferior[inicio:fin], superior[inicio:fin] = percentil(
+            probabilidades, [cola, 100 - cola], axis=0
+        )
+
+    return {'media': media, 'inferior': inferior, 'superior': superior}
+
+
+def muestras_normales(theta, cov, n_muestras=2000, semilla=42):
+    """Muestras de θ ~ N(θ̂, Σ) con la covarianza asintótica del ajuste.
+
+    Σ es singular en la dirección no identificada del diseño, así que se
+    factoriza por valores propios (sin Cholesky).
+    """
+    valores, vectores = np.linalg.eigh(np.asarray(cov, dtype=float))
+    raiz = vectores * np.sqrt(np.clip(valores, 0, None))
+    z = np.random.default_rng(semilla).standard_normal((n_muestras, len(theta)))
+
+    return np.asarray(theta, dtype=float) + z @ raiz.T
+
+
+def tabla_intervalos_partidos(partidos, intervalos):
+    """DataFrame de P(1X2)_% con sus bandas para una lista de partidos."""
+    df = pd.DataFrame({'Local': partidos[:, 0], 'Visitante': partidos[:, 1]})
+    for k, nombre in enumerate(['Vic_Local', 'Empate', 'Vic_Visit']):
+        df[f'P({nombre})_%'] = intervalos['media'][:, k] * 100
+        df[f'P({nombre})_Inf_%'] = intervalos['inferior'][:, k] * 100
+        df[f'P({nombre})_Sup_%'] = intervalos['superior'][:, k] * 100
+    return df
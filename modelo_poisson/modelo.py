@@ -1,36 +1,155 @@
 """Clase principal del modelo de Poisson (flujo principal)."""
 
-import pandas as pd
-import statsmodels.api as sm
-import statsmodels.formula.api as smf
+import contextlib
+import functools
+import logging
+import os
+import time
+import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
-from . import preparacion_datos as prep
 from . import predicciones as pred
-from .utils import imprimir_titulo, interpretar_parametro
+from . import puntos
+from . import artefacto
+from . import cache_modelos
+from .perfil import Perfilador
+from .simulacion import simular_partidos_montecarlo
+from .utils import (formatear_titulo, interpretar_parametro, validar_equipo,
+                    importar_diferido, logger, registrar_evento)
+
+# Cargar un artefacto y predecir solo necesita NumPy: pandas y los módulos
+# de ajuste se ejecutan en su primer uso, y statsmodels/scipy se importan
+# dentro de las funciones que los requieren.
+pd = importar_diferido('pandas')
+prep = importar_diferido('.preparacion_datos', __package__)
+opt = importar_diferido('.optimizacion', __package__)
+torneo = importar_diferido('.torneo', __package__)
+validacion = importar_diferido('.validacion', __package__)
+incertidumbre = importar_diferido('.incertidumbre', __package__)
+
+
+def _etapa(nombre):
+    """Mide el método como etapa `nombre` del perfil (si está activo)."""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            if self._perfilador is None:
+                return metodo(self, *args, **kwargs)
+            with self._perfilador.medir(nombre):
+                return metodo(self, *args, **kwargs)
+        return envoltura
+    return decorador
 
 
 class ModeloPoissonFutbol:
     """Modelo Poisson: carga datos, entrena y genera predicciones."""
     
-    def __init__(self):
-        """Inicializa el modelo."""
+    def __init__(self, directorio_cache=None, tam_max_cache=256 * 2**20):
+        """Inicializa el modelo.
+
+        Con `directorio_cache` (p. ej. `cache_modelos.DIRECTORIO_POR_DEFECTO`)
+        `entrenar` reutiliza ajustes previos de los mismos datos y opciones;
+        la caché se poda (LRU) a `tam_max_cache` bytes.
+        """
+        self.directorio_cache = directorio_cache
+        self.tam_max_cache = tam_max_cache
         self.modelo_entrenado = None
         self.equipos = None
         self.alpha = None
         self.beta = None
         self.gamma = None
+        self.rho = None
         self.datos_originales = None
         self._datos_entrenamiento = None
+        self._tabla_pares = None
+        self._vectores = None
+        self._opciones_entrenamiento = None
+        self._perfilador = None
+    
+    def activar_perfil(self, memoria=False, callback=None):
+        """Mide tiempo de pared, CPU y (con `memoria=True`) pico de memoria.
+
+        Etapas: `cargar_datos`, `cargar_parametros`, `entrenar` (con
+        `preparar_datos`, `ajuste`, `extraer_parametros` y, con statsmodels,
+        `importar_statsmodels` y `matriz_diseno`),
+        `actualizar` y las llamadas de predicción/simulación.
+        `callback(etapa, medicion)` se llama al cerrar cada etapa.
+        Desactivado no cuesta más que una comprobación por llamada.
+        """
+        self.desactivar_perfil()
+        self._perfilador = Perfilador(memoria, callback)
+        return self._perfilador
+    
+    def desactivar_perfil(self):
+        """Deja de medir y devuelve el resumen acumulado."""
+        if self._perfilador is None:
+            return {}
+        resumen = self._perfilador.resumen()
+        self._perfilador.cerrar()
+        self._perfilador = None
+        return resumen
+    
+    @property
+    def perfil(self):
+        """Totales por etapa del perfil activo ({} si está desactivado)."""
+        return {} if self._perfilador is None else self._perfilador.resumen()
+    
+    def exportar_perfil(self, ruta):
+        """Exporta el perfil activo (resumen y mediciones) a JSON."""
+        if self._perfilador is None:
+            raise ValueError("Primero activa el perfil con .activar_perfil()")
+        self._perfilador.exportar_json(ruta)
+    
+    def _medir(self, etapa):
+        """Contexto que mide una sub-etapa (nulo sin perfil activo)."""
+        if self._perfilador is None:
+            return contextlib.nullcontext()
+        return self._perfilador.medir(etapa)
+    
+    def _invalidar_cache(self):
+        """Descarta resultados derivados de los parámetros anteriores."""
+        self._tabla_pares = None
+        self._vectores = None
     
-    def cargar_datos(self, ruta_csv):
-        """Carga datos históricos desde CSV y devuelve DataFrame."""
-        self.datos_originales, self.equipos = prep.cargar_datos_historicos(ruta_csv)
+    def _vectores_parametros(self):
+        """α y β como arreglos en el orden de `self.equipos`."""
+        if self._vectores is None:
+            self._vectores = (
+                np.array([self.alpha[eq] for eq in self.equipos]),
+                np.array([self.beta[eq] for eq in self.equipos])
+            )
+        return self._vectores
+    
+    def _indices_equipos(self, partidos):
+        """Índices (local, visitante) de cada partido; -1 si el equipo no existe."""
+        indice = pd.Index(self.equipos)
+        return (indice.get_indexer(partidos[:, 0]),
+                indice.get_indexer(partidos[:, 1]))
+    
+    def _lineas_ventaja_local(self):
+        """Líneas de γ (y ρ) que se muestran al entrenar o cargar parámetros."""
+        lineas = [f"✓ Ventaja de local (γ): {self.gamma:.3f}",
+                  f"  → Equipos locales anotan {(self.gamma-1)*100:.1f}% más goles"]
+        if self.rho is not None:
+            lineas.append(f"✓ Corrección Dixon-Coles (ρ): {self.rho:.4f}")
+        return lineas
+    
+    @_etapa('cargar_datos')
+    def cargar_datos(self, ruta_csv, tam_bloque=None, mapa_equipos=None):
+        """Carga datos históricos (CSV, Parquet o Feather) y devuelve DataFrame.
+
+        Ver `preparacion_datos.cargar_datos_historicos` para `tam_bloque` y
+        `mapa_equipos`.
+        """
+        self.datos_originales, self.equipos = prep.cargar_datos_historicos(
+            ruta_csv, tam_bloque=tam_bloque, mapa_equipos=mapa_equipos
+        )
         return self.datos_originales
 
+    @_etapa('cargar_parametros')
     def cargar_parametros(self, ruta_csv='parametros_modelo.csv'):
-        import os
+        inicio = time.perf_counter()
         
         # Validar existencia del archivo
         if not os.path.exists(ruta_csv):
@@ -53,20 +172,28 @@ class ModeloPoissonFutbol:
         self.alpha = dict(zip(df['Equipo'], df['Alpha_Ataque']))
         self.beta = dict(zip(df['Equipo'], df['Beta_Defensa']))
         self.gamma = df['Gamma_Local'].iloc[0]  # Gamma es constante
+        self.rho = df['Rho_DC'].iloc[0] if 'Rho_DC' in df else None
+        self._invalidar_cache()
+        # Las opciones de un ajuste anterior no describen estos parámetros; los
+        # datos cargados se conservan (se puede volver a entrenar)
+        self._datos_entrenamiento = None
+        self._opciones_entrenamiento = None
         
         # Marcar como "entrenado" (aunque no se re-entrenó)
         self.modelo_entrenado = True
         
-        # Imprimir confirmación
-        imprimir_titulo("PARÁMETROS CARGADOS DESDE CSV")
-        print(f"\n✓ Archivo: {ruta_csv}")
-        print(f"✓ Equipos cargados: {len(self.equipos)}")
-        print(f"✓ Ventaja de local (γ): {self.gamma:.3f}")
-        print(f"  → Equipos locales anotan {(self.gamma-1)*100:.1f}% más goles")
-        
-        print("\n" + "✓" * 35)
-        print("MODELO LISTO PARA PREDICCIONES")
-        print("✓" * 35 + "\n")
+        # Confirmación
+        if logger.isEnabledFor(logging.INFO):
+            lineas = [formatear_titulo("PARÁMETROS CARGADOS DESDE CSV"),
+                      f"\n✓ Archivo: {ruta_csv}",
+                      f"✓ Equipos cargados: {len(self.equipos)}",
+                      *self._lineas_ventaja_local(),
+                      "\n" + "✓" * 35, "MODELO LISTO PARA PREDICCIONES",
+                      "✓" * 35 + "\n"]
+            logger.info("\n".join(lineas))
+        registrar_evento('parametros_cargados', archivo=str(ruta_csv), formato='csv',
+                         equipos=len(self.equipos),
+                         segundos=time.perf_counter() - inicio)
         
         return {
             'equipos': len(self.equipos),
@@ -74,67 +201,584 @@ class ModeloPoissonFutbol:
             'archivo': ruta_csv
         }
 
-    def entrenar(self):
-        """Prepara datos, construye y ajusta el GLM Poisson."""
-        if self.datos_originales is None:
-            raise ValueError("Primero debes cargar datos con .cargar_datos()")
+    def guardar_modelo(self, ruta='modelo.mpoi', covarianza=True):
+        """Guarda el modelo en el artefacto binario (ver `artefacto`).
+
+        Incluye α, β, γ, ρ, ξ, la covarianza del ajuste (si existe y
+        `covarianza=True`), la huella de los datos de entrenamiento y los
+        metadatos del ajuste. `exportar_parametros` sigue disponible para CSV.
+        """
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        self._escribir_artefacto(ruta, covarianza)
+        logger.info("✓ Modelo guardado en: %s", ruta)
+    
+    def _escribir_artefacto(self, ruta, covarianza=True, hash_datos=None):
+        """Escribe el artefacto de `guardar_modelo` (sin mensajes)."""
+        alpha, beta = self._vectores_parametros()
+        ajuste = self.modelo_entrenado
+        cov = None
+        if covarianza and hasattr(ajuste, 'cov_params'):
+            try:
+                cov = np.asarray(ajuste.cov_params(), dtype=float)
+            except ValueError:
+                cov = None
         
-        # Preparar datos
-        self._datos_entrenamiento = prep.preparar_datos_modelo(
-            self.datos_originales, self.equipos
+        # Sin opciones los parámetros no se ajustaron en este proceso (p. ej.
+        # vienen de `cargar_parametros`): no hay opciones ni datos que anotar
+        opciones = self._opciones_entrenamiento
+        con_datos = opciones is not None and self.datos_originales is not None
+        metadatos = {
+            'llf': float(ajuste.llf) if hasattr(ajuste, 'llf') else None,
+            'aic': float(ajuste.aic) if hasattr(ajuste, 'aic') else None,
+            'nobs': float(ajuste.nobs) if hasattr(ajuste, 'nobs') else None,
+            'convergido': bool(getattr(ajuste, 'converged', True)),
+            'opciones': None if opciones is None else {
+                clave: (valor if isinstance(valor, (bool, int, float, str))
+                        or valor is None else str(valor))
+                for clave, valor in opciones.items()},
+            'n_partidos': len(self.datos_originales) if con_datos else None,
+            'hash_datos': (hash_datos if hash_datos is not None
+                           else prep.huella_datos(self.datos_originales)
+                           if con_datos else None),
+            'creado': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        if isinstance(ajuste, artefacto.AjusteCargado):
+            metadatos = dict(ajuste.metadatos, creado=metadatos['creado'])
+        
+        artefacto.guardar_artefacto(
+            ruta, self.equipos,
+            {'alpha': alpha, 'beta': beta, 'covarianza': cov},
+            {'gamma': float(self.gamma),
+             'rho': None if self.rho is None else float(self.rho),
+             'xi': float((opciones or {}).get('xi') or 0.0)},
+            metadatos
         )
+    
+    @_etapa('cargar_parametros')
+    def cargar_modelo(self, ruta='modelo.mpoi', mmap=True):
+        """Carga un artefacto de `guardar_modelo` sin pandas ni reajuste.
+
+        Con `mmap=True` α, β y la covarianza son vistas de solo lectura del
+        archivo mapeado (sin copia, compartidas entre procesos). Devuelve
+        los metadatos del ajuste.
+        """
+        inicio = time.perf_counter()
+        cabecera, arreglos = artefacto.cargar_artefacto(ruta, mmap)
+        escalares = cabecera['escalares']
+        alpha, beta = arreglos['alpha'], arreglos['beta']
         
-        # Construir fórmula
-        formula = prep.construir_formula_glm(self.equipos)
+        self.equipos = cabecera['equipos']
+        self.alpha = dict(zip(self.equipos, alpha.tolist()))
+        self.beta = dict(zip(self.equipos, beta.tolist()))
+        self.gamma = escalares['gamma']
+        self.rho = escalares.get('rho')
+        self._invalidar_cache()
+        self._vectores = (alpha, beta)
+        self._datos_entrenamiento = None
+        self._opciones_entrenamiento = None
+        
+        theta = np.concatenate([np.log(alpha), np.log(beta), [np.log(self.gamma)]])
+        self.modelo_entrenado = artefacto.AjusteCargado(
+            self.equipos, theta, cabecera['metadatos'], arreglos.get('covarianza')
+        )
+        registrar_evento('parametros_cargados', archivo=str(ruta), formato='mpoi',
+                         equipos=len(self.equipos),
+                         segundos=time.perf_counter() - inicio)
+        
+        return cabecera['metadatos']
+    
+    @_etapa('entrenar')
+    def entrenar(self, metodo='nativo', agregado=False, xi=0.0,
+                 fecha_referencia=None, dixon_coles=False, parametrizacion='libre',
+                 penalizacion=0.0):
+        """Prepara datos y ajusta el GLM Poisson.
+
+        `metodo='nativo'` usa el Newton por índices de `optimizacion`;
+        `metodo='statsmodels'` ajusta `sm.GLM` sobre la matriz de diseño como
+        referencia. `agregado=True` (solo nativo) ajusta sobre las celdas
+        (atacante, defensor, local), con costo independiente del historial.
+        `xi` > 0 pondera cada partido con exp(-ξ·días) hasta
+        `fecha_referencia` (por defecto, la fecha más reciente); los
+        partidos posteriores no cuentan.
+        `dixon_coles=True` (solo nativo, por partido) ajusta además ρ, la
+        dependencia entre marcadores bajos (0-0, 1-0, 0-1, 1-1).
+        `parametrizacion='suma_cero'` (solo nativo) resuelve cada paso con
+        intercepto y efectos de ataque/defensa que suman cero, un sistema de
+        rango completo; α, β y γ se reportan en la convención de siempre.
+        `penalizacion` κ > 0 (solo nativo) encoge log α y log β hacia la
+        media de la liga, estabilizando equipos con pocos partidos (ver
+        `validar_penalizacion` para elegir κ).
+        """
+        if self.datos_originales is None:
+            raise ValueError("Primero debes cargar datos con .cargar_datos()")
+        if metodo not in ('nativo', 'statsmodels'):
+            raise ValueError(f"Método no soportado: {metodo}")
+        if agregado and metodo != 'nativo':
+            raise ValueError("El modo agregado solo está disponible con metodo='nativo'")
+        if dixon_coles and (metodo != 'nativo' or agregado):
+            raise ValueError("Dixon-Coles requiere metodo='nativo' y agregado=False")
+        if parametrizacion not in ('libre', 'suma_cero'):
+            raise ValueError(f"Parametrización no soportada: {parametrizacion}")
+        if parametrizacion != 'libre' and metodo != 'nativo':
+            raise ValueError("La parametrización suma_cero requiere metodo='nativo'")
+        if penalizacion and metodo != 'nativo':
+            raise ValueError("La penalización requiere metodo='nativo'")
+
+        inicio = time.perf_counter()
+        opciones = {
+            'metodo': metodo, 'agregado': agregado, 'xi': xi,
+            'fecha_referencia': fecha_referencia, 'dixon_coles': dixon_coles,
+            'parametrizacion': parametrizacion, 'penalizacion': penalizacion
+        }
+        ruta_cache, hash_datos = None, None
+        if self.directorio_cache is not None:
+            hash_datos = prep.huella_datos(self.datos_originales)
+            clave = cache_modelos.clave_cache(hash_datos, opciones)
+            ruta_cache = cache_modelos.ruta_entrada(self.directorio_cache, clave)
+            if cache_modelos.buscar_en_cache(self.directorio_cache, clave):
+                try:
+                    return self._entrenar_desde_cache(ruta_cache, opciones, inicio)
+                except (OSError, ValueError, KeyError):
+                    pass  # Entrada ilegible: se reajusta y se reescribe
         
         # Entrenar modelo
-        imprimir_titulo("ENTRENANDO MODELO GLM")
-        print(f"\n✓ Familia: Poisson")
-        print(f"✓ Enlace: Logarítmico")
-        print(f"✓ Variables: {len(self.equipos) * 2 + 1}")
-        print(f"\nOptimizando con Maximum Likelihood...")
-        
-        self.modelo_entrenado = smf.glm(
-            formula=formula,
-            data=self._datos_entrenamiento,
-            family=sm.families.Poisson()
-        ).fit()
-        
-        print("✓ Convergencia exitosa")
-        print(f"✓ Log-Likelihood: {self.modelo_entrenado.llf:.2f}")
-        print(f"✓ AIC: {self.modelo_entrenado.aic:.2f}")
+        if logger.isEnabledFor(logging.INFO):
+            lineas = [formatear_titulo("ENTRENANDO MODELO GLM"),
+                      "\n✓ Familia: Poisson", "✓ Enlace: Logarítmico",
+                      f"✓ Variables: {len(self.equipos) * 2 + 1}",
+                      f"✓ Método: {metodo}"]
+            if dixon_coles:
+                lineas.append("✓ Corrección Dixon-Coles: sí")
+            if penalizacion:
+                lineas.append(f"✓ Penalización ridge: κ = {penalizacion}")
+            if xi:
+                lineas.append(f"✓ Decaimiento temporal: ξ = {xi} por día")
+            lineas.append("\nOptimizando con Maximum Likelihood...")
+            logger.info("\n".join(lineas))
+        
+        pesos, referencia = None, None
+        if xi:
+            referencia = (pd.to_datetime(self.datos_originales['Fecha']).max()
+                          if fecha_referencia is None
+                          else pd.Timestamp(fecha_referencia))
+            pesos = prep.pesos_decaimiento(self.datos_originales['Fecha'],
+                                           xi, referencia)
+            sin_partidos = (set(self.equipos) -
+                            set(prep.equipos_presentes(self.datos_originales[pesos > 0]))
+                            if (pesos == 0).any() else set())
+            if sin_partidos:
+                logger.warning("Sin partidos hasta %s (parámetros no identificados): %s",
+                               referencia.date(), ', '.join(sorted(sin_partidos)))
+        
+        with self._medir('preparar_datos'):
+            if agregado:
+                self._datos_entrenamiento = prep.agregar_datos_modelo(
+                    self.datos_originales, self.equipos, pesos
+                )
+            else:
+                self._datos_entrenamiento = prep.preparar_datos_modelo(
+                    self.datos_originales, self.equipos, pesos
+                )
+        
+        if dixon_coles:
+            with self._medir('ajuste'):
+                self.modelo_entrenado = opt.ajustar_modelo_dixon_coles(
+                    self.datos_originales, self.equipos, pesos,
+                    parametrizacion=parametrizacion, penalizacion=penalizacion
+                )
+        elif metodo == 'nativo':
+            with self._medir('ajuste'):
+                self.modelo_entrenado = opt.ajustar_modelo_nativo(
+                    self._datos_entrenamiento, self.equipos,
+                    parametrizacion=parametrizacion, penalizacion=penalizacion
+                )
+        else:
+            with self._medir('importar_statsmodels'):
+                import statsmodels.api as sm
+            with self._medir('matriz_diseno'):
+                diseno = prep.construir_matriz_diseno(
+                    self._datos_entrenamiento, len(self.equipos)
+                )
+                exog = pd.DataFrame(diseno.toarray(),
+                                    columns=prep.nombres_parametros(self.equipos))
+            # statsmodels registra sus propios filtros al importarse: el
+            # aviso de diseño de rango incompleto es esperado
+            with self._medir('ajuste'), warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                self.modelo_entrenado = sm.GLM(
+                    self._datos_entrenamiento['goles'], exog,
+                    family=sm.families.Poisson(),
+                    freq_weights=self._datos_entrenamiento.get('peso')
+                ).fit()
+        
+        logger.info("✓ Convergencia exitosa\n✓ Log-Likelihood: %.2f\n✓ AIC: %.2f",
+                    self.modelo_entrenado.llf, self.modelo_entrenado.aic)
         
         # Extraer parámetros
-        print("\nExtrayendo parámetros...")
+        logger.info("\nExtrayendo parámetros...")
+        with self._medir('extraer_parametros'):
+            self.alpha, self.beta, self.gamma = prep.extraer_parametros_modelo(
+                self.modelo_entrenado, self.equipos
+            )
+        self.rho = getattr(self.modelo_entrenado, 'rho', None)
+        self._invalidar_cache()
+        self._opciones_entrenamiento = dict(opciones, referencia=referencia)
+        
+        if ruta_cache is not None:
+            os.makedirs(self.directorio_cache, exist_ok=True)
+            self._escribir_artefacto(ruta_cache, hash_datos=hash_datos)
+            cache_modelos.podar_cache(self.directorio_cache, self.tam_max_cache)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n".join([*self._lineas_ventaja_local(), "\n" + "✓" * 35,
+                                   "MODELO ENTRENADO EXITOSAMENTE", "✓" * 35 + "\n"]))
+        self._registrar_ajuste('entrenamiento', inicio, cache=False)
+        
+        return self.modelo_entrenado
+    
+    def _registrar_ajuste(self, etapa, inicio, **campos):
+        """Evento con las estadísticas del ajuste actual."""
+        ajuste = self.modelo_entrenado
+        iteraciones = getattr(ajuste, 'iteraciones', None)
+        if iteraciones is None and hasattr(ajuste, 'fit_history'):
+            iteraciones = ajuste.fit_history['iteration']  # statsmodels IRLS
+        registrar_evento(
+            etapa, metodo=self._opciones_entrenamiento['metodo'],
+            equipos=len(self.equipos), iteraciones=iteraciones,
+            llf=float(ajuste.llf), aic=float(ajuste.aic),
+            convergido=bool(getattr(ajuste, 'converged', True)),
+            rho=self.rho, segundos=time.perf_counter() - inicio, **campos
+        )
+    
+    def _entrenar_desde_cache(self, ruta, opciones, inicio):
+        """Restaura un ajuste de la caché y prepara lo necesario para `actualizar`."""
+        self.cargar_modelo(ruta)
+        
+        pesos, referencia = None, None
+        if opciones['xi']:
+            referencia = (pd.to_datetime(self.datos_originales['Fecha']).max()
+                          if opciones['fecha_referencia'] is None
+                          else pd.Timestamp(opciones['fecha_referencia']))
+            pesos = prep.pesos_decaimiento(self.datos_originales['Fecha'],
+                                           opciones['xi'], referencia)
+        self._datos_entrenamiento = prep.codificar_partidos(
+            self.datos_originales, self.equipos, pesos
+        )
+        if opciones['agregado']:
+            self._datos_entrenamiento = prep.agrupar_celdas(
+                self._datos_entrenamiento, len(self.equipos)
+            )
+        self._opciones_entrenamiento = dict(opciones, referencia=referencia)
+        
+        logger.info("✓ Modelo recuperado de la caché: %s\n✓ Log-Likelihood: %.2f"
+                    "\n✓ AIC: %.2f", os.path.basename(ruta)[:12],
+                    self.modelo_entrenado.llf, self.modelo_entrenado.aic)
+        self._registrar_ajuste('entrenamiento', inicio, cache=True)
+        
+        return self.modelo_entrenado
+    
+    @_etapa('actualizar')
+    def actualizar(self, nuevos_partidos):
+        """Agrega partidos nuevos y reajusta desde los coeficientes previos.
+
+        Solo codifica los partidos nuevos (o los suma a las celdas si el
+        modelo se entrenó con `agregado=True`) y el Newton arranca del ajuste
+        anterior, por lo que suelen bastar 2-3 iteraciones.
+        """
+        if (not isinstance(self.modelo_entrenado,
+                           (opt.ResultadoAjuste, artefacto.AjusteCargado))
+                or self._opciones_entrenamiento is None
+                or self._opciones_entrenamiento['metodo'] != 'nativo'):
+            raise ValueError("actualizar requiere un modelo entrenado con metodo='nativo'")
+        
+        prep.validar_columnas(nuevos_partidos)
+        inicio = time.perf_counter()
+        # El estado del modelo solo cambia si el reajuste termina
+        opciones = dict(self._opciones_entrenamiento)
+        agregado, xi = opciones['agregado'], opciones['xi']
+        params_previos = self.modelo_entrenado.params
+        datos = self._datos_entrenamiento
+        
+        todos = prep.concatenar_partidos(self.datos_originales, nuevos_partidos)
+        recientes = todos.iloc[len(self.datos_originales):]
+        equipos = self.equipos
+        equipos_nuevos = set(prep.equipos_presentes(recientes)) - set(equipos)
+        
+        pesos_todos, pesos_nuevos = None, None
+        if xi:
+            # Con referencia móvil, todos los pesos previos decaen por igual
+            referencia = opciones['referencia']
+            if opciones['fecha_referencia'] is None:
+                referencia = max(referencia,
+                                 pd.to_datetime(nuevos_partidos['Fecha']).max())
+                factor = np.exp(-xi * (referencia - opciones['referencia']).days)
+                datos = datos.copy()
+                for columna in ('peso', 'goles', 'exposicion', 'log_factorial'):
+                    if columna in datos and (agregado or columna == 'peso'):
+                        datos[columna] = datos[columna] * factor
+                opciones['referencia'] = referencia
+            pesos_todos = prep.pesos_decaimiento(todos['Fecha'],
+                                                 xi, referencia)
+            pesos_nuevos = pesos_todos[len(self.datos_originales):]
+        
+        if equipos_nuevos:
+            # Cambian los índices: se recodifica todo el historial
+            equipos = sorted(set(equipos) | equipos_nuevos)
+            datos = prep.codificar_partidos(todos, equipos, pesos_todos)
+            if agregado:
+                datos = prep.agrupar_celdas(datos, len(equipos))
+        else:
+            nuevos = prep.codificar_partidos(recientes, equipos, pesos_nuevos)
+            if agregado:
+                nuevos = prep.agrupar_celdas(nuevos, len(equipos))
+            datos = pd.concat([datos, nuevos], ignore_index=True)
+            if agregado:
+                datos = prep.agrupar_celdas(datos, len(equipos))
+        
+        theta_inicial = params_previos.reindex(
+            prep.nombres_parametros(equipos)
+        ).fillna(0).values
+        if opciones.get('dixon_coles'):
+            ajuste = opt.ajustar_modelo_dixon_coles(
+                todos, equipos, pesos_todos,
+                theta_inicial=theta_inicial, rho_inicial=self.rho,
+                parametrizacion=opciones['parametrizacion'],
+                penalizacion=opciones['penalizacion']
+            )
+        else:
+            ajuste = opt.ajustar_modelo_nativo(
+                datos, equipos, theta_inicial=theta_inicial,
+                parametrizacion=opciones['parametrizacion'],
+                penalizacion=opciones['penalizacion']
+            )
+        self.datos_originales, self.equipos = todos, equipos
+        self._datos_entrenamiento = datos
+        self._opciones_entrenamiento = opciones
+        self.modelo_entrenado = ajuste
         self.alpha, self.beta, self.gamma = prep.extraer_parametros_modelo(
             self.modelo_entrenado, self.equipos
         )
+        self.rho = getattr(self.modelo_entrenado, 'rho', None)
+        self._invalidar_cache()
         
-        print(f"✓ Ventaja de local (γ): {self.gamma:.3f}")
-        print(f"  → Equipos locales anotan {(self.gamma-1)*100:.1f}% más goles")
-        
-        print("\n" + "✓" * 35)
-        print("MODELO ENTRENADO EXITOSAMENTE")
-        print("✓" * 35 + "\n")
+        logger.info("✓ %d partidos nuevos (%d en total)\n✓ Iteraciones: %d"
+                    "\n✓ Log-Likelihood: %.2f", len(nuevos_partidos),
+                    len(self.datos_originales), self.modelo_entrenado.iteraciones,
+                    self.modelo_entrenado.llf)
+        self._registrar_ajuste('actualizacion', inicio,
+                               partidos_nuevos=len(nuevos_partidos),
+                               partidos=len(self.datos_originales))
         
         return self.modelo_entrenado
     
+    def barrer_decaimiento(self, valores_xi, fraccion_validacion=0.2):
+        """Evalúa una rejilla de ξ por log-verosimilitud fuera de muestra.
+
+        Ajusta con los partidos anteriores al corte (último
+        `fraccion_validacion` del calendario) y evalúa en los posteriores.
+        Los grupos (celda, antigüedad) se construyen una vez y cada ξ
+        arranca del ajuste del anterior, así que cada punto cuesta unas
+        pocas iteraciones sobre ≤ 2N² celdas.
+        """
+        if self.datos_originales is None:
+            raise ValueError("Primero debes cargar datos con .cargar_datos()")
+        
+        fechas = pd.to_datetime(self.datos_originales['Fecha'])
+        corte = fechas.quantile(1 - fraccion_validacion)
+        entrenamiento = self.datos_originales[fechas < corte]
+        equipos = prep.equipos_presentes(entrenamiento)
+        validacion = self.datos_originales[
+            (fechas >= corte) &
+            self.datos_originales['Equipo_Local'].isin(equipos) &
+            self.datos_originales['Equipo_Visitante'].isin(equipos)
+        ]
+        
+        grupos = prep.agrupar_celdas_por_antiguedad(
+            prep.codificar_partidos(entrenamiento, equipos),
+            (corte - fechas[fechas < corte]).dt.days.values, len(equipos)
+        )
+        datos_validacion = prep.codificar_partidos(validacion, equipos)
+        
+        filas, theta = [], None
+        for xi in sorted(valores_xi):
+            inicio = time.perf_counter()
+            ajuste = opt.ajustar_modelo_nativo(prep.ponderar_celdas(grupos, xi),
+                                               equipos, theta_inicial=theta)
+            theta = ajuste.theta
+            llf = opt.log_verosimilitud(
+                theta, datos_validacion['goles'], datos_validacion['atacante'],
+                datos_validacion['defensor'], datos_validacion['local'],
+                len(equipos)
+            )
+            filas.append({
+                'xi': xi,
+                'Log_Verosimilitud_Validacion': llf,
+                'Log_Verosimilitud_Por_Partido': llf / len(validacion),
+                'Iteraciones': ajuste.iteraciones,
+                'Tiempo_s': time.perf_counter() - inicio
+            })
+        
+        return pd.DataFrame(filas)
+    
+    def validar_penalizacion(self, valores=None, n_pliegues=5, xi=0.0, semilla=42,
+                             n_procesos=1):
+        """Elige la penalización ridge κ por validación cruzada K-fold.
+
+        Los pliegues se ajustan en paralelo y cada uno recorre `valores` de
+        mayor a menor arrancando del ajuste anterior. Devuelve un DataFrame
+        con la log-verosimilitud fuera de muestra de cada κ.
+        """
+        if self.datos_originales is None:
+            raise ValueError("Primero debes cargar datos con .cargar_datos()")
+        if valores is None:
+            valores = np.concatenate([[0.0], np.logspace(-1, 3, 13)])
+        
+        pesos = (prep.pesos_decaimiento(self.datos_originales['Fecha'], xi)
+                 if xi else None)
+        return validacion.validar_penalizacion(
+            self.datos_originales, self.equipos, valores, n_pliegues, pesos,
+            semilla, n_procesos
+        )
+    
+    def backtest(self, min_partidos=300, xi=0.0, dixon_coles=False, n_procesos=1):
+        """Backtest con origen móvil sobre los datos cargados.
+
+        Para cada jornada ajusta con todos los partidos anteriores y predice
+        esa jornada. Devuelve el DataFrame por partido (probabilidades, RPS,
+        log-loss y Brier) y un diccionario resumen con la calibración.
+        """
+        if self.datos_originales is None:
+            raise ValueError("Primero debes cargar datos con .cargar_datos()")
+        
+        return validacion.backtest_origen_movil(
+            self.datos_originales, min_partidos=min_partidos, xi=xi,
+            dixon_coles=dixon_coles, n_procesos=n_procesos
+        )
+    
+    def bootstrap(self, n_replicas=1000, partidos=None, por_jornada=False,
+                  nivel=0.95, semilla=42, n_procesos=1):
+        """Intervalos de confianza bootstrap para α, β, γ y P(1X2).
+
+        Remuestrea los partidos de entrenamiento (o jornadas completas con
+        `por_jornada=True`) y reajusta cada réplica con las mismas opciones
+        de `entrenar`, arrancando del ajuste completo. Con `partidos`
+        (lista de pares local/visitante) se agregan bandas para su 1X2.
+        """
+        # Un ajuste restaurado de la caché (`AjusteCargado`) también sirve
+        opciones = self._opciones_entrenamiento
+        if (not isinstance(self.modelo_entrenado,
+                           (opt.ResultadoAjuste, artefacto.AjusteCargado))
+                or opciones is None or opciones['metodo'] != 'nativo'):
+            raise ValueError("bootstrap requiere un modelo entrenado con metodo='nativo'")
+        
+        pesos = None
+        if opciones['xi']:
+            pesos = prep.pesos_decaimiento(self.datos_originales['Fecha'],
+                                           opciones['xi'], opciones['referencia'])
+        
+        muestras = incertidumbre.bootstrap_parametros(
+            self.datos_originales, self.equipos, n_replicas,
+            por_jornada=por_jornada, pesos=pesos,
+            dixon_coles=opciones.get('dixon_coles', False),
+            theta_inicial=self.modelo_entrenado.theta,
+            rho_inicial=self.rho or 0.0,
+            parametrizacion=opciones.get('parametrizacion', 'libre'),
+            penalizacion=opciones.get('penalizacion', 0.0),
+            semilla=semilla, n_procesos=n_procesos
+        )
+        return self._resumir_muestras(muestras['theta'], muestras['rho'],
+                                      partidos, nivel)
+    
+    def intervalos_analiticos(self, partidos=None, n_muestras=2000, nivel=0.95,
+                              semilla=42):
+        """Intervalos a partir de la covarianza asintótica del ajuste.
+
+        Alternativa barata al bootstrap: muestrea θ ~ N(θ̂, Σ) con
+        `cov_params()` y propaga todas las muestras por el motor vectorizado.
+        Devuelve el mismo diccionario que `bootstrap` (ρ queda fijo).
+        """
+        if not hasattr(self.modelo_entrenado, 'cov_params'):
+            raise ValueError("Primero debes entrenar el modelo con .entrenar()")
+        
+        theta = self.modelo_entrenado.params.values
+        muestras_theta = incertidumbre.muestras_normales(
+            theta, self.modelo_entrenado.cov_params().values, n_muestras, semilla
+        )
+        muestras_rho = None if self.rho is None else np.full(n_muestras, self.rho)
+        
+        return self._resumir_muestras(muestras_theta, muestras_rho, partidos, nivel)
+    
+    def _resumir_muestras(self, muestras_theta, muestras_rho, partidos, nivel):
+        """Intervalos de parámetros (y de P(1X2) de `partidos`) desde muestras."""
+        parametros, gamma = incertidumbre.intervalos_parametros(
+            self.equipos, muestras_theta, self.modelo_entrenado.params.values, nivel
+        )
+        resultado = {'parametros': parametros, 'gamma': gamma,
+                     'muestras': {'theta': muestras_theta, 'rho': muestras_rho}}
+        if muestras_rho is not None and np.ptp(muestras_rho) > 0:
+            cola = (1 - nivel) / 2 * 100
+            inferior, superior = np.percentile(muestras_rho, [cola, 100 - cola])
+            resultado['rho'] = {'Rho': float(self.rho), 'Rho_Inf': float(inferior),
+                                'Rho_Sup': float(superior)}
+        
+        if partidos is not None:
+            partidos = np.asarray(partidos, dtype=object).reshape(-1, 2)
+            idx_local, idx_visitante = self._indices_equipos(partidos)
+            if (idx_local < 0).any() or (idx_visitante < 0).any():
+                desconocidos = sorted(set(partidos.ravel()) - set(self.equipos))
+                raise ValueError(f"Equipos no encontrados: {', '.join(desconocidos)}")
+            intervalos = incertidumbre.intervalos_partidos(
+                muestras_theta, idx_local, idx_visitante, len(self.equipos),
+                muestras_rho, nivel
+            )
+            resultado['partidos'] = incertidumbre.tabla_intervalos_partidos(
+                partidos, intervalos
+            )
+        
+        return resultado
+    
+    @_etapa('predecir')
     def predecir(self, equipo_local, equipo_visitante, max_goles=5, mostrar=True):
         """Predicción de partido; devuelve un diccionario con resultados."""
         if self.modelo_entrenado is None:
             raise ValueError("Primero debes entrenar el modelo con .entrenar()")
         
-        prediccion = pred.predecir_partido_completo(
-            equipo_local, equipo_visitante,
-            self.alpha, self.beta, self.gamma,
-            self.equipos, max_goles
-        )
+        tabla = self._tabla_pares
+        if tabla is not None and tabla['max_goles'] == max_goles:
+            prediccion = pred.consultar_tabla(tabla, equipo_local, equipo_visitante)
+        else:
+            prediccion = pred.predecir_partido_completo(
+                equipo_local, equipo_visitante,
+                self.alpha, self.beta, self.gamma,
+                self.equipos, max_goles, rho=self.rho
+            )
         
         if mostrar:
             pred.mostrar_prediccion_formato(prediccion)
         
         return prediccion
     
+    @_etapa('precalcular_predicciones')
+    def precalcular_predicciones(self, max_goles=5, incluir_matrices=None):
+        """Materializa la tabla N×N de predicciones para consultas O(1).
+
+        `predecir` la usa mientras coincida `max_goles`; se descarta sola al
+        volver a entrenar o cargar parámetros. Con `incluir_matrices=None`
+        el tensor de marcadores se guarda completo si cabe en 64 MB (ver
+        `predicciones.construir_tabla_pares`).
+        """
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        self._tabla_pares = pred.construir_tabla_pares(
+            self.equipos, self.alpha, self.beta, self.gamma,
+            max_goles, incluir_matrices, rho=self.rho
+        )
+        
+        return self._tabla_pares
+    
     def obtener_ranking_ataque(self, top_n=None):
         """Devuelve DataFrame con ranking de ataque."""
         if self.alpha is None:
@@ -184,7 +828,6 @@ class ModeloPoissonFutbol:
         if self.alpha is None or self.beta is None:
             raise ValueError("Primero debes entrenar el modelo")
         
-        from .utils import validar_equipo
         validar_equipo(equipo, self.equipos)
         
         return {
@@ -209,32 +852,249 @@ class ModeloPoissonFutbol:
         
         return pd.DataFrame(comparacion)
     
-    def simular_jornada(self, lista_partidos, mostrar=True):
-        """Simula múltiples partidos; devuelve DataFrame con probabilidades."""
-        resultados = []
-        
-        for local, visitante in lista_partidos:
-            if local in self.equipos and visitante in self.equipos:
-                pred_dict = self.predecir(local, visitante, mostrar=False)
-                
-                resultados.append({
-                    'Local': local,
-                    'Visitante': visitante,
-                    'P(Vic_Local)_%': pred_dict['prob_victoria_local'] * 100,
-                    'P(Empate)_%': pred_dict['prob_empate'] * 100,
-                    'P(Vic_Visit)_%': pred_dict['prob_victoria_visitante'] * 100,
-                    'Marcador_Probable': pred_dict['marcador_mas_probable']
-                })
+    @_etapa('simular_jornada')
+    def simular_jornada(self, lista_partidos, mostrar=True, omitir_desconocidos=False):
+        """Predice múltiples partidos de una vez; devuelve DataFrame.
+
+        Los equipos que no están en el modelo provocan ValueError; con
+        `omitir_desconocidos=True` esos partidos se descartan y se reportan.
+        """
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
         
-        df_jornada = pd.DataFrame(resultados)
+        partidos = np.asarray(lista_partidos, dtype=object).reshape(-1, 2)
+        idx_local, idx_visitante = self._indices_equipos(partidos)
         
-        if mostrar:
-            imprimir_titulo("PREDICCIONES DE LA JORNADA")
-            print(df_jornada.to_string(index=False))
-            print()
+        validos = (idx_local >= 0) & (idx_visitante >= 0)
+        if not validos.all():
+            desconocidos = sorted(set(partidos[~validos].ravel()) - set(self.equipos))
+            if not omitir_desconocidos:
+                raise ValueError(f"Equipos no encontrados: {', '.join(desconocidos)}")
+            logger.warning("⚠ Partidos omitidos (%d) por equipos desconocidos: %s",
+                           (~validos).sum(), ', '.join(desconocidos))
+            partidos = partidos[validos]
+            idx_local, idx_visitante = idx_local[validos], idx_visitante[validos]
+        
+        ataque, defensa = self._vectores_parametros()
+        lote = pred.predecir_lote(
+            ataque[idx_local] * defensa[idx_visitante] * self.gamma,
+            ataque[idx_visitante] * defensa[idx_local], rho=self.rho
+        )
+        
+        df_jornada = pd.DataFrame({
+            'Local': partidos[:, 0],
+            'Visitante': partidos[:, 1],
+            'P(Vic_Local)_%': lote['prob_victoria_local'] * 100,
+            'P(Empate)_%': lote['prob_empate'] * 100,
+            'P(Vic_Visit)_%': lote['prob_victoria_visitante'] * 100,
+            'Marcador_Probable': (
+                lote['goles_local_probable'].astype(str).astype(object) + '-' +
+                lote['goles_visitante_probable'].astype(str).astype(object)
+            )
+        })
+        
+        if mostrar and logger.isEnabledFor(logging.INFO):
+            logger.info("%s\n%s\n", formatear_titulo("PREDICCIONES DE LA JORNADA"),
+                        df_jornada.to_string(index=False))
         
         return df_jornada
     
+    @_etapa('simular_montecarlo')
+    def simular_montecarlo(self, lista_partidos, n_simulaciones=10000, semilla=42,
+                           n_procesos=1):
+        """Monte Carlo de varios partidos; devuelve DataFrame con frecuencias."""
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        partidos = np.asarray(lista_partidos, dtype=object).reshape(-1, 2)
+        idx_local, idx_visitante = self._indices_equipos(partidos)
+        if (idx_local < 0).any() or (idx_visitante < 0).any():
+            desconocidos = sorted(set(partidos.ravel()) - set(self.equipos))
+            raise ValueError(f"Equipos no encontrados: {', '.join(desconocidos)}")
+        
+        ataque, defensa = self._vectores_parametros()
+        sim = simular_partidos_montecarlo(
+            ataque[idx_local] * defensa[idx_visitante] * self.gamma,
+            ataque[idx_visitante] * defensa[idx_local],
+            n_simulaciones, semilla=semilla, n_procesos=n_procesos, rho=self.rho
+        )
+        
+        return pd.DataFrame({
+            'Local': partidos[:, 0],
+            'Visitante': partidos[:, 1],
+            'P(Vic_Local)_%': sim['pct_victorias_local'] * 100,
+            'P(Empate)_%': sim['pct_empates'] * 100,
+            'P(Vic_Visit)_%': sim['pct_victorias_visitante'] * 100,
+            'Goles_Local_Prom': sim['goles_promedio_local'],
+            'Goles_Visit_Prom': sim['goles_promedio_visitante']
+        })
+    
+    def _preparar_torneo(self, partidos_restantes, tabla_actual):
+        """Partidos como arreglo, equipos del torneo y acumulados de la tabla."""
+        partidos = np.asarray(partidos_restantes, dtype=object).reshape(-1, 2)
+        equipos_torneo = set(partidos.ravel())
+        if tabla_actual is not None:
+            equipos_torneo |= set(tabla_actual['Equipo'])
+        equipos_torneo = sorted(equipos_torneo)
+        
+        desconocidos = sorted(set(equipos_torneo) - set(self.equipos))
+        if desconocidos:
+            raise ValueError(f"Equipos no encontrados: {', '.join(desconocidos)}")
+        
+        acumulados = {}
+        if tabla_actual is not None:
+            tabla = tabla_actual.set_index('Equipo').reindex(equipos_torneo)
+            for columna, clave in (('Puntos', 'puntos'), ('DG', 'diferencia'),
+                                   ('GF', 'goles_favor')):
+                if columna in tabla:
+                    acumulados[clave] = tabla[columna].fillna(0).values
+        
+        return partidos, equipos_torneo, acumulados
+    
+    @_etapa('simular_temporada')
+    def simular_temporada(self, partidos_restantes, tabla_actual=None,
+                          n_temporadas=10000, semilla=42, n_procesos=1,
+                          zonas=None):
+        """Distribución de posiciones finales simulando los partidos restantes.
+
+        `tabla_actual` es un DataFrame con columnas `Equipo`, `Puntos` y
+        opcionalmente `DG` (diferencia de goles) y `GF` (goles a favor).
+        Con un ajuste Dixon-Coles los marcadores se muestrean con la
+        corrección ρ, como en `predecir` y `distribucion_puntos`.
+        `zonas` por defecto es `torneo.ZONAS_LIGA_MX`.
+        """
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        partidos, equipos_torneo, acumulados = self._preparar_torneo(
+            partidos_restantes, tabla_actual
+        )
+        idx_local, idx_visitante = self._indices_equipos(partidos)
+        ataque, defensa = self._vectores_parametros()
+        indice_torneo = pd.Index(equipos_torneo)
+        
+        resultado = torneo.simular_temporada(
+            ataque[idx_local] * defensa[idx_visitante] * self.gamma,
+            ataque[idx_visitante] * defensa[idx_local],
+            indice_torneo.get_indexer(partidos[:, 0]),
+            indice_torneo.get_indexer(partidos[:, 1]),
+            len(equipos_torneo), n_temporadas=n_temporadas, semilla=semilla,
+            n_procesos=n_procesos, rho=self.rho, **acumulados
+        )
+        
+        if zonas is None:
+            zonas = torneo.ZONAS_LIGA_MX
+        return torneo.tabla_probabilidades(equipos_torneo, resultado, zonas)
+    
+    @_etapa('distribucion_puntos')
+    def distribucion_puntos(self, partidos_restantes, tabla_actual=None,
+                            max_goles=10):
+        """Distribución exacta de puntos finales (convolución, sin simulación).
+
+        Devuelve por equipo los puntos actuales, esperados, su desviación y
+        las columnas `P(Pts=k)_%` con la probabilidad de cada total.
+        """
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        partidos, equipos_torneo, acumulados = self._preparar_torneo(
+            partidos_restantes, tabla_actual
+        )
+        idx_local, idx_visitante = self._indices_equipos(partidos)
+        ataque, defensa = self._vectores_parametros()
+        pmf_local, pmf_visitante = puntos.pmf_puntos_partidos(
+            ataque[idx_local] * defensa[idx_visitante] * self.gamma,
+            ataque[idx_visitante] * defensa[idx_local], max_goles, rho=self.rho
+        )
+        
+        indice_torneo = pd.Index(equipos_torneo)
+        torneo_local = indice_torneo.get_indexer(partidos[:, 0])
+        torneo_visitante = indice_torneo.get_indexer(partidos[:, 1])
+        n = len(equipos_torneo)
+        base = acumulados.get('puntos')
+        
+        dist = puntos.distribucion_puntos(pmf_local, pmf_visitante, torneo_local,
+                                          torneo_visitante, n, base)
+        esperados = puntos.puntos_esperados(pmf_local, pmf_visitante, torneo_local,
+                                            torneo_visitante, n, base)
+        valores = np.arange(dist.shape[1])
+        
+        df = pd.DataFrame({
+            'Equipo': equipos_torneo,
+            'Puntos_Actuales': np.zeros(n) if base is None else base,
+            'Puntos_Esperados': esperados,
+            'Desv_Puntos': np.sqrt(np.maximum(dist @ valores ** 2 - esperados ** 2, 0))
+        })
+        con_masa = np.flatnonzero(dist.max(axis=0) > 0)
+        probabilidades = pd.DataFrame(
+            dist[:, con_masa] * 100,
+            columns=[f'P(Pts={k})_%' for k in con_masa]
+        )
+        
+        return (pd.concat([df, probabilidades], axis=1)
+                .sort_values('Puntos_Esperados', ascending=False)
+                .reset_index(drop=True))
+    
+    @_etapa('predecir_eliminatoria')
+    def predecir_eliminatoria(self, mejor_sembrado, peor_sembrado, final=False,
+                              max_goles=10):
+        """Serie a ida y vuelta; el mejor sembrado cierra en casa."""
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        validar_equipo(mejor_sembrado, self.equipos)
+        validar_equipo(peor_sembrado, self.equipos)
+        partidos = np.array([[mejor_sembrado, peor_sembrado]], dtype=object)
+        idx_mejor, idx_peor = self._indices_equipos(partidos)
+        
+        ataque, defensa = self._vectores_parametros()
+        prob = torneo.probabilidad_avance(ataque, defensa, self.gamma,
+                                          idx_mejor[0], idx_peor[0],
+                                          final=final, max_goles=max_goles,
+                                          rho=self.rho)
+        
+        return {
+            'mejor_sembrado': mejor_sembrado,
+            'peor_sembrado': peor_sembrado,
+            'prob_avanza_mejor': prob,
+            'prob_avanza_peor': 1 - prob
+        }
+    
+    @_etapa('simular_liguilla')
+    def simular_liguilla(self, sembrados, metodo='exacto', n_simulaciones=100000,
+                         semilla=42, max_goles=10):
+        """P(alcanzar cada ronda) de la Liguilla; `sembrados` va del 1° al último."""
+        if self.alpha is None:
+            raise ValueError("Primero debes entrenar el modelo")
+        
+        partidos = np.asarray(sembrados, dtype=object).reshape(-1, 1)
+        idx, _ = self._indices_equipos(np.hstack([partidos, partidos]))
+        if (idx < 0).any():
+            desconocidos = sorted(set(sembrados) - set(self.equipos))
+            raise ValueError(f"Equipos no encontrados: {', '.join(desconocidos)}")
+        
+        # Probabilidad de avance para todos los cruces (mejor, peor) a la vez
+        ataque, defensa = self._vectores_parametros()
+        mejor, peor = np.meshgrid(idx, idx, indexing='ij')
+        p_avance = torneo.probabilidad_avance(ataque, defensa, self.gamma,
+                                              mejor, peor, max_goles=max_goles,
+                                              rho=self.rho)
+        p_final = torneo.probabilidad_avance(ataque, defensa, self.gamma,
+                                             mejor, peor, final=True,
+                                             max_goles=max_goles, rho=self.rho)
+        
+        alcanza = torneo.simular_liguilla(p_avance, p_final, metodo,
+                                          n_simulaciones, semilla)
+        
+        n = len(sembrados)
+        df = pd.DataFrame({'Sembrado': np.arange(1, n + 1), 'Equipo': sembrados})
+        vivos = n
+        for ronda in range(alcanza.shape[1]):
+            df[f'P({torneo.RONDAS_LIGUILLA.get(vivos, vivos)})_%'] = alcanza[:, ronda] * 100
+            vivos //= 2
+        
+        return df
+    
     def exportar_parametros(self, ruta_salida='parametros_modelo.csv'):
         """Exporta alpha/beta/gamma a CSV."""
         if self.alpha is None:
@@ -250,37 +1110,56 @@ class ModeloPoissonFutbol:
             })
         
         df = pd.DataFrame(datos_export)
+        if self.rho is not None:
+            df['Rho_DC'] = self.rho
         df.to_csv(ruta_salida, index=False)
-        print(f"✓ Parámetros exportados a: {ruta_salida}")
+        logger.info("✓ Parámetros exportados a: %s", ruta_salida)
+    
+    def numero_partidos(self):
+        """Partidos del ajuste: los datos cargados o, tras `cargar_modelo`, los
+        metadatos del artefacto (None si no se conocen)."""
+        if self.datos_originales is not None:
+            return len(self.datos_originales)
+        return getattr(self.modelo_entrenado, 'metadatos', {}).get('n_partidos')
     
     def resumen_modelo(self):
-        """Imprime resumen del ajuste y top equipos."""
+        """Registra (nivel INFO) el resumen del ajuste y top equipos."""
         if self.modelo_entrenado is None:
-            print("El modelo aún no ha sido entrenado.")
+            logger.warning("El modelo aún no ha sido entrenado.")
+            return
+        if not logger.isEnabledFor(logging.INFO):
             return
         
-        imprimir_titulo("RESUMEN DEL MODELO")
-        
-        print(f"\n DATOS:")
-        print(f"  • Partidos históricos: {len(self.datos_originales)}")
-        print(f"  • Equipos: {len(self.equipos)}")
-        print(f"  • Observaciones entrenamiento: {len(self._datos_entrenamiento)}")
-        
-        print(f"\n CALIDAD DEL AJUSTE:")
-        print(f"  • Log-Likelihood: {self.modelo_entrenado.llf:.2f}")
-        print(f"  • AIC: {self.modelo_entrenado.aic:.2f}")
+        # Con parámetros de CSV o de un artefacto sin ajuste no hay llf/AIC
+        def formato(valor, plantilla):
+            return 'N/D' if valor is None else format(valor, plantilla)
         
-        print(f"\n PARÁMETROS:")
-        print(f"  • Ventaja de local (γ): {self.gamma:.3f}")
+        ajuste = self.modelo_entrenado
+        nobs = getattr(ajuste, 'nobs', None)
+        lineas = [
+            formatear_titulo("RESUMEN DEL MODELO"),
+            "\n DATOS:",
+            f"  • Partidos históricos: {formato(self.numero_partidos(), 'd')}",
+            f"  • Equipos: {len(self.equipos)}",
+            f"  • Observaciones entrenamiento: "
+            f"{formato(None if nobs is None else int(nobs), 'd')}",
+            "\n CALIDAD DEL AJUSTE:",
+            f"  • Log-Likelihood: {formato(getattr(ajuste, 'llf', None), '.2f')}",
+            f"  • AIC: {formato(getattr(ajuste, 'aic', None), '.2f')}",
+            "\n PARÁMETROS:",
+            f"  • Ventaja de local (γ): {self.gamma:.3f}",
+        ]
+        if self.rho is not None:
+            lineas.append(f"  • Corrección Dixon-Coles (ρ): {self.rho:.4f}")
         
-        print(f"\n TOP 3 ATAQUE:")
+        lineas.append("\n TOP 3 ATAQUE:")
         top_ataque = self.obtener_ranking_ataque(top_n=3)
         for _, row in top_ataque.iterrows():
-            print(f"  {row['Ranking']}. {row['Equipo']}: {row['Alpha']:.3f}")
+            lineas.append(f"  {row['Ranking']}. {row['Equipo']}: {row['Alpha']:.3f}")
         
-        print(f"\n TOP 3 DEFENSA:")
+        lineas.append("\n TOP 3 DEFENSA:")
         top_defensa = self.obtener_ranking_defensa(top_n=3)
         for _, row in top_defensa.iterrows():
-            print(f"  {row['Ranking']}. {row['Equipo']}: {row['Beta']:.3f}")
+            lineas.append(f"  {row['Ranking']}. {row['Equipo']}: {row['Beta']:.3f}")
         
-        print()
\ No newline at end of file
+        logger.info("\n".join(lineas) + "\n")
@@ -0,0 +1,509 @@
+"""Ajuste nativo del GLM Poisson (Newton sobre la log-verosimilitud)."""
+
+import numpy as np
+import pandas as pd
+
+from .preparacion_datos import nombres_parametros
+
+
+class ResultadoAjuste:
+    """Resultado del ajuste nativo con la interfaz mínima de statsmodels."""
+
+    def __init__(self, theta, equipos, llf, rango, n_obs, iteraciones,
+                 convergido, bloques, penalizacion=0.0):
+        self.theta = theta
+        self.equipos = list(equipos)
+        self.llf = llf
+        self.rango = rango
+        self.nobs = n_obs
+        self.iteraciones = iteraciones
+        self.converged = convergido
+        self._bloques = bloques
+        self.penalizacion = penalizacion
+        self.params = pd.Series(theta, index=nombres_parametros(self.equipos))
+
+    @property
+    def params_suma_cero(self):
+        """Intercepto y efectos con Σ = 0 (ver `parametros_suma_cero`)."""
+        return parametros_suma_cero(self.theta, self.equipos)
+
+    @property
+    def aic(self):
+        """AIC con el rango efectivo del diseño (igual que statsmodels)."""
+        return -2 * self.llf + 2 * self.rango
+
+    def cov_params(self):
+        """Matriz de covarianza asintótica (pseudo-inversa del hessiano).
+
+        Con penalización es la covarianza posterior (H + κQ)⁺ del prior
+        normal implícito.
+        """
+        hessiano = _hessiano_denso(self._bloques)
+        if self.penalizacion:
+            hessiano += self.penalizacion * _matriz_penalizacion(len(self.equipos))
+        cov = np.linalg.pinv(hessiano)
+        return pd.DataFrame(cov, index=self.params.index,
+                            columns=self.params.index)
+
+
+def _predictor_lineal(theta, atacante, defensor, local, n):
+    """η = log α[atacante] + log β[defensor] + log γ · local."""
+    return theta[atacante] + theta[n + defensor] + theta[2 * n] * local
+
+
+def _bloques_hessiano(mu, atacante, defensor, local, n):
+    """Bloques de X'WX aprovechando que ataque/defensa son diagonales."""
+    mu_local = mu * local
+    return {
+        'd_ataque': np.bincount(atacante, mu, n),
+        'd_defensa': np.bincount(defensor, mu, n),
+        'cruzado': np.bincount(atacante * n + defensor, mu,
+                               n * n).reshape(n, n),
+        'h_ataque': np.bincount(atacante, mu_local, n),
+        'h_defensa': np.bincount(defensor, mu_local, n),
+        'h_h': mu_local.sum(),
+    }
+
+
+def _hessiano_denso(b):
+    """Reconstruye el hessiano (2N+1)x(2N+1) a partir de sus bloques."""
+    n = len(b['d_ataque'])
+    h = np.zeros((2 * n + 1, 2 * n + 1))
+    h[:n, :n] = np.diag(b['d_ataque'])
+    h[n:2 * n, n:2 * n] = np.diag(b['d_defensa'])
+    h[:n, n:2 * n] = b['cruzado']
+    h[n:2 * n, :n] = b['cruzado'].T
+    h[:n, 2 * n] = h[2 * n, :n] = b['h_ataque']
+    h[n:2 * n, 2 * n] = h[2 * n, n:2 * n] = b['h_defensa']
+    h[2 * n, 2 * n] = b['h_h']
+    return h
+
+
+def _matriz_penalizacion(n):
+    """Q = diag(C, C, 0) con C = I - 11ᵀ/N: ridge sobre log α y log β centrados."""
+    centrado = np.eye(n) - 1.0 / n
+    q = np.zeros((2 * n + 1, 2 * n + 1))
+    q[:n, :n] = q[n:2 * n, n:2 * n] = centrado
+    return q
+
+
+def _penalizacion_ridge(theta, n, kappa):
+    """κ/2·(‖C log α‖² + ‖C log β‖²) y su gradiente por bloque.
+
+    Equivale a un prior normal de los efectos alrededor de la media de la
+    liga; es invariante en la dirección no identificada.
+    """
+    ataque = theta[:n] - theta[:n].mean()
+    defensa = theta[n:2 * n] - theta[n:2 * n].mean()
+    valor = kappa / 2 * (ataque @ ataque + defensa @ defensa)
+    return valor, kappa * ataque, kappa * defensa
+
+
+def _paso_newton(b, g_ataque, g_resto, penalizacion=0.0):
+    """Resuelve H·paso = g eliminando el bloque diagonal de ataque (Schur).
+
+    El diseño sin intercepto tiene una dirección nula (α·c, β/c); se fija
+    sumando u·uᵀ sobre la defensa, lo que no altera la verosimilitud. Con
+    penalización κ el hessiano suma κQ, cuyo término -κ/N·11ᵀ en ataque se
+    cancela sumando (κ/N)·vvᵀ en la dirección nula v: el bloque de ataque
+    sigue siendo diagonal y v queda fijada sin el término u·uᵀ.
+    """
+    n = len(b['d_ataque'])
+    if penalizacion:
+        b = dict(b, d_ataque=b['d_ataque'] + penalizacion,
+                 d_defensa=b['d_defensa'] + penalizacion,
+                 cruzado=b['cruzado'] - penalizacion / n)
+    d_ataque = np.maximum(b['d_ataque'], 1e-12)
+    acople = np.column_stack([b['cruzado'], b['h_ataque']])
+
+    resto = np.zeros((n + 1, n + 1))
+    resto[np.arange(n), np.arange(n)] = b['d_defensa']
+    resto[:n, n] = resto[n, :n] = b['h_defensa']
+    resto[n, n] = b['h_h']
+
+    schur = resto - acople.T @ (acople / d_ataque[:, None])
+    if not penalizacion:
+        schur[:n, :n] += b['d_defensa'].mean() / n
+    rhs = g_resto - acople.T @ (g_ataque / d_ataque)
+
+    try:
+        paso_resto = np.linalg.solve(schur, rhs)
+    except np.linalg.LinAlgError:
+        paso_resto = np.linalg.lstsq(schur, rhs, rcond=None)[0]
+    paso_ataque = (g_ataque - acople @ paso_resto) / d_ataque
+
+    return np.concatenate([paso_ataque, paso_resto])
+
+
+def _matriz_suma_cero(n):
+    """Mapa φ → θ de [intercepto, a (N-1), d (N-1), home] a [log α, log β, log γ].
+
+    El último equipo toma -Σ de los demás en ataque y defensa, y el
+    intercepto se absorbe en log α.
+    """
+    contraste = np.vstack([np.eye(n - 1), -np.ones(n - 1)])
+    m = np.zeros((2 * n + 1, 2 * n))
+    m[:n, 0] = 1
+    m[:n, 1:n] = contraste
+    m[n:2 * n, n:2 * n - 1] = contraste
+    m[2 * n, 2 * n - 1] = 1
+    return m
+
+
+def _paso_newton_suma_cero(b, g_ataque, g_resto, penalizacion=0.0):
+    """Paso de Newton en la parametrización identificable de rango completo.
+
+    Resuelve (MᵀHM)·Δφ = Mᵀg, un sistema definido positivo sin dirección
+    nula, y devuelve el paso en coordenadas θ (Δθ = M·Δφ).
+    """
+    n = len(b['d_ataque'])
+    m = _matriz_suma_cero(n)
+    hessiano = _hessiano_denso(b)
+    if penalizacion:
+        hessiano += penalizacion * _matriz_penalizacion(n)
+    hessiano = m.T @ hessiano @ m
+    rhs = m.T @ np.concatenate([g_ataque, g_resto])
+
+    try:
+        paso = np.linalg.solve(hessiano, rhs)
+    except np.linalg.LinAlgError:
+        paso = np.linalg.lstsq(hessiano, rhs, rcond=None)[0]
+
+    return m @ paso
+
+
+def _al_rango_suma_cero(theta, n):
+    """Lleva θ en sitio al rango de M (Σ log β = 0) sin cambiar ningún λ."""
+    c = theta[n:2 * n].mean()
+    theta[:n] += c
+    theta[n:2 * n] -= c
+
+
+def _resolver_paso(parametrizacion):
+    """Función de paso de Newton según la parametrización pedida."""
+    if parametrizacion == 'libre':
+        return _paso_newton
+    if parametrizacion == 'suma_cero':
+        return _paso_newton_suma_cero
+    raise ValueError(f"Parametrización no soportada: {parametrizacion}")
+
+
+def parametros_suma_cero(theta, equipos):
+    """Coeficientes identificables: intercepto, ataque/defensa con Σ = 0 y home.
+
+    No dependen de cómo se fijó la dirección no identificada, así que son
+    comparables entre reentrenamientos.
+    """
+    n = len(equipos)
+    log_alpha, log_beta = theta[:n], theta[n:2 * n]
+    valores = np.concatenate([[log_alpha.mean() + log_beta.mean()],
+                              log_alpha - log_alpha.mean(),
+                              log_beta - log_beta.mean(), [theta[2 * n]]])
+    return pd.Series(valores, index=['intercepto'] + nombres_parametros(equipos)[:2 * n]
+                     + ['home'])
+
+
+def ajustar_poisson(goles, atacante, defensor, local, n_equipos,
+                    exposicion=None, log_factorial=None, theta_inicial=None,
+                    tol=1e-8, max_iter=100, parametrizacion='libre',
+                    penalizacion=0.0):
+    """Máxima verosimilitud por Newton-Raphson sobre arreglos de índices.
+
+    Con `exposicion` cada fila es una celda agregada: `goles` es la suma y
+    μ = exposicion·exp(η) el total esperado. Devuelve θ = [log α, log β,
+    log γ] centrado como la solución de norma mínima de statsmodels
+    (Σ log α = Σ log β), el llf y las iteraciones. `theta_inicial` permite
+    arrancar desde un ajuste previo (warm start). Con
+    `parametrizacion='suma_cero'` cada paso se resuelve en la
+    parametrización identificable (intercepto + efectos con Σ = 0).
+    `penalizacion` κ > 0 maximiza la verosimilitud penalizada con ridge
+    (ver `_penalizacion_ridge`); el llf devuelto es el no penalizado.
+    """
+    goles = np.asarray(goles, dtype=float)
+    atacante = np.asarray(atacante, dtype=np.intp)
+    defensor = np.asarray(defensor, dtype=np.intp)
+    local = np.asarray(local, dtype=float)
+    n = n_equipos
+    paso_newton = _resolver_paso(parametrizacion)
+    if exposicion is None:
+        exposicion = np.ones(len(goles))
+    exposicion = np.asarray(exposicion, dtype=float)
+    if log_factorial is None:
+        from scipy.special import gammaln
+        log_factorial = gammaln(goles + 1)
+
+    if theta_inicial is None:
+        theta = np.zeros(2 * n + 1)
+        theta[:n] = np.log(max(goles.sum() / exposicion.sum(), 1e-12))
+    else:
+        theta = np.array(theta_inicial, dtype=float)
+    if parametrizacion == 'suma_cero':
+        _al_rango_suma_cero(theta, n)
+
+    eta = _predictor_lineal(theta, atacante, defensor, local, n)
+    mu = exposicion * np.exp(eta)
+    ll = goles @ eta - mu.sum() - _penalizacion_ridge(theta, n, penalizacion)[0]
+    convergido = False
+
+    for iteracion in range(1, max_iter + 1):
+        residuo = goles - mu
+        _, pen_ataque, pen_defensa = _penalizacion_ridge(theta, n, penalizacion)
+        g_ataque = np.bincount(atacante, residuo, n) - pen_ataque
+        g_resto = np.append(np.bincount(defensor, residuo, n) - pen_defensa,
+                            residuo @ local)
+        bloques = _bloques_hessiano(mu, atacante, defensor, local, n)
+        paso = paso_newton(bloques, g_ataque, g_resto, penalizacion)
+        # Región de confianza: ningún log-parámetro se mueve más de 5 por paso
+        paso /= max(1.0, np.abs(paso).max() / 5.0)
+
+        # Búsqueda lineal por bisección (rara vez necesaria con enlace log)
+        t = 1.0
+        while True:
+            theta_nuevo = theta + t * paso
+            eta = _predictor_lineal(theta_nuevo, atacante, defensor, local, n)
+            with np.errstate(over='ignore', invalid='ignore'):
+                mu_nuevo = exposicion * np.exp(eta)
+                ll_nuevo = (goles @ eta - mu_nuevo.sum() -
+                            _penalizacion_ridge(theta_nuevo, n, penalizacion)[0])
+            if np.isfinite(ll_nuevo) and ll_nuevo >= ll - 1e-10 * abs(ll):
+                break
+            t /= 2
+            if t < 1e-4:
+                break
+
+        if t < 1e-4:
+            # Sin paso aceptable (p. ej. un equipo sin goles: α → 0)
+            break
+
+        cambio = abs(ll_nuevo - ll)
+        theta, mu, ll = theta_nuevo, mu_nuevo, ll_nuevo
+        if cambio <= tol * (abs(ll) + 0.1):
+            convergido = True
+            break
+
+    # Centrar en la dirección no identificada: Σ log α = Σ log β
+    c = (theta[n:2 * n].sum() - theta[:n].sum()) / (2 * n)
+    theta[:n] += c
+    theta[n:2 * n] -= c
+
+    llf = (ll + _penalizacion_ridge(theta, n, penalizacion)[0] -
+           np.sum(log_factorial))
+    bloques = _bloques_hessiano(mu, atacante, defensor, local, n)
+
+    return theta, llf, iteracion, convergido, bloques
+
+
+def grados_libertad_efectivos(bloques, penalizacion):
+    """tr((H + κQ)⁺·H): parámetros efectivos del ajuste penalizado."""
+    hessiano = _hessiano_denso(bloques)
+    n = len(bloques['d_ataque'])
+    penalizado = hessiano + penalizacion * _matriz_penalizacion(n)
+    return float(np.trace(np.linalg.pinv(penalizado) @ hessiano))
+
+
+def ajustar_modelo_nativo(datos, equipos, theta_inicial=None, tol=1e-8,
+                          max_iter=100, parametrizacion='libre', penalizacion=0.0):
+    """Ajusta el modelo desde el dataset codificado (o agregado).
+
+    Con columna `peso` se maximiza la verosimilitud ponderada; `nobs` es
+    entonces el tamaño efectivo Σ pesos. Con `penalizacion` el AIC usa los
+    grados de libertad efectivos.
+    """
+    n = len(equipos)
+    goles = datos['goles'].values
+    exposicion = datos['exposicion'].values if 'exposicion' in datos else None
+    log_factorial = (datos['log_factorial'].values
+                     if 'log_factorial' in datos else None)
+    if 'peso' in datos:
+        from scipy.special import gammaln
+        exposicion = datos['peso'].values
+        log_factorial = exposicion * gammaln(goles + 1.0)
+        goles = exposicion * goles
+    theta, llf, iteraciones, convergido, bloques = ajustar_poisson(
+        goles, datos['atacante'].values,
+        datos['defensor'].values, datos['local'].values, n,
+        exposicion=exposicion, log_factorial=log_factorial,
+        theta_inicial=theta_inicial, tol=tol, max_iter=max_iter,
+        parametrizacion=parametrizacion, penalizacion=penalizacion
+    )
+    n_obs = len(datos) if exposicion is None else exposicion.sum()
+    # Rango del diseño: 2N+1 columnas menos la dirección no identificada
+    rango = (grados_libertad_efectivos(bloques, penalizacion) if penalizacion
+             else 2 * n)
+    return ResultadoAjuste(theta, equipos, llf, rango, n_obs,
+                           iteraciones, convergido, bloques, penalizacion)
+
+
+def log_verosimilitud(theta, goles, atacante, defensor, local, n_equipos):
+    """Log-verosimilitud Poisson de partidos dados los coeficientes θ."""
+    from scipy.special import gammaln
+    
+    eta = _predictor_lineal(theta, np.asarray(atacante, dtype=np.intp),
+                            np.asarray(defensor, dtype=np.intp),
+                            np.asarray(local, dtype=float), n_equipos)
+    goles = np.asarray(goles, dtype=float)
+    return float(goles @ eta - np.exp(eta).sum() - gammaln(goles + 1).sum())
+
+
+# ==========================================
+# DIXON-COLES (dependencia en marcadores bajos)
+# ==========================================
+
+def _derivadas_tau(goles_local, goles_visitante, lam, mu, rho):
+    """τ(ρ) y las derivadas de log τ respecto a log λ, log μ y ρ (por partido)."""
+    m00 = (goles_local == 0) & (goles_visitante == 0)
+    m01 = (goles_local == 0) & (goles_visitante == 1)
+    m10 = (goles_local == 1) & (goles_visitante == 0)
+    m11 = (goles_local == 1) & (goles_visitante == 1)
+
+    tau = np.ones_like(lam)
+    tau[m00] = 1 - lam[m00] * mu[m00] * rho
+    tau[m01] = 1 + lam[m01] * rho
+    tau[m10] = 1 + mu[m10] * rho
+    tau[m11] = 1 - rho
+
+    # ∂τ/∂ρ; ∂τ/∂log λ = ρ·∂τ/∂ρ·[λ aparece] (idem μ)
+    d_rho = np.zeros_like(lam)
+    d_rho[m00] = -lam[m00] * mu[m00]
+    d_rho[m01] = lam[m01]
+    d_rho[m10] = mu[m10]
+    d_rho[m11] = -1
+
+    d_local = np.where(m00 | m01, rho * d_rho, 0) / tau
+    d_visitante = np.where(m00 | m10, rho * d_rho, 0) / tau
+
+    return tau, d_local, d_visitante, d_rho / tau
+
+
+def ajustar_dixon_coles(goles_local, goles_visitante, idx_local, idx_visitante,
+                        n_equipos, pesos=None, theta_inicial=None, rho_inicial=0.0,
+                        tol=1e-10, max_iter=200, parametrizacion='libre',
+                        penalizacion=0.0):
+    """Ajuste conjunto de θ y ρ de Dixon-Coles con gradientes analíticos.
+
+    Alterna un paso de scoring de Fisher en θ (gradiente exacto con τ,
+    hessiano Poisson por bloques) y un paso de Newton en ρ con derivadas
+    analíticas, ambos con búsqueda lineal que mantiene τ > 0. `penalizacion`
+    agrega el mismo ridge que `ajustar_poisson`.
+    """
+    y_local = np.asarray(goles_local, dtype=float)
+    y_visitante = np.asarray(goles_visitante, dtype=float)
+    i_local = np.asarray(idx_local, dtype=np.intp)
+    i_visitante = np.asarray(idx_visitante, dtype=np.intp)
+    n = n_equipos
+    k = len(y_local)
+    w = np.ones(k) if pesos is None else np.asarray(pesos, dtype=float)
+    paso_newton = _resolver_paso(parametrizacion)
+
+    # Observaciones apiladas (local, visitante) para la parte Poisson
+    atacante = np.concatenate([i_local, i_visitante])
+    defensor = np.concatenate([i_visitante, i_local])
+    local = np.repeat([1.0, 0.0], k)
+    w2 = np.tile(w, 2)
+    y = np.concatenate([y_local, y_visitante])
+
+    def evaluar(theta, rho):
+        eta = _predictor_lineal(theta, atacante, defensor, local, n)
+        with np.errstate(over='ignore'):
+            tasas = np.exp(eta)
+        tau, d_loc, d_vis, d_rho = _derivadas_tau(y_local, y_visitante,
+                                                  tasas[:k], tasas[k:], rho)
+        if np.any(tau <= 0) or not np.all(np.isfinite(tasas)):
+            return -np.inf, None
+        ll = (w2 @ (y * eta - tasas) + w @ np.log(tau) -
+              _penalizacion_ridge(theta, n, penalizacion)[0])
+        return ll, (tasas, d_loc, d_vis, d_rho, tau)
+
+    if theta_inicial is None:
+        theta = ajustar_poisson(w2 * y, atacante, defensor, local, n,
+                                exposicion=w2, log_factorial=np.zeros(2 * k),
+                                parametrizacion=parametrizacion,
+                                penalizacion=penalizacion)[0]
+    else:
+        theta = np.array(theta_inicial, dtype=float)
+    if parametrizacion == 'suma_cero':
+        _al_rango_suma_cero(theta, n)
+    rho = float(rho_inicial)
+    ll, cache = evaluar(theta, rho)
+    convergido = False
+
+    for iteracion in range(1, max_iter + 1):
+        ll_ciclo = ll
+
+        # --- Paso en θ (scoring de Fisher) ---
+        tasas, d_loc, d_vis, _, _ = cache
+        residuo = w2 * (y - tasas)
+        extra_loc, extra_vis = w * d_loc, w * d_vis
+        _, pen_ataque, pen_defensa = _penalizacion_ridge(theta, n, penalizacion)
+        g_ataque = (np.bincount(atacante, residuo, n) +
+                    np.bincount(i_local, extra_loc, n) +
+                    np.bincount(i_visitante, extra_vis, n) - pen_ataque)
+        g_defensa = (np.bincount(defensor, residuo, n) +
+                     np.bincount(i_visitante, extra_loc, n) +
+                     np.bincount(i_local, extra_vis, n) - pen_defensa)
+        g_home = residuo @ local + extra_loc.sum()
+        bloques = _bloques_hessiano(w2 * tasas, atacante, defensor, local, n)
+        paso = paso_newton(bloques, g_ataque, np.append(g_defensa, g_home),
+                           penalizacion)
+        paso /= max(1.0, np.abs(paso).max() / 5.0)
+
+        t = 1.0
+        while t >= 1e-4:
+            ll_nuevo, cache_nuevo = evaluar(theta + t * paso, rho)
+            if ll_nuevo >= ll:
+                theta, ll, cache = theta + t * paso, ll_nuevo, cache_nuevo
+                break
+            t /= 2
+
+        # --- Paso en ρ (Newton 1-D analítico) ---
+        _, _, _, d_rho, tau = cache
+        g_rho = w @ d_rho
+        h_rho = -(w @ d_rho ** 2)
+        paso_rho = -g_rho / h_rho if h_rho < 0 else 0.0
+
+        t = 1.0
+        while t >= 1e-4:
+            ll_nuevo, cache_nuevo = evaluar(theta, rho + t * paso_rho)
+            if ll_nuevo >= ll:
+                rho, ll, cache = rho + t * paso_rho, ll_nuevo, cache_nuevo
+                break
+            t /= 2
+
+        if abs(ll - ll_ciclo) <= tol * (abs(ll) + 0.1):
+            convergido = True
+            break
+
+    c = (theta[n:2 * n].sum() - theta[:n].sum()) / (2 * n)
+    theta[:n] += c
+    theta[n:2 * n] -= c
+
+    from scipy.special import gammaln
+    llf = (ll + _penalizacion_ridge(theta, n, penalizacion)[0] -
+           w2 @ gammaln(y + 1))
+    bloques = _bloques_hessiano(w2 * cache[0], atacante, defensor, local, n)
+
+    return theta, rho, llf, iteracion, convergido, bloques
+
+
+def ajustar_modelo_dixon_coles(partidos, equipos, pesos=None, theta_inicial=None,
+                               rho_inicial=0.0, tol=1e-10, max_iter=200,
+                               parametrizacion='libre', penalizacion=0.0):
+    """Ajusta Dixon-Coles sobre los partidos originales y devuelve el resultado."""
+    from .preparacion_datos import _indices_equipos
+
+    n = len(equipos)
+    idx_local, idx_visitante = _indices_equipos(partidos, equipos)
+    theta, rho, llf, iteraciones, convergido, bloques = ajustar_dixon_coles(
+        partidos['Goles_Local'].values, partidos['Goles_Visitante'].values,
+        idx_local, idx_visitante, n, pesos=pesos, theta_inicial=theta_inicial,
+        rho_inicial=rho_inicial, tol=tol, max_iter=max_iter,
+        parametrizacion=parametrizacion, penalizacion=penalizacion
+    )
+    n_obs = 2 * len(partidos) if pesos is None else 2 * np.sum(pesos)
+    rango = (grados_libertad_efectivos(bloques, penalizacion) if penalizacion
+             else 2 * n) + 1
+
+    resultado = ResultadoAjuste(theta, equipos, llf, rango, n_obs,
+                                iteraciones, convergido, bloques, penalizacion)
+    resultado.rho = rho
+    return resultado
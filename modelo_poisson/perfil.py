@@ -0,0 +1,79 @@
+"""Perfil por etapa: tiempo de pared, CPU y pico de memoria (tracemalloc)."""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Perfilador:
+    """Acumula mediciones por etapa; las etapas pueden anidarse.
+
+    Con `memoria=True` activa `tracemalloc` (si no estaba activo) y cada
+    medición incluye el pico de memoria asignada por encima de la del
+    inicio de la etapa. `callback(etapa, medicion)` se llama al cerrar cada
+    etapa.
+    """
+
+    def __init__(self, memoria=False, callback=None):
+        self.memoria = memoria
+        self.callback = callback
+        self.registros = []
+        self._pila = []  # [memoria al entrar, pico visto] de etapas abiertas
+        self._inicio_tracemalloc = memoria and not tracemalloc.is_tracing()
+        if self._inicio_tracemalloc:
+            tracemalloc.start()
+
+    def cerrar(self):
+        """Detiene tracemalloc si lo inició este perfilador."""
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+
+    @contextmanager
+    def medir(self, etapa):
+        if self.memoria:
+            actual, pico = tracemalloc.get_traced_memory()
+            if self._pila:
+                # El pico de la etapa externa no debe perderse al reiniciarlo
+                self._pila[-1][1] = max(self._pila[-1][1], pico)
+            tracemalloc.reset_peak()
+            self._pila.append([actual, actual])
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            medicion = {'etapa': etapa,
+                        'segundos': time.perf_counter() - inicio,
+                        'cpu_segundos': time.process_time() - inicio_cpu,
+                        'memoria_pico_bytes': None}
+            if self.memoria:
+                entrada, pico_previo = self._pila.pop()
+                pico = max(pico_previo, tracemalloc.get_traced_memory()[1])
+                medicion['memoria_pico_bytes'] = pico - entrada
+                if self._pila:
+                    self._pila[-1][1] = max(self._pila[-1][1], pico)
+            self.registros.append(medicion)
+            if self.callback is not None:
+                self.callback(etapa, medicion)
+
+    def resumen(self):
+        """Totales por etapa: llamadas, segundos, CPU y pico máximo."""
+        resumen = {}
+        for medicion in self.registros:
+            etapa = resumen.setdefault(medicion['etapa'], {
+                'llamadas': 0, 'segundos': 0.0, 'cpu_segundos': 0.0,
+                'memoria_pico_bytes': None})
+            etapa['llamadas'] += 1
+            etapa['segundos'] += medicion['segundos']
+            etapa['cpu_segundos'] += medicion['cpu_segundos']
+            if medicion['memoria_pico_bytes'] is not None:
+                etapa['memoria_pico_bytes'] = max(etapa['memoria_pico_bytes'] or 0,
+                                                  medicion['memoria_pico_bytes'])
+        return resumen
+
+    def exportar_json(self, ruta):
+        """Escribe el resumen y todas las mediciones en JSON."""
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump({'resumen': self.resumen(), 'registros': self.registros},
+                      f, indent=2, ensure_ascii=False)
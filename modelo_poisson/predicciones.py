@@ -1,8 +1,9 @@
 """Funciones de predicción (modelo de Poisson)."""
 
+import logging
+
 import numpy as np
-from scipy.stats import poisson
-from .utils import validar_equipo, formatear_probabilidad, imprimir_titulo
+from .utils import validar_equipo, formatear_probabilidad, formatear_titulo, logger
 
 
 def calcular_goles_esperados(equipo_local, equipo_visitante, alpha, beta, gamma):
@@ -13,32 +14,144 @@ def calcular_goles_esperados(equipo_local, equipo_visitante, alpha, beta, gamma)
     return lambda_local, lambda_visitante
 
 
-def generar_matriz_probabilidades(lambda_local, lambda_visitante, max_goles=5):
-    """Matriz P(i,j)=P_local(i)*P_visitante(j)."""
-    matriz = np.zeros((max_goles + 1, max_goles + 1))
+def pmf_poisson(lambdas, max_goles=5):
+    """P(X=k) para k=0..max_goles y cada λ; devuelve arreglo K×(G+1)."""
+    lambdas = np.asarray(lambdas, dtype=float)
+    k = np.arange(max_goles + 1)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(k[1:]))])
+    
+    # k·log λ con 0·log 0 = 0 (como xlogy): λ = 0 da [1, 0, ..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_log_lambda = np.where(k == 0, 0.0, k * np.log(lambdas)[..., None])
+    
+    return np.exp(k_log_lambda - lambdas[..., None] - log_factorial)
+
+
+def aplicar_dixon_coles(matrices, lambdas_local, lambdas_visitante, rho):
+    """Corrige en sitio el bloque 2×2 de marcadores bajos con τ(ρ)."""
+    lambdas_local = np.asarray(lambdas_local, dtype=float)
+    lambdas_visitante = np.asarray(lambdas_visitante, dtype=float)
+    
+    matrices[..., 0, 0] *= 1 - lambdas_local * lambdas_visitante * rho
+    matrices[..., 0, 1] *= 1 + lambdas_local * rho
+    matrices[..., 1, 0] *= 1 + lambdas_visitante * rho
+    matrices[..., 1, 1] *= 1 - rho
+    
+    return matrices
+
+
+def generar_matrices_probabilidades(lambdas_local, lambdas_visitante, max_goles=5,
+                                    rho=None):
+    """Tensor K×(G+1)×(G+1) de marcadores por producto externo de las pmf.
+
+    Con `rho` se aplica la corrección de Dixon-Coles a los marcadores bajos.
+    """
+    pmf_local = pmf_poisson(lambdas_local, max_goles)
+    pmf_visitante = pmf_poisson(lambdas_visitante, max_goles)
+    matrices = pmf_local[..., :, None] * pmf_visitante[..., None, :]
+    
+    if rho is not None:
+        aplicar_dixon_coles(matrices, lambdas_local, lambdas_visitante, rho)
+    
+    return matrices
+
+
+def probabilidades_1x2(lambdas_local, lambdas_visitante, max_goles=10, rho=None):
+    """P(local, empate, visitante) sin construir las matrices de marcadores.
+
+    Recorre los goles con la recurrencia P(k) = P(k-1)·λ/k y las acumuladas,
+    operando sobre arreglos contiguos del tamaño del lote (costo O(G) en
+    lugar de O(G²)). Con `rho` suma la corrección de Dixon-Coles de las
+    celdas 0-0, 1-0, 0-1 y 1-1. Devuelve un arreglo (...)×3 normalizado.
+    """
+    lambdas_local = np.asarray(lambdas_local, dtype=float)
+    lambdas_visitante = np.asarray(lambdas_visitante, dtype=float)
     
-    for i in range(max_goles + 1):
-        for j in range(max_goles + 1):
-            # P(local = i)
-            prob_local = poisson.pmf(i, lambda_local)
-            # P(visitante = j)
-            prob_visitante = poisson.pmf(j, lambda_visitante)
-            # P(marcador i-j) (independencia)
-            matriz[i, j] = prob_local * prob_visitante
+    cero_local = np.exp(-lambdas_local)
+    cero_visitante = np.exp(-lambdas_visitante)
+    p_local, p_visitante = cero_local, cero_visitante
+    p00 = cero_local * cero_visitante
+    acumulada_local, acumulada_visitante = cero_local.copy(), cero_visitante.copy()
+    gana, empata, pierde = np.zeros_like(p00), p00.copy(), np.zeros_like(p00)
     
-    return matriz
+    for k in range(1, max_goles + 1):
+        p_local = p_local * lambdas_local / k
+        p_visitante = p_visitante * lambdas_visitante / k
+        # P(X=k)·P(Y<k) y P(Y=k)·P(X<k)
+        gana += p_local * acumulada_visitante
+        pierde += p_visitante * acumulada_local
+        empata += p_local * p_visitante
+        acumulada_local += p_local
+        acumulada_visitante += p_visitante
+        if k == 1:
+            p10 = p_local * cero_visitante
+            p01 = p_visitante * cero_local
+            p11 = p_local * p_visitante
+    
+    if rho is not None and max_goles >= 1:
+        gana = gana + p10 * lambdas_visitante * rho
+        pierde = pierde + p01 * lambdas_local * rho
+        empata = empata - (p00 * lambdas_local * lambdas_visitante + p11) * rho
+    
+    probabilidades = np.stack([gana, empata, pierde], axis=-1)
+    
+    return probabilidades / probabilidades.sum(axis=-1, keepdims=True)
+
+
+def resumir_matrices(matrices, limite=2.5):
+    """1X2, over/under y marcador modal para un lote de matrices K×(G+1)×(G+1)."""
+    filas, cols = matrices.shape[-2:]
+    i, j = np.indices((filas, cols))
+    
+    plano = matrices.reshape(matrices.shape[:-2] + (filas * cols,))
+    indice_max = plano.argmax(axis=-1)
+    
+    return {
+        'prob_victoria_local': (matrices * (i > j)).sum(axis=(-2, -1)),
+        'prob_empate': np.trace(matrices, axis1=-2, axis2=-1),
+        'prob_victoria_visitante': (matrices * (i < j)).sum(axis=(-2, -1)),
+        'prob_over': (matrices * (i + j > limite)).sum(axis=(-2, -1)),
+        'prob_under': (matrices * (i + j <= limite)).sum(axis=(-2, -1)),
+        'goles_local_probable': indice_max // cols,
+        'goles_visitante_probable': indice_max % cols,
+        'prob_marcador_mas_probable': np.take_along_axis(
+            plano, indice_max[..., None], axis=-1)[..., 0],
+    }
+
+
+def predecir_lote(lambdas_local, lambdas_visitante, max_goles=5, limite=2.5,
+                  rho=None):
+    """Predicción vectorizada para K partidos a partir de sus λ."""
+    lambdas_local = np.asarray(lambdas_local, dtype=float)
+    lambdas_visitante = np.asarray(lambdas_visitante, dtype=float)
+    matrices = generar_matrices_probabilidades(
+        lambdas_local, lambdas_visitante, max_goles, rho
+    )
+    
+    resumen = resumir_matrices(matrices, limite)
+    resumen['lambda_local'] = lambdas_local
+    resumen['lambda_visitante'] = lambdas_visitante
+    resumen['matrices'] = matrices
+    
+    return resumen
+
+
+def generar_matriz_probabilidades(lambda_local, lambda_visitante, max_goles=5,
+                                  rho=None):
+    """Matriz P(i,j)=P_local(i)*P_visitante(j) (con τ si se da `rho`)."""
+    return generar_matrices_probabilidades(lambda_local, lambda_visitante,
+                                           max_goles, rho)
 
 
 def calcular_probabilidades_resultado(matriz):
     """Devuelve P(victoria local, empate, victoria visitante)."""
     # Victoria local: triángulo INFERIOR (i > j)
-    # triángulo inferior (i>j)
     prob_victoria_local = np.sum(np.tril(matriz, k=-1))
     
     # Empate: diagonal
     prob_empate = np.sum(np.diag(matriz))
     
-    # triángulo superior (j>i)
+    # Victoria visitante: triángulo superior (j > i)
     prob_victoria_visitante = np.sum(np.triu(matriz, k=1))
     
     return prob_victoria_local, prob_empate, prob_victoria_visitante
@@ -55,23 +168,12 @@ def encontrar_marcador_mas_probable(matriz):
 
 def calcular_over_under(matriz, limite=2.5):
     """Probabilidades Over/Under para total de goles."""
-    prob_over = 0
-    prob_under = 0
-    
-    filas, cols = matriz.shape
-    for i in range(filas):
-        for j in range(cols):
-            goles_totales = i + j
-            if goles_totales > limite:
-                prob_over += matriz[i, j]
-            else:
-                prob_under += matriz[i, j]
-    
-    return prob_over, prob_under
+    resumen = resumir_matrices(matriz, limite)
+    return resumen['prob_over'], resumen['prob_under']
 
 
 def predecir_partido_completo(equipo_local, equipo_visitante, alpha, beta, 
-                               gamma, equipos, max_goles=5):
+                               gamma, equipos, max_goles=5, rho=None):
     """Predicción completa: λ, matriz, probabilidades y métricas."""
     # validar equipos
     validar_equipo(equipo_local, equipos)
@@ -82,109 +184,173 @@ def predecir_partido_completo(equipo_local, equipo_visitante, alpha, beta,
         equipo_local, equipo_visitante, alpha, beta, gamma
     )
     
-    # generar matriz
-    matriz = generar_matriz_probabilidades(
-        lambda_local, lambda_visitante, max_goles
-    )
-    
-    # probabilidades de resultado
-    prob_local, prob_empate, prob_visitante = calcular_probabilidades_resultado(matriz)
-    
-    # marcador más probable
-    marcador, prob_marcador, indices = encontrar_marcador_mas_probable(matriz)
-    
-    # over/under
-    prob_over, prob_under = calcular_over_under(matriz, limite=2.5)
+    # matriz y métricas con el motor por lotes (K=1)
+    lote = predecir_lote([lambda_local], [lambda_visitante], max_goles, rho=rho)
+    goles_local = int(lote['goles_local_probable'][0])
+    goles_visitante = int(lote['goles_visitante_probable'][0])
     
     return {
         'equipo_local': equipo_local,
         'equipo_visitante': equipo_visitante,
         'lambda_local': lambda_local,
         'lambda_visitante': lambda_visitante,
-        'matriz_probabilidades': matriz,
-        'prob_victoria_local': prob_local,
-        'prob_empate': prob_empate,
-        'prob_victoria_visitante': prob_visitante,
-        'marcador_mas_probable': marcador,
-        'prob_marcador_mas_probable': prob_marcador,
-        'indices_marcador': indices,
-        'prob_over_2_5': prob_over,
-        'prob_under_2_5': prob_under
+        'matriz_probabilidades': lote['matrices'][0],
+        'prob_victoria_local': lote['prob_victoria_local'][0],
+        'prob_empate': lote['prob_empate'][0],
+        'prob_victoria_visitante': lote['prob_victoria_visitante'][0],
+        'marcador_mas_probable': f"{goles_local}-{goles_visitante}",
+        'prob_marcador_mas_probable': lote['prob_marcador_mas_probable'][0],
+        'indices_marcador': (goles_local, goles_visitante),
+        'prob_over_2_5': lote['prob_over'][0],
+        'prob_under_2_5': lote['prob_under'][0]
     }
 
 
-def mostrar_prediccion_formato(prediccion):
-    """Imprime la predicción en consola."""
-    imprimir_titulo(f"PREDICCIÓN: {prediccion['equipo_local']} vs {prediccion['equipo_visitante']}")
+def construir_tabla_pares(equipos, alpha, beta, gamma, max_goles=5,
+                          incluir_matrices=None, bloque=256, rho=None,
+                          max_bytes_matrices=64 * 2**20):
+    """Precalcula λ, 1X2, over/under y marcador modal para todos los pares.
+
+    Las métricas son arreglos N×N (fila = local, columna = visitante); con
+    `incluir_matrices` también se guarda el tensor N×N×(G+1)×(G+1). Por
+    defecto (None) se guarda si ocupa a lo sumo `max_bytes_matrices`; si no,
+    `consultar_tabla` calcula la matriz de cada par la primera vez y la
+    conserva.
+    """
+    ataque = np.array([alpha[eq] for eq in equipos])
+    defensa = np.array([beta[eq] for eq in equipos])
+    n = len(equipos)
+    if incluir_matrices is None:
+        incluir_matrices = n * n * (max_goles + 1) ** 2 * 8 <= max_bytes_matrices
     
-    print(f"\n GOLES ESPERADOS:")
-    print(f"  • {prediccion['equipo_local']} (local): "
-          f"λ = {prediccion['lambda_local']:.3f} goles")
-    print(f"  • {prediccion['equipo_visitante']} (visitante): "
-          f"λ = {prediccion['lambda_visitante']:.3f} goles")
+    lambdas_local = np.outer(ataque, defensa) * gamma
+    lambdas_visitante = np.outer(defensa, ataque)
     
-    print(f"\n PROBABILIDADES DE RESULTADO:")
-    print(f"  • Victoria {prediccion['equipo_local']}: "
-          f"{formatear_probabilidad(prediccion['prob_victoria_local'])}")
-    print(f"  • Empate: "
-          f"{formatear_probabilidad(prediccion['prob_empate'])}")
-    print(f"  • Victoria {prediccion['equipo_visitante']}: "
-          f"{formatear_probabilidad(prediccion['prob_victoria_visitante'])}")
+    # Por bloques de filas para acotar memoria con muchas ligas
+    partes = []
+    for inicio in range(0, n, bloque):
+        fin = min(inicio + bloque, n)
+        lote = predecir_lote(lambdas_local[inicio:fin],
+                             lambdas_visitante[inicio:fin], max_goles, rho=rho)
+        if not incluir_matrices:
+            del lote['matrices']
+        partes.append(lote)
     
-    print(f"\n MARCADOR MÁS PROBABLE:")
-    print(f"  • {prediccion['marcador_mas_probable']} "
-          f"({formatear_probabilidad(prediccion['prob_marcador_mas_probable'])})")
+    tabla = {clave: np.concatenate([parte[clave] for parte in partes])
+             for clave in partes[0]}
+    tabla['equipos'] = list(equipos)
+    tabla['indice'] = {equipo: i for i, equipo in enumerate(equipos)}
+    tabla['max_goles'] = max_goles
+    tabla['rho'] = rho
+    if not incluir_matrices:
+        tabla['matrices_calculadas'] = {}
     
-    print(f"\n OVER/UNDER 2.5 GOLES:")
-    print(f"  • Over 2.5: {formatear_probabilidad(prediccion['prob_over_2_5'])}")
-    print(f"  • Under 2.5: {formatear_probabilidad(prediccion['prob_under_2_5'])}")
+    return tabla
+
+
+def consultar_tabla(tabla, equipo_local, equipo_visitante):
+    """Predicción de un par leída de la tabla precalculada (mismo formato)."""
+    indice = tabla['indice']
+    for equipo in (equipo_local, equipo_visitante):
+        if equipo not in indice:
+            validar_equipo(equipo, tabla['equipos'])
+    i, j = indice[equipo_local], indice[equipo_visitante]
     
-    print(f"\n MATRIZ DE PROBABILIDADES (%):")
-    print(f"  Filas = Goles de {prediccion['equipo_local']} (local)")
-    print(f"  Columnas = Goles de {prediccion['equipo_visitante']} (visitante)\n")
+    if 'matrices' in tabla:
+        matriz = tabla['matrices'][i, j]
+    else:
+        calculadas = tabla.setdefault('matrices_calculadas', {})
+        matriz = calculadas.get((i, j))
+        if matriz is None:
+            matriz = calculadas[i, j] = generar_matrices_probabilidades(
+                tabla['lambda_local'][i, j], tabla['lambda_visitante'][i, j],
+                tabla['max_goles'], tabla.get('rho')
+            )
+    goles_local = int(tabla['goles_local_probable'][i, j])
+    goles_visitante = int(tabla['goles_visitante_probable'][i, j])
     
-    mostrar_matriz_formateada(prediccion['matriz_probabilidades'])
+    return {
+        'equipo_local': equipo_local,
+        'equipo_visitante': equipo_visitante,
+        'lambda_local': tabla['lambda_local'][i, j],
+        'lambda_visitante': tabla['lambda_visitante'][i, j],
+        'matriz_probabilidades': matriz,
+        'prob_victoria_local': tabla['prob_victoria_local'][i, j],
+        'prob_empate': tabla['prob_empate'][i, j],
+        'prob_victoria_visitante': tabla['prob_victoria_visitante'][i, j],
+        'marcador_mas_probable': f"{goles_local}-{goles_visitante}",
+        'prob_marcador_mas_probable': tabla['prob_marcador_mas_probable'][i, j],
+        'indices_marcador': (goles_local, goles_visitante),
+        'prob_over_2_5': tabla['prob_over'][i, j],
+        'prob_under_2_5': tabla['prob_under'][i, j]
+    }
+
+
+def mostrar_prediccion_formato(prediccion):
+    """Registra la predicción formateada (un solo mensaje INFO)."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
-    print("=" * 70 + "\n")
+    local, visitante = prediccion['equipo_local'], prediccion['equipo_visitante']
+    lineas = [
+        formatear_titulo(f"PREDICCIÓN: {local} vs {visitante}"),
+        "\n GOLES ESPERADOS:",
+        f"  • {local} (local): λ = {prediccion['lambda_local']:.3f} goles",
+        f"  • {visitante} (visitante): λ = {prediccion['lambda_visitante']:.3f} goles",
+        "\n PROBABILIDADES DE RESULTADO:",
+        f"  • Victoria {local}: "
+        f"{formatear_probabilidad(prediccion['prob_victoria_local'])}",
+        f"  • Empate: {formatear_probabilidad(prediccion['prob_empate'])}",
+        f"  • Victoria {visitante}: "
+        f"{formatear_probabilidad(prediccion['prob_victoria_visitante'])}",
+        "\n MARCADOR MÁS PROBABLE:",
+        f"  • {prediccion['marcador_mas_probable']} "
+        f"({formatear_probabilidad(prediccion['prob_marcador_mas_probable'])})",
+        "\n OVER/UNDER 2.5 GOLES:",
+        f"  • Over 2.5: {formatear_probabilidad(prediccion['prob_over_2_5'])}",
+        f"  • Under 2.5: {formatear_probabilidad(prediccion['prob_under_2_5'])}",
+        "\n MATRIZ DE PROBABILIDADES (%):",
+        f"  Filas = Goles de {local} (local)",
+        f"  Columnas = Goles de {visitante} (visitante)\n",
+        formatear_matriz(prediccion['matriz_probabilidades']),
+        "=" * 70 + "\n",
+    ]
+    logger.info("\n".join(lineas))
 
 
-def mostrar_matriz_formateada(matriz):
-    """Imprime matriz de probabilidades en porcentaje."""
+def formatear_matriz(matriz):
+    """Matriz de probabilidades en porcentaje como texto de tabla."""
     filas, cols = matriz.shape
     matriz_pct = matriz * 100  # Convertir a porcentaje
     
-    # Encabezado
-    print("     ", end="")
-    for j in range(cols):
-        print(f"  {j}  ", end="")
-    print()
-    print("    " + "-" * (6 * cols))
-    
-    # Filas
+    lineas = ["     " + "".join(f"  {j}  " for j in range(cols)),
+              "    " + "-" * (6 * cols)]
     for i in range(filas):
-        print(f" {i} | ", end="")
-        for j in range(cols):
-            print(f"{matriz_pct[i,j]:4.1f} ", end="")
-        print()
+        lineas.append(f" {i} | " + "".join(f"{valor:4.1f} " for valor in matriz_pct[i]))
+    
+    return "\n".join(lineas)
 
 
-def simular_partido_montecarlo(lambda_local, lambda_visitante, n_simulaciones=1000):
+def mostrar_matriz_formateada(matriz):
+    """Registra la matriz de probabilidades en porcentaje."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(formatear_matriz(matriz))
+
+
+def simular_partido_montecarlo(lambda_local, lambda_visitante, n_simulaciones=1000,
+                               semilla=42):
     """Simula partidos por Monte Carlo y devuelve conteos y porcentajes."""
-    np.random.seed(42)  # Para reproducibilidad
-    
-    goles_local = np.random.poisson(lambda_local, n_simulaciones)
-    goles_visitante = np.random.poisson(lambda_visitante, n_simulaciones)
+    from .simulacion import simular_partidos_montecarlo
     
-    victorias_local = np.sum(goles_local > goles_visitante)
-    empates = np.sum(goles_local == goles_visitante)
-    victorias_visitante = np.sum(goles_local < goles_visitante)
+    sim = simular_partidos_montecarlo([lambda_local], [lambda_visitante],
+                                      n_simulaciones, semilla=semilla)
     
     return {
         'n_simulaciones': n_simulaciones,
-        'victorias_local': victorias_local,
-        'empates': empates,
-        'victorias_visitante': victorias_visitante,
-        'pct_victorias_local': victorias_local / n_simulaciones,
-        'pct_empates': empates / n_simulaciones,
-        'pct_victorias_visitante': victorias_visitante / n_simulaciones
-    }
\ No newline at end of file
+        'victorias_local': sim['victorias_local'][0],
+        'empates': sim['empates'][0],
+        'victorias_visitante': sim['victorias_visitante'][0],
+        'pct_victorias_local': sim['pct_victorias_local'][0],
+        'pct_empates': sim['pct_empates'][0],
+        'pct_victorias_visitante': sim['pct_victorias_visitante'][0]
+    }
@@ -1,157 +1,465 @@
 """Funciones para cargar y preparar datos para el GLM Poisson."""
 
+import json
+import logging
+import os
+import time
+
+import numpy as np
 import pandas as pd
-from .utils import sanitizar_nombre, imprimir_titulo
+from .utils import sanitizar_nombre, formatear_titulo, logger, registrar_evento
 
 
-def cargar_datos_historicos(ruta_csv):
-    """Lee CSV, valida columnas y devuelve DataFrame y lista de equipos."""
-    # Cargar CSV
-    try:
-        df = pd.read_csv(ruta_csv)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Archivo no encontrado: {ruta_csv}")
-    
-    # Validar columnas requeridas
-    columnas_requeridas = ['Temporada', 'Fecha', 'Equipo_Local', 
-                           'Equipo_Visitante', 'Goles_Local', 'Goles_Visitante']
-    
-    columnas_faltantes = set(columnas_requeridas) - set(df.columns)
+COLUMNAS_REQUERIDAS = ['Temporada', 'Fecha', 'Equipo_Local',
+                       'Equipo_Visitante', 'Goles_Local', 'Goles_Visitante']
+
+
+def validar_columnas(df):
+    """Lanza ValueError si faltan columnas requeridas de partidos."""
+    columnas_faltantes = set(COLUMNAS_REQUERIDAS) - set(df.columns)
     if columnas_faltantes:
         raise ValueError(f"Faltan columnas requeridas: {columnas_faltantes}")
-    
-    # Obtener lista única de equipos
-    equipos_local = set(df['Equipo_Local'].unique())
-    equipos_visitante = set(df['Equipo_Visitante'].unique())
-    equipos = sorted(list(equipos_local | equipos_visitante))
+
+
+# Goles en enteros pequeños y equipos/temporada categóricos: los códigos de
+# categoría sirven directamente como índices de equipo (ver `_indices_equipos`)
+TIPOS_COLUMNAS = {'Temporada': 'category', 'Equipo_Local': 'category',
+                  'Equipo_Visitante': 'category', 'Goles_Local': 'int16',
+                  'Goles_Visitante': 'int16'}
+COLUMNAS_EQUIPO = ['Equipo_Local', 'Equipo_Visitante']
+
+
+def leer_mapa_equipos(ruta):
+    """Lista de equipos de un mapa JSON (posición = código)."""
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)['equipos']
+
+
+def guardar_mapa_equipos(ruta, equipos):
+    """Escribe el mapa equipo → código de forma atómica."""
+    temporal = f'{ruta}.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'equipos': list(equipos)}, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def equipos_presentes(df):
+    """Equipos que juegan al menos un partido de `df`.
+
+    Con columnas categóricas comunes se cuentan los códigos y se respeta el
+    orden de las categorías (alfabético salvo con un mapa de equipos); si
+    no, se ordenan alfabéticamente.
+    """
+    if all(isinstance(df[c].dtype, pd.CategoricalDtype) for c in COLUMNAS_EQUIPO):
+        categorias = df['Equipo_Local'].cat.categories
+        if categorias.equals(df['Equipo_Visitante'].cat.categories):
+            codigos = np.concatenate([df[c].cat.codes.values for c in COLUMNAS_EQUIPO])
+            conteo = np.bincount(codigos[codigos >= 0], minlength=len(categorias))
+            return list(categorias[conteo > 0])
+    return sorted(set(df['Equipo_Local'].dropna().unique()) |
+                  set(df['Equipo_Visitante'].dropna().unique()))
+
+
+def tipar_partidos(df, equipos=None):
+    """Convierte los partidos a los tipos de `TIPOS_COLUMNAS` y fecha datetime.
+
+    Descarta (con aviso) los partidos sin goles. Local y visitante
+    comparten categorías: `equipos` si se da (los equipos que falten se
+    agregan al final, ordenados) o la unión ordenada. Devuelve el DataFrame
+    (otras columnas intactas) y la lista de categorías.
+    """
+    # Partidos sin marcador (p. ej. aún no jugados) no aportan al ajuste
+    sin_marcador = df[['Goles_Local', 'Goles_Visitante']].isna().any(axis=1).values
+    if sin_marcador.any():
+        logger.warning("Se omiten %d partidos sin marcador", sin_marcador.sum())
+        df = df[~sin_marcador].reset_index(drop=True)
+    
+    df = df.copy(deep=False)
+    fecha = df['Fecha']
+    if isinstance(fecha.dtype, pd.CategoricalDtype):
+        # Cada fecha distinta se interpreta una sola vez; el NaT final es el -1
+        valores = np.append(pd.to_datetime(fecha.cat.categories).values,
+                            np.datetime64('NaT'))
+        df['Fecha'] = valores[fecha.cat.codes.values]
+    else:
+        df['Fecha'] = pd.to_datetime(fecha)
+    for columna in ('Temporada', 'Goles_Local', 'Goles_Visitante'):
+        if df[columna].dtype != TIPOS_COLUMNAS[columna]:
+            df[columna] = df[columna].astype(TIPOS_COLUMNAS[columna])
+    
+    for columna in COLUMNAS_EQUIPO:
+        if not isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].astype('category')
+    # Unión sobre las categorías, no sobre las filas
+    presentes = (set(df['Equipo_Local'].cat.categories) |
+                 set(df['Equipo_Visitante'].cat.categories))
+    base = list(equipos) if equipos is not None else []
+    categorias = base + sorted(presentes - set(base))
+    for columna in COLUMNAS_EQUIPO:
+        if list(df[columna].cat.categories) != categorias:
+            df[columna] = df[columna].cat.set_categories(categorias)
+    
+    return df, categorias
+
+
+def concatenar_partidos(partidos, nuevos):
+    """Agrega `nuevos` a `partidos` conservando los tipos compactos.
+
+    Los equipos existentes conservan su código; los nuevos se agregan al
+    final de las categorías.
+    """
+    from pandas.api.types import union_categoricals
+    
+    base = None
+    if isinstance(partidos['Equipo_Local'].dtype, pd.CategoricalDtype):
+        base = list(partidos['Equipo_Local'].cat.categories)
+    partidos, equipos = tipar_partidos(partidos, base)
+    nuevos, equipos = tipar_partidos(nuevos, equipos)
+    partidos, _ = tipar_partidos(partidos, equipos)
+    
+    df = pd.concat([partidos, nuevos], ignore_index=True)
+    df['Temporada'] = union_categoricals([partidos['Temporada'],
+                                          nuevos['Temporada']])
+    
+    return df
+
+
+def _concatenar_bloques(bloques):
+    """Une bloques ya tipados sin pasar los categóricos por objetos."""
+    from pandas.api.types import union_categoricals
+    
+    columnas = {}
+    for columna in bloques[0].columns:
+        if isinstance(bloques[0][columna].dtype, pd.CategoricalDtype):
+            columnas[columna] = union_categoricals(
+                [b[columna] for b in bloques], sort_categories=True)
+        else:
+            columnas[columna] = pd.concat([b[columna] for b in bloques],
+                                          ignore_index=True)
+    
+    return pd.DataFrame(columnas)
+
+
+def _leer_partidos(ruta, tam_bloque=None):
+    """Lee CSV (por bloques si se pide), Parquet o Feather con tipos explícitos."""
+    extension = os.path.splitext(str(ruta))[1].lower()
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"Archivo no encontrado: {ruta}")
+    
+    if extension in ('.parquet', '.pq'):
+        return pd.read_parquet(ruta)
+    if extension == '.feather':
+        return pd.read_feather(ruta)
+    
+    # La fecha se lee como categoría (se repite mucho) y los goles como
+    # enteros con nulos; `tipar_partidos` convierte ambos
+    tipos = dict(TIPOS_COLUMNAS, Fecha='category', Goles_Local='Int16',
+                 Goles_Visitante='Int16')
+    if tam_bloque is None:
+        return pd.read_csv(ruta, dtype=tipos)
+    
+    bloques = []
+    for bloque in pd.read_csv(ruta, dtype=tipos, chunksize=tam_bloque):
+        validar_columnas(bloque)
+        bloques.append(tipar_partidos(bloque)[0])
+    if not bloques:
+        return pd.read_csv(ruta, dtype=tipos)
+    return _concatenar_bloques(bloques)
+
+
+def cargar_datos_historicos(ruta_csv, tam_bloque=None, mapa_equipos=None):
+    """Lee partidos con tipos compactos y devuelve DataFrame y lista de equipos.
+
+    Acepta CSV, Parquet (`.parquet`/`.pq`, requiere pyarrow) y Feather. Los
+    equipos son categóricos con categorías comunes a local y visitante, los
+    goles `int16`, la fecha datetime y la temporada categórica. Con
+    `tam_bloque` el CSV se lee en bloques de esas filas, para archivos que
+    no caben como texto en memoria. `mapa_equipos` es un JSON con el orden
+    de los equipos: se respeta al cargar (los nuevos se agregan al final y
+    se reescribe), así los códigos son estables entre cargas y archivos.
+    La lista devuelta solo trae los equipos con partidos en el archivo.
+    """
+    inicio = time.perf_counter()
+    
+    df = _leer_partidos(ruta_csv, tam_bloque)
+    validar_columnas(df)
+    
+    base = None
+    if mapa_equipos is not None and os.path.exists(mapa_equipos):
+        base = leer_mapa_equipos(mapa_equipos)
+    df, categorias = tipar_partidos(df, base)
+    if mapa_equipos is not None and categorias != base:
+        guardar_mapa_equipos(mapa_equipos, categorias)
+    # Sin equipos del mapa ausentes en el archivo coincide con `categorias`
+    equipos = equipos_presentes(df)
     
     # Mostrar información
-    imprimir_titulo("DATOS CARGADOS")
-    print(f"✓ Total de partidos: {len(df)}")
-    print(f"✓ Temporadas: {df['Temporada'].nunique()}")
-    print(f"✓ Número de equipos: {len(equipos)}")
-    print(f"\nEquipos encontrados:")
-    for i, equipo in enumerate(equipos, 1):
-        print(f"  {i:2d}. {equipo}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n".join(
+            [formatear_titulo("DATOS CARGADOS"),
+             f"✓ Total de partidos: {len(df)}",
+             f"✓ Temporadas: {df['Temporada'].nunique()}",
+             f"✓ Número de equipos: {len(equipos)}",
+             "\nEquipos encontrados:"] +
+            [f"  {i:2d}. {equipo}" for i, equipo in enumerate(equipos, 1)]
+        ))
+    registrar_evento('datos_cargados', archivo=str(ruta_csv), partidos=len(df),
+                     equipos=len(equipos),
+                     memoria_bytes=int(df.memory_usage(index=False).sum()),
+                     segundos=time.perf_counter() - inicio)
     
     return df, equipos
 
 
-def crear_variables_dummy(df, equipos):
-    """Agrega variables dummy para ataque/defensa por equipo."""
-    df_con_dummies = df.copy()
-    
-    print("\nCreando variables dummy...")
-    
-    # Variables para cada equipo
-    for equipo in equipos:
-        nombre_var = sanitizar_nombre(equipo)
-        
-        # Variable de ataque: 1 si el equipo está jugando (local o visitante)
-        df_con_dummies[f'ataque_{nombre_var}'] = (
-            (df['Equipo_Local'] == equipo) | 
-            (df['Equipo_Visitante'] == equipo)
-        ).astype(int)
-        
-        # Variable de defensa: 1 si el equipo está siendo atacado
-        df_con_dummies[f'defensa_{nombre_var}'] = (
-            (df['Equipo_Local'] == equipo) | 
-            (df['Equipo_Visitante'] == equipo)
-        ).astype(int)
-    
-    print(f"✓ {len(equipos) * 2} variables dummy creadas")
-    
-    return df_con_dummies
+def huella_datos(df):
+    """SHA-256 de los partidos normalizados (columnas requeridas, sin orden).
 
+    No depende del orden de filas ni de columnas extra, del formato de la
+    fecha ni del dtype de los goles.
+    """
+    import hashlib
+    
+    normalizado = pd.DataFrame({
+        'Temporada': df['Temporada'].astype(str).values,
+        'Fecha': pd.to_datetime(df['Fecha']).values.astype('datetime64[D]'),
+        'Equipo_Local': df['Equipo_Local'].astype(str).values,
+        'Equipo_Visitante': df['Equipo_Visitante'].astype(str).values,
+        'Goles_Local': df['Goles_Local'].values.astype(np.int64),
+        'Goles_Visitante': df['Goles_Visitante'].values.astype(np.int64),
+    })
+    filas = np.sort(pd.util.hash_pandas_object(normalizado, index=False).values)
+    
+    return hashlib.sha256(filas.tobytes()).hexdigest()
 
-def preparar_datos_modelo(df, equipos):
-    """Construye dataset combinado (observaciones local+visitante) listo para GLM."""
-    imprimir_titulo("PREPARANDO DATOS PARA ENTRENAMIENTO")
-    
-    # ==========================================
-    # PARTE 1: DATOS PARA GOLES DEL LOCAL
-    # ==========================================
-    print("\n[1/3] Preparando datos de goles del LOCAL...")
-    
-    datos_local = pd.DataFrame()
-    datos_local['goles'] = df['Goles_Local'].values
-    
-    # Variables dummy de ATAQUE (equipo local ataca)
-    for equipo in equipos:
-        nombre_var = sanitizar_nombre(equipo)
-        datos_local[f'ataque_{nombre_var}'] = (
-            df['Equipo_Local'] == equipo
-        ).astype(int).values
-    
-    # Variables dummy de DEFENSA (equipo visitante defiende)
-    for equipo in equipos:
-        nombre_var = sanitizar_nombre(equipo)
-        datos_local[f'defensa_{nombre_var}'] = (
-            df['Equipo_Visitante'] == equipo
-        ).astype(int).values
-    
-    # Variable de ventaja de local
-    datos_local['home'] = 1
-    
-    print(f"  ✓ {len(datos_local)} observaciones del LOCAL")
-    
-    # ==========================================
-    # PARTE 2: DATOS PARA GOLES DEL VISITANTE
-    # ==========================================
-    print("\n[2/3] Preparando datos de goles del VISITANTE...")
-    
-    datos_visitante = pd.DataFrame()
-    datos_visitante['goles'] = df['Goles_Visitante'].values
-    
-    # Variables dummy de ATAQUE (equipo visitante ataca)
-    for equipo in equipos:
-        nombre_var = sanitizar_nombre(equipo)
-        datos_visitante[f'ataque_{nombre_var}'] = (
-            df['Equipo_Visitante'] == equipo
-        ).astype(int).values
-    
-    # Variables dummy de DEFENSA (equipo local defiende)
-    for equipo in equipos:
-        nombre_var = sanitizar_nombre(equipo)
-        datos_visitante[f'defensa_{nombre_var}'] = (
-            df['Equipo_Local'] == equipo
-        ).astype(int).values
-    
-    # Variable de ventaja de local (0 para visitante)
-    datos_visitante['home'] = 0
-    
-    print(f"  ✓ {len(datos_visitante)} observaciones del VISITANTE")
-    
-    # ==========================================
-    # PARTE 3: COMBINAR DATASETS
-    # ==========================================
-    print("\n[3/3] Combinando datasets...")
-    
-    datos_completos = pd.concat([datos_local, datos_visitante], 
-                                 ignore_index=True)
-    
-    print(f"  ✓ Dataset final: {len(datos_completos)} observaciones")
-    print(f"  ✓ Variables: {datos_completos.shape[1]} columnas")
-    
-    return datos_completos
 
+def _codigos_equipo(columna, equipos):
+    """Posición en `equipos` de cada valor de una columna de equipo (-1 si no está)."""
+    if isinstance(columna.dtype, pd.CategoricalDtype):
+        codigos = columna.cat.codes.values
+        categorias = columna.cat.categories
+        if categorias.equals(pd.Index(equipos)):
+            return codigos.astype(np.int32)
+        # Solo se traducen las categorías; el -1 final conserva los nulos
+        traduccion = np.append(pd.Index(equipos).get_indexer(categorias), -1)
+        return traduccion[codigos].astype(np.int32)
+    return pd.Index(equipos).get_indexer(columna).astype(np.int32)
 
-def construir_formula_glm(equipos):
-    """Genera la fórmula string para ajustar el GLM (sin intercepto)."""
-    variables_ataque = [f'ataque_{sanitizar_nombre(eq)}' for eq in equipos]
-    variables_defensa = [f'defensa_{sanitizar_nombre(eq)}' for eq in equipos]
+
+def _indices_equipos(df, equipos):
+    """Posición en `equipos` de local y visitante de cada partido."""
+    idx_local = _codigos_equipo(df['Equipo_Local'], equipos)
+    idx_visitante = _codigos_equipo(df['Equipo_Visitante'], equipos)
     
-    formula = ('goles ~ ' + 
-               ' + '.join(variables_ataque + variables_defensa) + 
-               ' + home - 1')
+    if (idx_local < 0).any() or (idx_visitante < 0).any():
+        raise ValueError("Hay equipos en los partidos que no están en `equipos`")
     
-    return formula
+    return idx_local, idx_visitante
+
+
+def pesos_decaimiento(fechas, xi, fecha_referencia=None):
+    """Pesos de Dixon-Coles exp(-ξ·días) respecto a la fecha de referencia.
+
+    `xi` está en unidades de 1/día; por defecto la referencia es la fecha
+    más reciente de `fechas`. Los partidos posteriores a la referencia
+    pesan 0: el ajuste solo usa lo conocido hasta esa fecha.
+    """
+    fechas = pd.to_datetime(pd.Series(fechas))
+    referencia = (fechas.max() if fecha_referencia is None
+                  else pd.Timestamp(fecha_referencia))
+    dias = (referencia - fechas).dt.days.values
+
+    return np.where(dias >= 0, np.exp(-xi * np.maximum(dias, 0)), 0.0)
+
+
+def asignar_jornadas(df, separacion_dias=2):
+    """Número de jornada (0, 1, ...) de cada partido en orden cronológico.
+
+    Usa la columna `Jornada` (por temporada) si existe; si no, agrupa las
+    fechas consecutivas y abre una jornada nueva cuando pasan al menos
+    `separacion_dias` días sin partidos (viernes-domingo, martes-miércoles).
+    """
+    fechas = pd.to_datetime(df['Fecha'])
+    if 'Jornada' in df:
+        clave = pd.DataFrame({'Temporada': df['Temporada'].values,
+                              'Jornada': df['Jornada'].values,
+                              'Fecha': fechas.values})
+        inicio = clave.groupby(['Temporada', 'Jornada'])['Fecha'].transform('min')
+        return pd.factorize(inicio.values, sort=True)[0]
+
+    dias = np.unique(fechas.values)
+    nueva = np.diff(dias).astype('timedelta64[D]').astype(int) >= separacion_dias
+    jornada_dia = np.concatenate([[0], np.cumsum(nueva)])
+
+    return jornada_dia[np.searchsorted(dias, fechas.values)]
+
+
+def codificar_partidos(df, equipos, pesos=None):
+    """Dataset compacto por índices: una fila por (partido, equipo que ataca).
+
+    Las primeras `len(df)` filas son los goles del local y las siguientes los
+    del visitante; `atacante`/`defensor` son posiciones en `equipos`. Con
+    `pesos` (uno por partido) se agrega la columna `peso`.
+    """
+    idx_local, idx_visitante = _indices_equipos(df, equipos)
+    
+    datos = pd.DataFrame({
+        'goles': np.concatenate([df['Goles_Local'].values,
+                                 df['Goles_Visitante'].values]).astype(np.int16),
+        'atacante': np.concatenate([idx_local, idx_visitante]),
+        'defensor': np.concatenate([idx_visitante, idx_local]),
+        'local': np.repeat(np.array([1, 0], dtype=np.int8), len(df)),
+    })
+    if pesos is not None:
+        datos['peso'] = np.tile(np.asarray(pesos, dtype=float), 2)
+    
+    return datos
+
+
+def preparar_datos_modelo(df, equipos, pesos=None):
+    """Codifica los partidos por índices (ver `codificar_partidos`)."""
+    inicio = time.perf_counter()
+    datos = codificar_partidos(df, equipos, pesos)
+    memoria = int(datos.memory_usage(index=False).sum())
+    
+    logger.info("%s\n  ✓ Dataset final: %d observaciones (%d local + %d visitante)"
+                "\n  ✓ Memoria: %.1f KB",
+                formatear_titulo("PREPARANDO DATOS PARA ENTRENAMIENTO"),
+                len(datos), len(df), len(df), memoria / 1024)
+    registrar_evento('datos_preparados', observaciones=len(datos),
+                     memoria_bytes=memoria, segundos=time.perf_counter() - inicio)
+    
+    return datos
+
+
+def agrupar_celdas(datos, n_equipos):
+    """Estadísticos suficientes por celda (atacante, defensor, local).
+
+    La verosimilitud solo depende de la suma de goles y del número de
+    observaciones de cada celda, así que hay a lo sumo 2N² filas sin
+    importar cuántos partidos haya. `log_factorial` guarda Σ log(goles!)
+    para reconstruir el llf exacto. Acepta datos por partido (con `peso`
+    opcional, que escala goles, exposición y log_factorial) o ya agregados
+    (p. ej. la concatenación de dos tablas de celdas).
+    """
+    from scipy.special import gammaln
+    
+    goles = datos['goles'].values.astype(float)
+    if 'exposicion' in datos:
+        exposicion = datos['exposicion'].values
+        log_factorial = datos['log_factorial'].values
+    else:
+        peso = datos['peso'].values if 'peso' in datos else np.ones(len(datos))
+        exposicion = peso
+        log_factorial = peso * gammaln(goles + 1)
+        goles = peso * goles
+    
+    clave = ((datos['atacante'].values.astype(np.int64) * n_equipos +
+              datos['defensor'].values) * 2 + datos['local'].values)
+    celdas, inversa = np.unique(clave, return_inverse=True)
+    exposicion = np.bincount(inversa, exposicion)
+    if np.allclose(exposicion, np.rint(exposicion)):
+        exposicion = np.rint(exposicion).astype(np.int32)
+    
+    return pd.DataFrame({
+        'goles': np.bincount(inversa, goles),
+        'exposicion': exposicion,
+        'atacante': (celdas // 2 // n_equipos).astype(np.int32),
+        'defensor': (celdas // 2 % n_equipos).astype(np.int32),
+        'local': (celdas % 2).astype(np.int8),
+        'log_factorial': np.bincount(inversa, log_factorial),
+    })
+
+
+def agregar_datos_modelo(df, equipos, pesos=None):
+    """Codifica y agrupa los partidos en celdas (ver `agrupar_celdas`)."""
+    inicio = time.perf_counter()
+    datos = agrupar_celdas(codificar_partidos(df, equipos, pesos), len(equipos))
+    
+    logger.info("%s\n  ✓ %d observaciones agregadas en %d celdas",
+                formatear_titulo("AGREGANDO DATOS PARA ENTRENAMIENTO"),
+                2 * len(df), len(datos))
+    registrar_evento('datos_preparados', observaciones=2 * len(df),
+                     celdas=len(datos), segundos=time.perf_counter() - inicio)
+    
+    return datos
+
+
+def agrupar_celdas_por_antiguedad(datos, dias, n_equipos):
+    """Agrupa por (celda, días de antigüedad) para barridos de ξ.
+
+    Los grupos no dependen de ξ: para cada valor basta ponderar cada grupo
+    con exp(-ξ·días) y sumar en su celda (ver `ponderar_celdas`).
+    """
+    from scipy.special import gammaln
+    
+    goles = datos['goles'].values.astype(float)
+    dias = np.tile(np.asarray(dias, dtype=np.int64), 2)
+    celda = ((datos['atacante'].values.astype(np.int64) * n_equipos +
+              datos['defensor'].values) * 2 + datos['local'].values)
+    
+    celdas, celda_inversa = np.unique(celda, return_inverse=True)
+    grupos, grupo_inversa = np.unique(celda_inversa * (dias.max() + 1) + dias,
+                                      return_inverse=True)
+    
+    return {
+        'atacante': (celdas // 2 // n_equipos).astype(np.int32),
+        'defensor': (celdas // 2 % n_equipos).astype(np.int32),
+        'local': (celdas % 2).astype(np.int8),
+        'celda_grupo': grupos // (dias.max() + 1),
+        'dias_grupo': grupos % (dias.max() + 1),
+        'goles_grupo': np.bincount(grupo_inversa, goles),
+        'conteo_grupo': np.bincount(grupo_inversa),
+        'log_factorial_grupo': np.bincount(grupo_inversa, gammaln(goles + 1)),
+    }
+
+
+def ponderar_celdas(grupos, xi):
+    """Celdas agregadas con pesos exp(-ξ·días) a partir de los grupos."""
+    peso = np.exp(-xi * grupos['dias_grupo'])
+    n_celdas = len(grupos['atacante'])
+    
+    return pd.DataFrame({
+        'goles': np.bincount(grupos['celda_grupo'], peso * grupos['goles_grupo'],
+                             n_celdas),
+        'exposicion': np.bincount(grupos['celda_grupo'],
+                                  peso * grupos['conteo_grupo'], n_celdas),
+        'atacante': grupos['atacante'],
+        'defensor': grupos['defensor'],
+        'local': grupos['local'],
+        'log_factorial': np.bincount(grupos['celda_grupo'],
+                                     peso * grupos['log_factorial_grupo'], n_celdas),
+    })
+
+
+def nombres_parametros(equipos):
+    """Nombres de coeficientes en el orden [ataque..., defensa..., home]."""
+    return ([f'ataque_{sanitizar_nombre(eq)}' for eq in equipos] +
+            [f'defensa_{sanitizar_nombre(eq)}' for eq in equipos] +
+            ['home'])
+
+
+def construir_matriz_diseno(datos, n_equipos):
+    """Matriz de diseño CSR [ataque | defensa | home] en una sola pasada."""
+    from scipy import sparse
+    
+    n_obs = len(datos)
+    local = datos['local'].values.astype(bool)
+    filas = np.concatenate([np.repeat(np.arange(n_obs), 2),
+                            np.flatnonzero(local)])
+    columnas = np.concatenate([
+        np.column_stack([datos['atacante'].values,
+                         n_equipos + datos['defensor'].values]).ravel(),
+        np.full(local.sum(), 2 * n_equipos),
+    ])
+    
+    return sparse.csr_matrix(
+        (np.ones(len(filas)), (filas, columnas)),
+        shape=(n_obs, 2 * n_equipos + 1)
+    )
 
 
 def extraer_parametros_modelo(modelo_entrenado, equipos):
     """Extrae alpha, beta y gamma (expo de coeficientes del modelo)."""
-    import numpy as np
-    
     params = modelo_entrenado.params
     
     # Extraer alphas (ataque)
@@ -0,0 +1,99 @@
+"""Distribución exacta de puntos finales por convolución (sin simulación)."""
+
+import numpy as np
+
+from .predicciones import predecir_lote
+
+
+def pmf_puntos_partidos(lambdas_local, lambdas_visitante, max_goles=10, rho=None):
+    """PMF de puntos {0, 1, 3} de local y visitante para cada partido.
+
+    Devuelve dos arreglos F×4 (índice = puntos obtenidos). Las
+    probabilidades 1X2 se normalizan para compensar el truncamiento.
+    """
+    lote = predecir_lote(lambdas_local, lambdas_visitante, max_goles, rho=rho)
+    gana = lote['prob_victoria_local']
+    empata = lote['prob_empate']
+    pierde = lote['prob_victoria_visitante']
+    total = gana + empata + pierde
+
+    ceros = np.zeros_like(gana)
+    pmf_local = np.column_stack([pierde, empata, ceros, gana]) / total[:, None]
+    pmf_visitante = np.column_stack([gana, empata, ceros, pierde]) / total[:, None]
+
+    return pmf_local, pmf_visitante
+
+
+def puntos_esperados(pmf_local, pmf_visitante, idx_local, idx_visitante,
+                     n_equipos, puntos=None):
+    """E[puntos finales] de todos los equipos en una sola pasada."""
+    valores = np.arange(4)
+    base = np.zeros(n_equipos) if puntos is None else np.asarray(puntos, dtype=float)
+    return (base + np.bincount(idx_local, pmf_local @ valores, n_equipos) +
+            np.bincount(idx_visitante, pmf_visitante @ valores, n_equipos))
+
+
+def _convolucion_directa(pmf_partidos, equipo, n_equipos, largo):
+    """Convoluciona ronda por ronda, vectorizado sobre los equipos."""
+    orden = np.argsort(equipo, kind='stable')
+    equipo, pmf_partidos = equipo[orden], pmf_partidos[orden]
+    # Posición del partido dentro de los de su equipo (0, 1, 2, ...)
+    inicio = np.searchsorted(equipo, equipo)
+    ronda = np.arange(len(equipo)) - inicio
+
+    dist = np.zeros((n_equipos, largo))
+    dist[:, 0] = 1
+    for r in range(ronda.max() + 1 if len(ronda) else 0):
+        # Equipos sin partido en esta ronda conservan su distribución (delta)
+        pmf = np.zeros((n_equipos, 4))
+        pmf[:, 0] = 1
+        pmf[equipo[ronda == r]] = pmf_partidos[ronda == r]
+        nueva = dist * pmf[:, [0]]
+        for p in (1, 3):
+            nueva[:, p:] += dist[:, :-p] * pmf[:, [p]]
+        dist = nueva
+    return dist
+
+
+def _convolucion_fft(pmf_partidos, equipo, n_equipos, largo):
+    """Producto de transformadas por equipo (conveniente con muchos partidos)."""
+    espectro = np.fft.rfft(pmf_partidos, n=largo, axis=1)
+    orden = np.argsort(equipo, kind='stable')
+    equipo, espectro = equipo[orden], espectro[orden]
+
+    producto = np.ones((n_equipos, espectro.shape[1]), dtype=complex)
+    conteo = np.bincount(equipo, minlength=n_equipos)
+    con_partidos = np.flatnonzero(conteo)
+    if len(con_partidos):
+        inicios = np.concatenate([[0], np.cumsum(conteo)[:-1]])[con_partidos]
+        producto[con_partidos] = np.multiply.reduceat(espectro, inicios, axis=0)
+
+    dist = np.maximum(np.fft.irfft(producto, n=largo, axis=1), 0)
+    return dist / dist.sum(axis=1, keepdims=True)
+
+
+def distribucion_puntos(pmf_local, pmf_visitante, idx_local, idx_visitante,
+                        n_equipos, puntos=None, umbral_fft=20):
+    """PMF exacta de puntos finales por equipo (filas) y total (columnas).
+
+    Suma los puntos actuales más la convolución de las PMF de cada partido
+    restante. Con más de `umbral_fft` partidos por equipo se usa FFT.
+    """
+    pmf_partidos = np.vstack([pmf_local, pmf_visitante])
+    equipo = np.concatenate([idx_local, idx_visitante]).astype(np.intp)
+
+    max_partidos = np.bincount(equipo, minlength=n_equipos).max() if len(equipo) else 0
+    largo = 3 * max_partidos + 1
+    if max_partidos > umbral_fft:
+        dist = _convolucion_fft(pmf_partidos, equipo, n_equipos, largo)
+    else:
+        dist = _convolucion_directa(pmf_partidos, equipo, n_equipos, largo)
+
+    # Desplazar por los puntos ya obtenidos
+    base = (np.zeros(n_equipos, dtype=int) if puntos is None
+            else np.rint(np.asarray(puntos)).astype(int))
+    final = np.zeros((n_equipos, base.max() + largo))
+    columnas = base[:, None] + np.arange(largo)
+    np.put_along_axis(final, columnas, dist, axis=1)
+
+    return final
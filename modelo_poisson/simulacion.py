@@ -0,0 +1,143 @@
+"""Simulación Monte Carlo de partidos con generadores independientes."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# Partidos que simula cada generador: fijo para que el resultado no dependa
+# de `tam_bloque` (que solo agrupa unidades por tarea) ni de `n_procesos`
+PARTIDOS_POR_SEMILLA = 2**18
+
+
+def _semillas_bloques(semilla, n_bloques):
+    """Una semilla hija por bloque: el resultado no depende de los procesos."""
+    return np.random.SeedSequence(semilla).spawn(n_bloques)
+
+
+def _repartir_unidades(semilla, n_repeticiones, partidos_por_repeticion, tam_bloque):
+    """Reparte las repeticiones en unidades con semilla propia y las agrupa.
+
+    Cada unidad simula a lo sumo `PARTIDOS_POR_SEMILLA` partidos (al menos
+    una repetición); cada bloque agrupa unidades hasta `tam_bloque`
+    partidos. Devuelve una lista de bloques [(n, semilla), ...].
+    """
+    partidos_por_repeticion = max(partidos_por_repeticion, 1)
+    por_unidad = max(1, PARTIDOS_POR_SEMILLA // partidos_por_repeticion)
+    tamanos = [min(por_unidad, n_repeticiones - inicio)
+               for inicio in range(0, n_repeticiones, por_unidad)]
+    unidades = list(zip(tamanos, _semillas_bloques(semilla, len(tamanos))))
+    
+    por_bloque = max(1, tam_bloque // (por_unidad * partidos_por_repeticion))
+    return [unidades[inicio:inicio + por_bloque]
+            for inicio in range(0, len(unidades), por_bloque)]
+
+
+def _sumar_conteos(conteos):
+    """Suma clave a clave una lista de dicts de conteos."""
+    return {clave: sum(c[clave] for c in conteos) for clave in conteos[0]}
+
+
+def _ejecutar_bloques(funcion, tareas, n_procesos=1):
+    """Aplica `funcion` a cada tarea, en serie o en un pool de procesos."""
+    if n_procesos is None or n_procesos > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            return list(pool.map(funcion, tareas))
+    return [funcion(tarea) for tarea in tareas]
+
+
+def corregir_marcadores_bajos(rng, goles_local, goles_visitante, lambdas_local,
+                              lambdas_visitante, rho):
+    """Lleva marcadores Poisson independientes a la distribución de Dixon-Coles.
+
+    τ(ρ) solo reparte la masa dentro de {0,1}² sin cambiar su total, así que
+    basta volver a sortear entre 0-0, 0-1, 1-0 y 1-1 los marcadores que
+    cayeron en ese bloque, con probabilidades ∝ τ·P. Los goles tienen a los
+    partidos en la última dimensión y se modifican en sitio.
+    """
+    bajo = (goles_local <= 1) & (goles_visitante <= 1)
+    partido = np.nonzero(bajo)[-1]
+    lam = np.asarray(lambdas_local, dtype=float)[partido]
+    mu = np.asarray(lambdas_visitante, dtype=float)[partido]
+
+    # P(x, y)/P(0, 0) por τ, en el orden 0-0, 0-1, 1-0, 1-1
+    pesos = np.column_stack([1 - lam * mu * rho, mu * (1 + lam * rho),
+                             lam * (1 + mu * rho), lam * mu * (1 - rho)])
+    acumulado = np.cumsum(pesos, axis=1)
+    sorteo = rng.random(len(partido)) * acumulado[:, -1]
+    marcador = (sorteo[:, None] >= acumulado[:, :-1]).sum(axis=1)
+
+    goles_local[bajo] = marcador // 2
+    goles_visitante[bajo] = marcador % 2
+
+
+def _simular_unidad(lambdas_local, lambdas_visitante, n, semilla, max_goles, rho):
+    """Simula `n` partidos por fixture y devuelve solo los conteos."""
+    rng = np.random.default_rng(semilla)
+    k = len(lambdas_local)
+
+    goles_local = rng.poisson(lambdas_local[:, None], (k, n))
+    goles_visitante = rng.poisson(lambdas_visitante[:, None], (k, n))
+    if rho:
+        # Vistas transpuestas: partidos en la última dimensión
+        corregir_marcadores_bajos(rng, goles_local.T, goles_visitante.T,
+                                  lambdas_local, lambdas_visitante, rho)
+
+    # Marcadores acotados a max_goles (la última celda acumula "G o más")
+    celda = (np.minimum(goles_local, max_goles) * (max_goles + 1) +
+             np.minimum(goles_visitante, max_goles))
+    celda += np.arange(k)[:, None] * (max_goles + 1) ** 2
+    marcadores = np.bincount(celda.ravel(), minlength=k * (max_goles + 1) ** 2)
+
+    return {
+        'victorias_local': (goles_local > goles_visitante).sum(axis=1),
+        'empates': (goles_local == goles_visitante).sum(axis=1),
+        'victorias_visitante': (goles_local < goles_visitante).sum(axis=1),
+        'goles_local': goles_local.sum(axis=1),
+        'goles_visitante': goles_visitante.sum(axis=1),
+        'marcadores': marcadores.reshape(k, max_goles + 1, max_goles + 1),
+    }
+
+
+def _simular_bloque(tarea):
+    """Simula las unidades de un bloque y suma sus conteos."""
+    lambdas_local, lambdas_visitante, unidades, max_goles, rho = tarea
+    return _sumar_conteos([
+        _simular_unidad(lambdas_local, lambdas_visitante, n, semilla, max_goles, rho)
+        for n, semilla in unidades
+    ])
+
+
+def simular_partidos_montecarlo(lambdas_local, lambdas_visitante,
+                                n_simulaciones=10000, semilla=42, max_goles=5,
+                                tam_bloque=1_000_000, n_procesos=1, rho=None):
+    """Monte Carlo de K partidos en bloques de memoria constante.
+
+    Los partidos se simulan en unidades de `PARTIDOS_POR_SEMILLA` (sumando
+    todos los fixtures), cada una con su propio generador derivado de
+    `semilla`; cada tarea agrupa unidades hasta `tam_bloque` partidos. El
+    resultado es idéntico bit a bit con cualquier `tam_bloque` y
+    `n_procesos`. Con `rho` los marcadores siguen la corrección de
+    Dixon-Coles.
+    """
+    lambdas_local = np.atleast_1d(np.asarray(lambdas_local, dtype=float))
+    lambdas_visitante = np.atleast_1d(np.asarray(lambdas_visitante, dtype=float))
+    bloques = _repartir_unidades(semilla, n_simulaciones, len(lambdas_local),
+                                 tam_bloque)
+
+    tareas = [(lambdas_local, lambdas_visitante, unidades, max_goles, rho)
+              for unidades in bloques]
+    conteos = _sumar_conteos(_ejecutar_bloques(_simular_bloque, tareas, n_procesos))
+
+    return {
+        'n_simulaciones': n_simulaciones,
+        'victorias_local': conteos['victorias_local'],
+        'empates': conteos['empates'],
+        'victorias_visitante': conteos['victorias_visitante'],
+        'pct_victorias_local': conteos['victorias_local'] / n_simulaciones,
+        'pct_empates': conteos['empates'] / n_simulaciones,
+        'pct_victorias_visitante': conteos['victorias_visitante'] / n_simulaciones,
+        'goles_promedio_local': conteos['goles_local'] / n_simulaciones,
+        'goles_promedio_visitante': conteos['goles_visitante'] / n_simulaciones,
+        'frecuencia_marcadores': conteos['marcadores'] / n_simulaciones,
+    }
@@ -0,0 +1,242 @@
+"""Simulación de torneos: tabla general y Liguilla (eliminatorias ida/vuelta)."""
+
+import numpy as np
+import pandas as pd
+
+from .predicciones import generar_matrices_probabilidades
+from .simulacion import (_ejecutar_bloques, _repartir_unidades, _sumar_conteos,
+                         corregir_marcadores_bajos)
+
+
+# Lugares de la tabla general que definen cada zona (formato Liga MX)
+ZONAS_LIGA_MX = {'Top_4': 4, 'Liguilla_Directa': 6, 'Play_In': 10}
+
+# Nombre de la ronda según equipos que siguen vivos
+RONDAS_LIGUILLA = {16: 'Octavos', 8: 'Cuartos', 4: 'Semifinal', 2: 'Final',
+                   1: 'Campeon'}
+
+
+def _clave_tabla(puntos, diferencia, goles_favor):
+    """Clave entera que ordena por puntos, diferencia de goles y goles a favor."""
+    return ((puntos.astype(np.int64) * 20001 + (diferencia + 10000)) * 10001 +
+            goles_favor)
+
+
+def _simular_temporadas(lambdas_local, lambdas_visitante, uno_local, uno_visitante,
+                        base, n, semilla, rho):
+    """Simula `n` temporadas completas y devuelve conteos por posición."""
+    rng = np.random.default_rng(semilla)
+    n_equipos = uno_local.shape[1]
+
+    goles_local = rng.poisson(lambdas_local, (n, len(lambdas_local)))
+    goles_visitante = rng.poisson(lambdas_visitante, (n, len(lambdas_visitante)))
+    if rho:
+        corregir_marcadores_bajos(rng, goles_local, goles_visitante,
+                                  lambdas_local, lambdas_visitante, rho)
+
+    empate = goles_local == goles_visitante
+    puntos_local = 3.0 * (goles_local > goles_visitante) + empate
+    puntos_visitante = 3.0 * (goles_local < goles_visitante) + empate
+    diferencia = (goles_local - goles_visitante).astype(float)
+
+    # Acumulación por equipo con matrices indicadoras (partidos × equipos)
+    puntos = base['puntos'] + puntos_local @ uno_local + puntos_visitante @ uno_visitante
+    dif = base['diferencia'] + diferencia @ (uno_local - uno_visitante)
+    gf = (base['goles_favor'] + goles_local.astype(float) @ uno_local +
+          goles_visitante.astype(float) @ uno_visitante)
+
+    # Orden de la tabla: clave descendente y sorteo para empates totales
+    clave = _clave_tabla(np.rint(puntos), np.rint(dif).astype(np.int64),
+                         np.rint(gf).astype(np.int64))
+    orden = np.lexsort((rng.random(clave.shape), -clave), axis=-1)
+    posiciones = np.empty_like(orden)
+    np.put_along_axis(posiciones, orden,
+                      np.broadcast_to(np.arange(n_equipos), orden.shape), axis=-1)
+
+    conteo = np.bincount(
+        (np.arange(n_equipos) * n_equipos + posiciones).ravel(),
+        minlength=n_equipos * n_equipos
+    ).reshape(n_equipos, n_equipos)
+
+    return {'conteo_posiciones': conteo, 'suma_puntos': puntos.sum(axis=0)}
+
+
+def _simular_bloque_temporadas(tarea):
+    """Simula las unidades de temporadas de un bloque y suma sus conteos."""
+    (lambdas_local, lambdas_visitante, uno_local, uno_visitante,
+     base, unidades, rho) = tarea
+    return _sumar_conteos([
+        _simular_temporadas(lambdas_local, lambdas_visitante, uno_local,
+                            uno_visitante, base, n, semilla, rho)
+        for n, semilla in unidades
+    ])
+
+
+def simular_temporada(lambdas_local, lambdas_visitante, idx_local, idx_visitante,
+                      n_equipos, puntos=None, diferencia=None, goles_favor=None,
+                      n_temporadas=10000, semilla=42, tam_bloque=2_000_000,
+                      n_procesos=1, rho=None):
+    """Monte Carlo de los partidos restantes sobre la tabla actual.
+
+    `idx_local`/`idx_visitante` son posiciones (0..n_equipos-1) en la tabla;
+    `puntos`, `diferencia` y `goles_favor` son los acumulados actuales. Con
+    `rho` los marcadores siguen la corrección de Dixon-Coles. Como en
+    `simulacion`, el resultado no depende de `tam_bloque` ni de `n_procesos`.
+    Devuelve la matriz N×N con la probabilidad de cada equipo en cada
+    posición y los puntos esperados.
+    """
+    n_partidos = len(idx_local)
+    uno_local = np.zeros((n_partidos, n_equipos))
+    uno_local[np.arange(n_partidos), idx_local] = 1
+    uno_visitante = np.zeros((n_partidos, n_equipos))
+    uno_visitante[np.arange(n_partidos), idx_visitante] = 1
+
+    ceros = np.zeros(n_equipos)
+    base = {
+        'puntos': ceros if puntos is None else np.asarray(puntos, dtype=float),
+        'diferencia': ceros if diferencia is None else np.asarray(diferencia, dtype=float),
+        'goles_favor': ceros if goles_favor is None else np.asarray(goles_favor, dtype=float),
+    }
+
+    tareas = [(np.asarray(lambdas_local, dtype=float),
+               np.asarray(lambdas_visitante, dtype=float),
+               uno_local, uno_visitante, base, unidades, rho)
+              for unidades in _repartir_unidades(semilla, n_temporadas,
+                                                 n_partidos, tam_bloque)]
+    conteos = _sumar_conteos(_ejecutar_bloques(_simular_bloque_temporadas,
+                                               tareas, n_procesos))
+
+    return {
+        'n_temporadas': n_temporadas,
+        'prob_posiciones': conteos['conteo_posiciones'] / n_temporadas,
+        'puntos_esperados': conteos['suma_puntos'] / n_temporadas,
+    }
+
+
+def tabla_probabilidades(equipos, resultado, zonas=None):
+    """DataFrame con puntos esperados, P(posición) y P(zona) por equipo."""
+    prob = resultado['prob_posiciones']
+    n = len(equipos)
+
+    df = pd.DataFrame({'Equipo': equipos,
+                       'Puntos_Esperados': resultado['puntos_esperados']})
+    df['Posicion_Esperada'] = prob @ np.arange(1, n + 1)
+    for nombre, lugares in (zonas or {}).items():
+        df[f'P({nombre})_%'] = prob[:, :lugares].sum(axis=1) * 100
+    for pos in range(n):
+        df[f'Pos_{pos + 1}_%'] = prob[:, pos] * 100
+
+    return df.sort_values('Posicion_Esperada').reset_index(drop=True)
+
+
+# ==========================================
+# LIGUILLA
+# ==========================================
+
+def distribucion_global(matrices_ida, matrices_vuelta):
+    """Marcador global de una eliminatoria convolucionando ida y vuelta.
+
+    Ambas matrices van orientadas como [goles equipo A, goles equipo B];
+    el resultado es K×(2G+1)×(2G+1) con la suma de goles de los dos partidos.
+    """
+    tamano = (matrices_ida.shape[-2] + matrices_vuelta.shape[-2] - 1,
+              matrices_ida.shape[-1] + matrices_vuelta.shape[-1] - 1)
+    espectro = (np.fft.rfft2(matrices_ida, s=tamano) *
+                np.fft.rfft2(matrices_vuelta, s=tamano))
+    return np.maximum(np.fft.irfft2(espectro, s=tamano), 0)
+
+
+def probabilidad_avance(ataque, defensa, gamma, idx_mejor, idx_peor,
+                        final=False, max_goles=10, rho=None):
+    """P(avanza el mejor sembrado) en eliminatorias a ida y vuelta.
+
+    El mejor sembrado cierra en casa. Con global empatado avanza él, salvo en
+    la final, que va a prórroga (λ/3 del partido de vuelta) y penales 50/50.
+    Con `rho` los tres partidos usan la corrección de Dixon-Coles.
+    """
+    a_mejor, d_mejor = ataque[idx_mejor], defensa[idx_mejor]
+    a_peor, d_peor = ataque[idx_peor], defensa[idx_peor]
+
+    ida = generar_matrices_probabilidades(a_mejor * d_peor,
+                                          a_peor * d_mejor * gamma, max_goles, rho)
+    vuelta = generar_matrices_probabilidades(a_mejor * d_peor * gamma,
+                                             a_peor * d_mejor, max_goles, rho)
+    global_ = distribucion_global(ida, vuelta)
+
+    i, j = np.indices(global_.shape[-2:])
+    gana = (global_ * (i > j)).sum(axis=(-2, -1))
+    empata = np.trace(global_, axis1=-2, axis2=-1)
+
+    if not final:
+        return gana + empata
+
+    prorroga = generar_matrices_probabilidades(a_mejor * d_peor * gamma / 3,
+                                               a_peor * d_mejor / 3, max_goles, rho)
+    i, j = np.indices(prorroga.shape[-2:])
+    gana_prorroga = (prorroga * (i > j)).sum(axis=(-2, -1))
+    empata_prorroga = np.trace(prorroga, axis1=-2, axis2=-1)
+
+    return gana + empata * (gana_prorroga + 0.5 * empata_prorroga)
+
+
+def _jugar_ronda(cuadros, pesos, p_avance, resultados, exacto):
+    """Aplica los resultados de una ronda a cada cuadro.
+
+    `cuadros` contiene sembrados vivos ordenados (0 = mejor); se enfrenta el
+    mejor contra el peor, el segundo contra el penúltimo, etc. `resultados`
+    es 0/1 por serie (1 = avanza el peor sembrado): una fila por cuadro en
+    Monte Carlo, o todas las combinaciones posibles si `exacto`.
+    """
+    m = cuadros.shape[1] // 2
+    mejores, peores = cuadros[:, :m], cuadros[:, ::-1][:, :m]
+    p = p_avance[mejores, peores]
+
+    sorpresa = resultados.astype(bool)
+    if exacto:
+        # Cada cuadro se ramifica en todas las combinaciones de resultados
+        ganadores = np.where(sorpresa[None], peores[:, None], mejores[:, None])
+        prob = np.where(sorpresa[None], 1 - p[:, None], p[:, None]).prod(axis=-1)
+        pesos = (pesos[:, None] * prob).ravel()
+        ganadores = ganadores.reshape(-1, m)
+    else:
+        ganadores = np.where(sorpresa, peores, mejores)
+
+    return np.sort(ganadores, axis=1), pesos
+
+
+def simular_liguilla(p_avance, p_avance_final, metodo='exacto',
+                     n_simulaciones=100000, semilla=42):
+    """P(alcanzar cada ronda) por sembrado en una Liguilla con resiembra.
+
+    `p_avance[a, b]` es la probabilidad de que el sembrado `a` (mejor)
+    elimine a `b`; `p_avance_final` lo mismo para la final. Con
+    `metodo='exacto'` se enumeran todos los cuadros posibles (2^(n-1));
+    con `'montecarlo'` se muestrean `n_simulaciones` torneos.
+    """
+    n = p_avance.shape[0]
+    if n < 2 or n & (n - 1):
+        raise ValueError("La Liguilla necesita una potencia de 2 de equipos")
+    if metodo not in ('exacto', 'montecarlo'):
+        raise ValueError(f"Método no soportado: {metodo}")
+
+    rng = np.random.default_rng(semilla)
+    if metodo == 'exacto':
+        cuadros, pesos = np.arange(n)[None, :], np.ones(1)
+    else:
+        cuadros = np.tile(np.arange(n), (n_simulaciones, 1))
+        pesos = np.full(n_simulaciones, 1 / n_simulaciones)
+
+    alcanza = [np.ones(n)]
+    while cuadros.shape[1] > 1:
+        m = cuadros.shape[1] // 2
+        matriz = p_avance_final if m == 1 else p_avance
+        if metodo == 'exacto':
+            resultados = (np.arange(2 ** m)[:, None] >> np.arange(m)) & 1
+        else:
+            p = matriz[cuadros[:, :m], cuadros[:, ::-1][:, :m]]
+            resultados = rng.random(p.shape) >= p
+        cuadros, pesos = _jugar_ronda(cuadros, pesos, matriz, resultados,
+                                      metodo == 'exacto')
+        alcanza.append(np.bincount(cuadros.ravel(), np.repeat(pesos, m), n))
+
+    return np.column_stack(alcanza)
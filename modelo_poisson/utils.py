@@ -1,6 +1,56 @@
 """Utilidades: sanitizar nombres, validaciones y formatos simples."""
 
+import importlib
+import importlib.util
+import json
+import logging
 import re
+import sys
+import threading
+
+# Mensajes legibles del paquete y eventos JSON por etapa (logger hijo). Sin
+# configurar no se muestra nada: ver `configurar_consola`.
+logger = logging.getLogger('modelo_poisson')
+logger_eventos = logging.getLogger('modelo_poisson.eventos')
+
+
+class _ModuloDiferido:
+    """Importa el módulo real en el primer acceso a un atributo.
+
+    No registra nada en `sys.modules` hasta ese momento, y la importación
+    se hace bajo un lock: varios hilos (p. ej. sesiones de Streamlit) que
+    lo usan a la vez ven siempre el módulo completo.
+    """
+
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+        self._candado = threading.Lock()
+
+    def _cargar(self):
+        if self._modulo is None:
+            with self._candado:
+                if self._modulo is None:
+                    self._modulo = importlib.import_module(self._nombre)
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    def __repr__(self):
+        return f"<módulo diferido {self._nombre!r}>"
+
+
+def importar_diferido(nombre, paquete=None):
+    """Módulo que se importa recién en el primer acceso a un atributo.
+
+    Si ya está importado se devuelve tal cual; si no, un intermediario que
+    lo importa normalmente (y de forma segura entre hilos) al usarlo.
+    """
+    nombre = importlib.util.resolve_name(nombre, paquete)
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    return _ModuloDiferido(nombre)
 
 
 def sanitizar_nombre(nombre):
@@ -75,13 +125,50 @@ def formatear_probabilidad(probabilidad, decimales=1):
     return f"{probabilidad * 100:.{decimales}f}%"
 
 
+def formatear_titulo(titulo, caracter='=', longitud=70):
+    """`titulo` rodeado por líneas de separación (texto multilínea)."""
+    return f"{caracter * longitud}\n{titulo}\n{caracter * longitud}"
+
+
 def imprimir_separador(caracter='=', longitud=70):
-    """Imprime una línea separadora repetida `longitud` veces."""
-    print(caracter * longitud)
+    """Registra una línea separadora repetida `longitud` veces."""
+    logger.info(caracter * longitud)
 
 
 def imprimir_titulo(titulo, caracter='='):
-    """Imprime `titulo` rodeado por líneas de separación."""
-    imprimir_separador(caracter)
-    print(titulo)
-    imprimir_separador(caracter)
\ No newline at end of file
+    """Registra `titulo` rodeado por líneas de separación."""
+    logger.info(formatear_titulo(titulo, caracter))
+
+
+def registrar_evento(etapa, **campos):
+    """Evento de una etapa en `modelo_poisson.eventos`.
+
+    El mensaje es una línea JSON (`{"etapa": ..., **campos}`) y el registro
+    lleva además `etapa` y `campos` como atributos para handlers propios.
+    """
+    if logger_eventos.isEnabledFor(logging.INFO):
+        logger_eventos.info(
+            json.dumps({'etapa': etapa, **campos}, ensure_ascii=False, default=str),
+            extra={'etapa': etapa, 'campos': campos}
+        )
+
+
+def configurar_consola(nivel=logging.INFO, eventos=False, flujo=None):
+    """Muestra los mensajes del paquete en consola (lo que usa `main.py`).
+
+    Con `eventos=True` también se imprimen las líneas JSON de cada etapa.
+    Llamarla de nuevo reemplaza el handler anterior (no duplica mensajes).
+    Devuelve el handler agregado, para poder quitarlo después.
+    """
+    for anterior in [h for h in logger.handlers if getattr(h, '_consola', False)]:
+        logger.removeHandler(anterior)
+        anterior.close()
+    
+    manejador = logging.StreamHandler(sys.stdout if flujo is None else flujo)
+    manejador.setFormatter(logging.Formatter('%(message)s'))
+    manejador._consola = True
+    if not eventos:
+        manejador.addFilter(lambda registro: registro.name != logger_eventos.name)
+    logger.addHandler(manejador)
+    logger.setLevel(nivel)
+    return manejador
\ No newline at end of file
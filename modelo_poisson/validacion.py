@@ -0,0 +1,231 @@
+"""Validación fuera de muestra: backtest con origen móvil por jornada."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import optimizacion as opt
+from . import preparacion_datos as prep
+from .predicciones import predecir_lote
+from .simulacion import _ejecutar_bloques
+
+
+RESULTADOS = np.array(['L', 'E', 'V'])
+
+
+def metricas_probabilisticas(probabilidades, resultado):
+    """RPS, log-loss y Brier por partido.
+
+    `probabilidades` es K×3 (local, empate, visitante) y `resultado` el
+    índice 0/1/2 del resultado observado.
+    """
+    observado = np.eye(3)[resultado]
+    acumulado = np.cumsum(probabilidades - observado, axis=1)[:, :2]
+    prob_observada = probabilidades[np.arange(len(resultado)), resultado]
+
+    return {
+        'RPS': (acumulado ** 2).sum(axis=1) / 2,
+        'Log_Loss': -np.log(np.maximum(prob_observada, 1e-15)),
+        'Brier': ((probabilidades - observado) ** 2).sum(axis=1),
+    }
+
+
+def tabla_calibracion(probabilidades, resultado, n_intervalos=10):
+    """Probabilidad media vs. frecuencia observada por intervalo y resultado."""
+    observado = np.eye(3)[resultado]
+    intervalo = np.minimum((probabilidades * n_intervalos).astype(int),
+                           n_intervalos - 1)
+
+    filas = []
+    for k, nombre in enumerate(RESULTADOS):
+        conteo = np.bincount(intervalo[:, k], minlength=n_intervalos)
+        suma_prob = np.bincount(intervalo[:, k], probabilidades[:, k], n_intervalos)
+        suma_obs = np.bincount(intervalo[:, k], observado[:, k], n_intervalos)
+        con_datos = conteo > 0
+        filas.append(pd.DataFrame({
+            'Resultado': nombre,
+            'Intervalo': [f'{i / n_intervalos:.1f}-{(i + 1) / n_intervalos:.1f}'
+                          for i in np.flatnonzero(con_datos)],
+            'Prob_Media': suma_prob[con_datos] / conteo[con_datos],
+            'Frecuencia_Observada': suma_obs[con_datos] / conteo[con_datos],
+            'N': conteo[con_datos],
+        }))
+
+    return pd.concat(filas, ignore_index=True)
+
+
+def _ajustar_origen(entrenamiento, equipos, fecha_origen, xi, dixon_coles,
+                    theta_inicial, rho_inicial):
+    """Ajuste nativo con los partidos previos a una jornada."""
+    pesos = (prep.pesos_decaimiento(entrenamiento['Fecha'], xi, fecha_origen)
+             if xi else None)
+    if dixon_coles:
+        return opt.ajustar_modelo_dixon_coles(
+            entrenamiento, equipos, pesos, theta_inicial=theta_inicial,
+            rho_inicial=rho_inicial
+        )
+    celdas = prep.agrupar_celdas(
+        prep.codificar_partidos(entrenamiento, equipos, pesos), len(equipos)
+    )
+    return opt.ajustar_modelo_nativo(celdas, equipos, theta_inicial=theta_inicial)
+
+
+def _evaluar_origenes(tarea):
+    """Ajusta y predice un tramo contiguo de jornadas, encadenando arranques."""
+    partidos, jornadas, origenes, xi, dixon_coles, max_goles = tarea
+    fechas = pd.to_datetime(partidos['Fecha'])
+
+    params, rho, filas, omitidos = None, 0.0, [], 0
+    for jornada in origenes:
+        en_jornada = jornadas == jornada
+        fecha_origen = fechas[en_jornada].min()
+        entrenamiento = partidos[(fechas < fecha_origen).values]
+        equipos = prep.equipos_presentes(entrenamiento)
+
+        theta_inicial = None
+        if params is not None:
+            theta_inicial = params.reindex(
+                prep.nombres_parametros(equipos)
+            ).fillna(0).values
+        ajuste = _ajustar_origen(entrenamiento, equipos, fecha_origen, xi,
+                                 dixon_coles, theta_inicial, rho)
+        params, rho = ajuste.params, getattr(ajuste, 'rho', 0.0)
+
+        # Solo se predicen partidos entre equipos ya vistos
+        prueba = partidos[en_jornada]
+        indice = pd.Index(equipos)
+        idx_local = indice.get_indexer(prueba['Equipo_Local'])
+        idx_visitante = indice.get_indexer(prueba['Equipo_Visitante'])
+        conocidos = (idx_local >= 0) & (idx_visitante >= 0)
+        omitidos += (~conocidos).sum()
+        prueba = prueba[conocidos]
+        idx_local, idx_visitante = idx_local[conocidos], idx_visitante[conocidos]
+
+        n = len(equipos)
+        ataque, defensa = np.exp(ajuste.theta[:n]), np.exp(ajuste.theta[n:2 * n])
+        gamma = np.exp(ajuste.theta[2 * n])
+        lote = predecir_lote(ataque[idx_local] * defensa[idx_visitante] * gamma,
+                             ataque[idx_visitante] * defensa[idx_local],
+                             max_goles, rho=getattr(ajuste, 'rho', None))
+
+        filas.append(pd.DataFrame({
+            'Jornada': jornada,
+            'Fecha': prueba['Fecha'].values,
+            'Equipo_Local': prueba['Equipo_Local'].values,
+            'Equipo_Visitante': prueba['Equipo_Visitante'].values,
+            'Goles_Local': prueba['Goles_Local'].values,
+            'Goles_Visitante': prueba['Goles_Visitante'].values,
+            'Lambda_Local': lote['lambda_local'],
+            'Lambda_Visitante': lote['lambda_visitante'],
+            'P_Local': lote['prob_victoria_local'],
+            'P_Empate': lote['prob_empate'],
+            'P_Visitante': lote['prob_victoria_visitante'],
+            'Partidos_Entrenamiento': len(entrenamiento),
+            'Iteraciones': ajuste.iteraciones,
+        }))
+
+    return pd.concat(filas, ignore_index=True), omitidos
+
+
+def backtest_origen_movil(partidos, min_partidos=300, xi=0.0, dixon_coles=False,
+                          max_goles=10, n_procesos=1, n_intervalos=10):
+    """Backtest con origen móvil: por cada jornada ajusta con lo anterior.
+
+    Las jornadas se reparten en tramos contiguos, uno por proceso; dentro
+    de cada tramo el ajuste arranca de los coeficientes de la jornada
+    anterior. Se evalúan las jornadas con al menos `min_partidos` partidos
+    previos. Devuelve el DataFrame por partido (probabilidades y métricas)
+    y un resumen con las medias y la tabla de calibración.
+    """
+    partidos = partidos.sort_values('Fecha', kind='stable').reset_index(drop=True)
+    jornadas = prep.asignar_jornadas(partidos)
+
+    # Cada jornada se ajusta con los partidos anteriores a su primer partido;
+    # con partidos aplazados las jornadas no quedan en orden de fecha
+    fechas = pd.to_datetime(partidos['Fecha']).values
+    inicio = pd.Series(fechas).groupby(jornadas).min()
+    previos = np.searchsorted(np.sort(fechas), inicio.values)
+    origenes = inicio.index.values[previos >= min_partidos]
+    if len(origenes) == 0:
+        raise ValueError(f"No hay jornadas con al menos {min_partidos} partidos previos")
+
+    n_tramos = os.cpu_count() if n_procesos is None else n_procesos
+    tramos = [t for t in np.array_split(origenes, max(1, n_tramos)) if len(t)]
+    tareas = [(partidos, jornadas, tramo, xi, dixon_coles, max_goles)
+              for tramo in tramos]
+    partes = _ejecutar_bloques(_evaluar_origenes, tareas, n_procesos)
+    df = pd.concat([parte for parte, _ in partes], ignore_index=True)
+
+    # Normalizar 1X2 por el truncamiento en max_goles
+    probabilidades = df[['P_Local', 'P_Empate', 'P_Visitante']].values
+    probabilidades = probabilidades / probabilidades.sum(axis=1, keepdims=True)
+    df[['P_Local', 'P_Empate', 'P_Visitante']] = probabilidades
+
+    diferencia = df['Goles_Local'].values - df['Goles_Visitante'].values
+    resultado = np.where(diferencia > 0, 0, np.where(diferencia == 0, 1, 2))
+    df['Resultado'] = RESULTADOS[resultado]
+    for nombre, valores in metricas_probabilisticas(probabilidades,
+                                                    resultado).items():
+        df[nombre] = valores
+
+    resumen = {
+        'n_partidos': len(df),
+        'n_jornadas': len(origenes),
+        'partidos_omitidos': int(sum(omitidos for _, omitidos in partes)),
+        'RPS': float(df['RPS'].mean()),
+        'Log_Loss': float(df['Log_Loss'].mean()),
+        'Brier': float(df['Brier'].mean()),
+        'Acierto': float((probabilidades.argmax(axis=1) == resultado).mean()),
+        'calibracion': tabla_calibracion(probabilidades, resultado, n_intervalos),
+    }
+
+    return df, resumen
+
+
+# ==========================================
+# PENALIZACIÓN (validación cruzada)
+# ==========================================
+
+def _evaluar_pliegue(tarea):
+    """Recorre la ruta de penalizaciones (de mayor a menor) en un pliegue."""
+    celdas, prueba, equipos, valores = tarea
+
+    theta, llf = None, []
+    for kappa in valores:
+        theta = opt.ajustar_modelo_nativo(celdas, equipos, theta_inicial=theta,
+                                          penalizacion=kappa).theta
+        llf.append(opt.log_verosimilitud(theta, prueba['goles'], prueba['atacante'],
+                                         prueba['defensor'], prueba['local'],
+                                         len(equipos)))
+    return np.array(llf)
+
+
+def validar_penalizacion(partidos, equipos, valores, n_pliegues=5, pesos=None,
+                         semilla=42, n_procesos=1):
+    """Validación cruzada K-fold de la penalización ridge κ.
+
+    Cada pliegue (un proceso) ajusta sobre celdas agregadas y recorre los
+    valores de mayor a menor arrancando del ajuste anterior. Devuelve la
+    log-verosimilitud fuera de muestra sumada sobre los pliegues.
+    """
+    valores = np.sort(np.asarray(valores, dtype=float))[::-1]
+    pliegue = np.random.default_rng(semilla).permutation(len(partidos)) % n_pliegues
+
+    tareas = []
+    for k in range(n_pliegues):
+        entrena = pliegue != k
+        celdas = prep.agrupar_celdas(
+            prep.codificar_partidos(partidos[entrena], equipos,
+                                    None if pesos is None else pesos[entrena]),
+            len(equipos)
+        )
+        prueba = prep.codificar_partidos(partidos[~entrena], equipos)
+        tareas.append((celdas, prueba, equipos, valores))
+    llf = np.sum(_ejecutar_bloques(_evaluar_pliegue, tareas, n_procesos), axis=0)
+
+    return pd.DataFrame({
+        'Penalizacion': valores,
+        'Log_Verosimilitud_Validacion': llf,
+        'Log_Verosimilitud_Por_Partido': llf / len(partidos),
+    }).sort_values('Penalizacion').reset_index(drop=True)
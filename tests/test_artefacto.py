@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pytest
+
+from modelo_poisson import ModeloPoissonFutbol
+from modelo_poisson import artefacto, cache_modelos
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                          'liga_mx_data_limpia.csv')
+
+
+@pytest.fixture(scope='module')
+def modelo():
+    modelo = ModeloPoissonFutbol()
+    modelo.cargar_datos(RUTA_DATOS)
+    modelo.entrenar(xi=0.002, dixon_coles=True)
+    return modelo
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_artefacto_ida_y_vuelta(modelo, tmp_path, mmap):
+    ruta = tmp_path / 'modelo.mpoi'
+    modelo.guardar_modelo(ruta)
+
+    cargado = ModeloPoissonFutbol()
+    metadatos = cargado.cargar_modelo(ruta, mmap=mmap)
+
+    assert cargado.equipos == modelo.equipos
+    assert cargado.alpha == modelo.alpha
+    assert cargado.beta == modelo.beta
+    assert cargado.gamma == modelo.gamma
+    assert cargado.rho == modelo.rho
+    np.testing.assert_array_equal(cargado.modelo_entrenado.cov_params(),
+                                  modelo.modelo_entrenado.cov_params())
+    assert metadatos['llf'] == modelo.modelo_entrenado.llf
+    assert metadatos['aic'] == modelo.modelo_entrenado.aic
+    assert metadatos['opciones']['xi'] == 0.002
+    assert metadatos['n_partidos'] == len(modelo.datos_originales)
+    assert artefacto.leer_cabecera(ruta)[0]['escalares']['xi'] == 0.002
+
+    # Guardar lo cargado conserva los metadatos del ajuste original
+    copia = tmp_path / 'copia.mpoi'
+    cargado.guardar_modelo(copia)
+    metadatos_copia = artefacto.leer_cabecera(copia)[0]['metadatos']
+    assert ({k: v for k, v in metadatos_copia.items() if k != 'creado'} ==
+            {k: v for k, v in metadatos.items() if k != 'creado'})
+
+
+def test_artefacto_mmap_es_de_solo_lectura(modelo, tmp_path):
+    ruta = tmp_path / 'modelo.mpoi'
+    modelo.guardar_modelo(ruta)
+
+    _, arreglos = artefacto.cargar_artefacto(ruta, mmap=True)
+
+    assert not arreglos['alpha'].flags.writeable
+    np.testing.assert_array_equal(arreglos['alpha'], modelo._vectores_parametros()[0])
+
+
+def test_entrenar_recupera_de_la_cache(tmp_path):
+    primero = ModeloPoissonFutbol(directorio_cache=tmp_path)
+    primero.cargar_datos(RUTA_DATOS)
+    primero.entrenar(xi=0.002)
+
+    segundo = ModeloPoissonFutbol(directorio_cache=tmp_path)
+    segundo.cargar_datos(RUTA_DATOS)
+    segundo.entrenar(xi=0.002)
+
+    assert isinstance(segundo.modelo_entrenado, artefacto.AjusteCargado)
+    assert segundo.alpha == primero.alpha
+    assert segundo.gamma == primero.gamma
+    assert segundo.modelo_entrenado.llf == primero.modelo_entrenado.llf
+
+    # Opciones distintas no comparten entrada
+    segundo.entrenar(xi=0.001)
+    assert not isinstance(segundo.modelo_entrenado, artefacto.AjusteCargado)
+    assert len(list(tmp_path.glob('*' + cache_modelos.EXTENSION))) == 2
+
+
+def test_podar_cache_elimina_las_menos_usadas(tmp_path):
+    claves = ['a', 'b', 'c']
+    for i, clave in enumerate(claves):
+        ruta = cache_modelos.ruta_entrada(tmp_path, clave)
+        with open(ruta, 'wb') as f:
+            f.write(b'\0' * 100)
+        os.utime(ruta, (1000 + i, 1000 + i))
+
+    # Usar 'a' la vuelve la más reciente
+    assert cache_modelos.buscar_en_cache(tmp_path, 'a') is not None
+    cache_modelos.podar_cache(tmp_path, 250)
+
+    assert cache_modelos.buscar_en_cache(tmp_path, 'a') is not None
+    assert cache_modelos.buscar_en_cache(tmp_path, 'b') is None
+    assert cache_modelos.buscar_en_cache(tmp_path, 'c') is not None
+    assert cache_modelos.buscar_en_cache(tmp_path, 'z') is None
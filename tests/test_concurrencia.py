@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# En un intérprete nuevo, para que los módulos diferidos se importen
+# por primera vez desde varios hilos a la vez
+ENTRENAR_EN_HILOS = '''
+import threading
+from modelo_poisson import ModeloPoissonFutbol
+
+errores = []
+barrera = threading.Barrier(8)
+
+def entrenar():
+    try:
+        barrera.wait()
+        modelo = ModeloPoissonFutbol()
+        modelo.cargar_datos('liga_mx_data_limpia.csv')
+        modelo.entrenar()
+        modelo.predecir('Toluca', 'Atlas', mostrar=False)
+    except Exception as error:
+        errores.append(repr(error))
+
+hilos = [threading.Thread(target=entrenar) for _ in range(8)]
+for hilo in hilos:
+    hilo.start()
+for hilo in hilos:
+    hilo.join()
+assert not errores, errores
+'''
+
+
+def test_entrenar_desde_varios_hilos():
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    resultado = subprocess.run([sys.executable, '-c', ENTRENAR_EN_HILOS], cwd=RAIZ,
+                               env=entorno, capture_output=True, text=True)
+
+    assert resultado.returncode == 0, resultado.stderr
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from modelo_poisson import ModeloPoissonFutbol
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                          'liga_mx_data_limpia.csv')
+
+
+@pytest.mark.parametrize('dixon_coles', [False, True])
+def test_bootstrap_penalizado_contiene_estimacion(dixon_coles):
+    modelo = ModeloPoissonFutbol()
+    modelo.cargar_datos(RUTA_DATOS)
+    modelo.entrenar(penalizacion=200, dixon_coles=dixon_coles)
+
+    resultado = modelo.bootstrap(n_replicas=100, semilla=0)
+    parametros = resultado['parametros']
+
+    assert ((parametros['Alpha_Inf'] <= parametros['Alpha']) &
+            (parametros['Alpha'] <= parametros['Alpha_Sup'])).all()
+    assert ((parametros['Beta_Inf'] <= parametros['Beta']) &
+            (parametros['Beta'] <= parametros['Beta_Sup'])).all()
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+from modelo_poisson import ModeloPoissonFutbol
+from modelo_poisson import artefacto
+from modelo_poisson import optimizacion as opt
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                          'liga_mx_data_limpia.csv')
+
+
+@pytest.fixture
+def modelo():
+    modelo = ModeloPoissonFutbol()
+    modelo.cargar_datos(RUTA_DATOS)
+    return modelo
+
+
+def test_cargar_parametros_conserva_datos_y_no_anota_opciones(modelo, tmp_path):
+    modelo.entrenar()
+    modelo.exportar_parametros(tmp_path / 'parametros.csv')
+
+    otro = ModeloPoissonFutbol()
+    otro.cargar_datos(RUTA_DATOS)
+    otro.entrenar(xi=0.002)
+    otro.cargar_parametros(tmp_path / 'parametros.csv')
+    otro.guardar_modelo(tmp_path / 'modelo.mpoi')
+    metadatos = artefacto.leer_cabecera(tmp_path / 'modelo.mpoi')[0]['metadatos']
+
+    assert metadatos['opciones'] is None
+    assert metadatos['hash_datos'] is None
+    assert otro.datos_originales is not None
+
+    otro.entrenar()
+    np.testing.assert_allclose(otro._vectores_parametros(),
+                               modelo._vectores_parametros())
+
+
+@pytest.mark.parametrize('opciones', [
+    {},
+    {'agregado': True},
+    {'xi': 0.002},
+    {'dixon_coles': True},
+], ids=['por_partido', 'agregado', 'decaimiento', 'dixon_coles'])
+def test_actualizar_equivale_a_reajustar(modelo, opciones):
+    datos = modelo.datos_originales
+    corte = len(datos) - 60
+    modelo.entrenar(**opciones)
+
+    parcial = ModeloPoissonFutbol()
+    parcial.cargar_datos(RUTA_DATOS)
+    parcial.datos_originales = datos.iloc[:corte].reset_index(drop=True)
+    parcial.entrenar(**opciones)
+    parcial.actualizar(datos.iloc[corte:].reset_index(drop=True))
+
+    assert len(parcial.datos_originales) == len(datos)
+    np.testing.assert_allclose(parcial._vectores_parametros(),
+                               modelo._vectores_parametros(), rtol=1e-6)
+    assert parcial.gamma == pytest.approx(modelo.gamma, rel=1e-6)
+    assert parcial.modelo_entrenado.llf == pytest.approx(modelo.modelo_entrenado.llf)
+    if opciones.get('dixon_coles'):
+        assert parcial.rho == pytest.approx(modelo.rho, rel=1e-5)
+
+
+def test_actualizar_fallido_no_modifica_el_modelo(modelo, monkeypatch):
+    datos = modelo.datos_originales
+    corte = len(datos) - 60
+    modelo.datos_originales = datos.iloc[:corte].reset_index(drop=True)
+    modelo.entrenar(xi=0.002)
+    opciones = dict(modelo._opciones_entrenamiento)
+    alpha = dict(modelo.alpha)
+
+    def fallar(*args, **kwargs):
+        raise np.linalg.LinAlgError("matriz singular")
+
+    monkeypatch.setattr(opt, 'ajustar_modelo_nativo', fallar)
+    with pytest.raises(np.linalg.LinAlgError):
+        modelo.actualizar(datos.iloc[corte:].reset_index(drop=True))
+
+    assert modelo._opciones_entrenamiento == opciones
+    assert len(modelo.datos_originales) == corte
+    assert modelo.alpha == alpha
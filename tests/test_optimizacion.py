@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pytest
+
+from modelo_poisson import ModeloPoissonFutbol
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                          'liga_mx_data_limpia.csv')
+
+
+def _ajustar(**opciones):
+    modelo = ModeloPoissonFutbol()
+    modelo.cargar_datos(RUTA_DATOS)
+    modelo.entrenar(**opciones)
+    alpha, beta = modelo._vectores_parametros()
+    theta = np.log(np.concatenate([alpha, beta, [modelo.gamma]]))
+    return theta, modelo.modelo_entrenado
+
+
+@pytest.mark.parametrize('xi', [0.0, 0.002])
+@pytest.mark.parametrize('opciones', [
+    {},
+    {'agregado': True},
+    {'parametrizacion': 'suma_cero'},
+], ids=['por_partido', 'agregado', 'suma_cero'])
+def test_nativo_coincide_con_statsmodels(opciones, xi):
+    pytest.importorskip('statsmodels')
+    theta_ref, ajuste_ref = _ajustar(metodo='statsmodels', xi=xi)
+    theta, ajuste = _ajustar(metodo='nativo', xi=xi, **opciones)
+
+    np.testing.assert_allclose(theta, theta_ref, atol=1e-6)
+    assert ajuste.llf == pytest.approx(ajuste_ref.llf, rel=1e-10)
+    assert ajuste.aic == pytest.approx(ajuste_ref.aic, rel=1e-10)
@@ -0,0 +1,17 @@
+import math
+import warnings
+
+import numpy as np
+
+from modelo_poisson.predicciones import pmf_poisson
+
+
+def test_pmf_poisson_con_lambda_cero():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        pmf = pmf_poisson([0.0, 1.3], max_goles=4)
+
+    np.testing.assert_array_equal(pmf[0], [1.0, 0.0, 0.0, 0.0, 0.0])
+    np.testing.assert_allclose(
+        pmf[1], [math.exp(-1.3) * 1.3**k / math.factorial(k) for k in range(5)]
+    )
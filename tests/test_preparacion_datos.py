@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from modelo_poisson.preparacion_datos import cargar_datos_historicos, pesos_decaimiento
+
+
+def test_pesos_decaimiento_excluye_partidos_posteriores_a_la_referencia():
+    fechas = pd.to_datetime(['2024-01-01', '2024-01-11', '2024-01-21'])
+
+    pesos = pesos_decaimiento(fechas, 0.1, fecha_referencia='2024-01-11')
+
+    np.testing.assert_allclose(pesos, [np.exp(-1.0), 1.0, 0.0])
+
+
+def test_pesos_decaimiento_referencia_por_defecto_es_la_fecha_mas_reciente():
+    fechas = pd.to_datetime(['2024-01-01', '2024-01-11'])
+
+    np.testing.assert_allclose(pesos_decaimiento(fechas, 0.1), [np.exp(-1.0), 1.0])
+
+
+def test_cargar_datos_omite_partidos_sin_marcador(tmp_path, caplog):
+    ruta = tmp_path / 'partidos.csv'
+    ruta.write_text(
+        'Temporada,Fecha,Equipo_Local,Equipo_Visitante,Goles_Local,Goles_Visitante\n'
+        '2024,2024-01-01,A,B,2,1\n'
+        '2024,2024-01-08,B,C,0,0\n'
+        '2024,2024-01-15,C,A,,\n'
+    )
+
+    with caplog.at_level('WARNING', logger='modelo_poisson'):
+        df, equipos = cargar_datos_historicos(ruta)
+
+    assert len(df) == 2
+    assert df['Goles_Local'].dtype == np.int16
+    assert equipos == ['A', 'B', 'C']
+    assert 'sin marcador' in caplog.text
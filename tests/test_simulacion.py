@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from modelo_poisson import simulacion, torneo
+
+LAMBDAS_LOCAL = np.array([1.6, 0.9, 2.1])
+LAMBDAS_VISITANTE = np.array([1.1, 1.3, 0.7])
+
+
+@pytest.mark.parametrize('rho', [None, -0.1])
+@pytest.mark.parametrize('tam_bloque, n_procesos', [(1_000, 1), (50_000, 2)])
+def test_montecarlo_no_depende_de_bloques_ni_procesos(monkeypatch, rho,
+                                                      tam_bloque, n_procesos):
+    monkeypatch.setattr(simulacion, 'PARTIDOS_POR_SEMILLA', 3_000)
+    referencia = simulacion.simular_partidos_montecarlo(
+        LAMBDAS_LOCAL, LAMBDAS_VISITANTE, n_simulaciones=20_000, semilla=7, rho=rho
+    )
+    resultado = simulacion.simular_partidos_montecarlo(
+        LAMBDAS_LOCAL, LAMBDAS_VISITANTE, n_simulaciones=20_000, semilla=7, rho=rho,
+        tam_bloque=tam_bloque, n_procesos=n_procesos
+    )
+
+    for clave, valor in referencia.items():
+        np.testing.assert_array_equal(resultado[clave], valor)
+
+
+def test_temporada_no_depende_de_bloques():
+    idx_local, idx_visitante = np.array([0, 1, 2, 3]), np.array([1, 2, 3, 0])
+    lambdas = (np.full(4, 1.4), np.full(4, 1.0))
+    referencia = torneo.simular_temporada(*lambdas, idx_local, idx_visitante, 4,
+                                          n_temporadas=5_000, semilla=3, rho=-0.1)
+    resultado = torneo.simular_temporada(*lambdas, idx_local, idx_visitante, 4,
+                                         n_temporadas=5_000, semilla=3, rho=-0.1,
+                                         tam_bloque=100)
+
+    np.testing.assert_array_equal(resultado['prob_posiciones'],
+                                  referencia['prob_posiciones'])
+    np.testing.assert_array_equal(resultado['puntos_esperados'],
+                                  referencia['puntos_esperados'])
+
+
+def test_corregir_marcadores_bajos_solo_toca_el_bloque_bajo():
+    rng = np.random.default_rng(0)
+    lam, mu = np.full(200_000, 1.2), np.full(200_000, 0.9)
+    goles_local, goles_visitante = rng.poisson(lam), rng.poisson(mu)
+    originales = goles_local.copy(), goles_visitante.copy()
+
+    simulacion.corregir_marcadores_bajos(rng, goles_local, goles_visitante,
+                                         lam, mu, rho=-0.15)
+
+    bajo = (originales[0] <= 1) & (originales[1] <= 1)
+    np.testing.assert_array_equal(goles_local[~bajo], originales[0][~bajo])
+    np.testing.assert_array_equal(goles_visitante[~bajo], originales[1][~bajo])
+    assert ((goles_local[bajo] <= 1) & (goles_visitante[bajo] <= 1)).all()
+
+    # El bloque bajo sigue la distribución de Dixon-Coles (τ·P normalizada)
+    tau = np.array([[1 - 1.2 * 0.9 * -0.15, 1 + 1.2 * -0.15],
+                    [1 + 0.9 * -0.15, 1 - -0.15]])
+    esperado = tau * np.outer([1, 1.2], [1, 0.9])
+    esperado /= esperado.sum()
+    observado = np.zeros((2, 2))
+    np.add.at(observado, (goles_local[bajo], goles_visitante[bajo]), 1)
+    np.testing.assert_allclose(observado / bajo.sum(), esperado, atol=5e-3)
@@ -0,0 +1,17 @@
+import io
+
+from modelo_poisson.utils import configurar_consola, logger
+
+
+def test_configurar_consola_reemplaza_el_handler_anterior():
+    primero, segundo = io.StringIO(), io.StringIO()
+    configurar_consola(flujo=primero)
+    manejador = configurar_consola(flujo=segundo)
+    try:
+        logger.info("mensaje")
+
+        assert primero.getvalue() == ''
+        assert segundo.getvalue() == 'mensaje\n'
+        assert [h for h in logger.handlers if getattr(h, '_consola', False)] == [manejador]
+    finally:
+        logger.removeHandler(manejador)
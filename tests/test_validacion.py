@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from modelo_poisson import preparacion_datos as prep
+from modelo_poisson.validacion import backtest_origen_movil
+
+
+def _liga_con_aplazados():
+    rng = np.random.default_rng(0)
+    equipos = ['A', 'B', 'C', 'D']
+    cruces = [[(0, 1), (2, 3)], [(0, 2), (1, 3)], [(0, 3), (1, 2)]]
+    filas = []
+    for jornada in range(40):
+        fecha = pd.Timestamp('2024-01-06') + pd.Timedelta(weeks=jornada)
+        for local, visitante in cruces[jornada % 3]:
+            if jornada % 2:
+                local, visitante = visitante, local
+            filas.append({'Temporada': '2024', 'Jornada': jornada, 'Fecha': fecha,
+                          'Equipo_Local': equipos[local],
+                          'Equipo_Visitante': equipos[visitante],
+                          'Goles_Local': rng.poisson(1.5),
+                          'Goles_Visitante': rng.poisson(1.1)})
+    partidos = pd.DataFrame(filas)
+
+    # Partidos aplazados: conservan su jornada pero se juegan semanas después
+    for i in (2, 3, 5, 9, 13, 21, 33):
+        partidos.loc[i, 'Fecha'] += pd.Timedelta(weeks=12)
+    return partidos
+
+
+def test_backtest_cuenta_previos_con_jornadas_aplazadas():
+    partidos = _liga_con_aplazados()
+
+    df, resumen = backtest_origen_movil(partidos, min_partidos=20)
+
+    ordenados = partidos.sort_values('Fecha', kind='stable').reset_index(drop=True)
+    jornadas = prep.asignar_jornadas(ordenados)
+    esperadas = [j for j in np.unique(jornadas)
+                 if (ordenados['Fecha'] < ordenados['Fecha'][jornadas == j].min()).sum()
+                 >= 20]
+    assert resumen['n_jornadas'] == len(esperadas)
+    assert sorted(df['Jornada'].unique()) == esperadas